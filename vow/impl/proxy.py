@@ -16,8 +16,8 @@ from vow.rpc.wire import Packet, Service, Header, Begin, Denied, Accepted, Packe
 from xrpc.logging import logging_parser, cli_main
 from xrpc.trace import trc
 
-PACKET_MAPPER_INTO, = get_serializers(BINARY_INTO, Packet)
-PACKET_MAPPER_FROM, = get_serializers(BINARY_FROM, Packet)
+PACKET_MAPPER_INTO, = get_serializers(BINARY_INTO, Packet, compiled=True, optimize=True)
+PACKET_MAPPER_FROM, = get_serializers(BINARY_FROM, Packet, compiled=True, optimize=True)
 
 T = TypeVar('T')
 
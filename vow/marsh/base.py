@@ -1,4 +1,9 @@
-from typing import TypeVar, Any, Dict
+from collections import deque
+from contextvars import ContextVar
+from functools import wraps
+from typing import TypeVar, Any, Dict, Iterable, List, Callable, Optional, Hashable
+
+from vow.marsh.error import SerializationError
 
 T = TypeVar('T')
 
@@ -7,12 +12,25 @@ Fields = Dict[str, 'Mapper']
 
 
 class Mapper:
+    __slots__ = 'dependencies',
+
     def __init__(self, dependencies: Fields):
         self.dependencies: Fields = dependencies
 
     def serialize(self, obj: Any) -> Any:
         raise NotImplementedError('')
 
+    def serialize_many(self, objs: Iterable[Any]) -> List[Any]:
+        """serialize every item of `objs`, errors are prefixed with the index of the offending item"""
+        r = []
+        for i, x in enumerate(objs):
+            try:
+                r.append(self.serialize(x))
+            except SerializationError as e:
+                e.prepend_path(i)
+                raise
+        return r
+
     def __call__(self, obj: Any) -> Any:
         return self.serialize(obj)
 
@@ -23,6 +41,56 @@ class Mapper:
         return self.__class__ == other.__class__
 
 
+# while set, the batch implementations are skipped, e.g. by mappers that keep state across the items
+ONE_BY_ONE: ContextVar[bool] = ContextVar('ONE_BY_ONE', default=False)
+
+# what a batch implementation raises on input that `serialize` would reject
+BATCH_ERRORS = SerializationError, TypeError, AttributeError, LookupError, ValueError
+
+
+def batch(fn: Callable[[Mapper, List[Any]], List[Any]]) -> Callable[[Mapper, Iterable[Any]], List[Any]]:
+    """
+    wraps the batch implementation of `serialize_many`; if it fails with one of `BATCH_ERRORS`, the batch is
+    serialized again one item at a time, so that errors are reported exactly as `serialize` would report them. The
+    items before the failing one are then serialized twice, which the profile counters and `AnyAnyTrace` see as well;
+    any other exception is raised as it is
+    """
+
+    @wraps(fn)
+    def serialize_many(self: Mapper, objs: Iterable[Any]) -> List[Any]:
+        if not isinstance(objs, list):
+            objs = list(objs)
+
+        if not objs:
+            # the batches of recursive types would otherwise recurse on the empty lists forever
+            return []
+
+        if ONE_BY_ONE.get():
+            return Mapper.serialize_many(self, objs)
+
+        try:
+            return fn(self, objs)
+        except BATCH_ERRORS:
+            return Mapper.serialize_many(self, objs)
+
+    return serialize_many
+
+
+def walk(*roots: Mapper) -> List[Mapper]:
+    """every mapper of the graphs of `roots`, once each"""
+    r = {}
+    to_visit = deque(roots)
+
+    while len(to_visit):
+        x = to_visit.popleft()
+
+        if id(x) not in r:
+            r[id(x)] = x
+            to_visit.extend(x.dependencies.values())
+
+    return list(r.values())
+
+
 class Fac:
     __mapper_cls__ = Mapper
     __mapper_args__ = tuple()
@@ -39,6 +107,27 @@ class Fac:
         except Exception as e:
             raise ValueError(f'{self.__mapper_cls__}, {self.__mapper_args__}, {e}')
 
+    def signature(self) -> Optional[Hashable]:
+        """
+        everything `create` passes to the mapper besides the dependencies: factories with equal signatures and equal
+        dependencies build interchangeable mappers, see `vow.marsh.dedup`; `None` if the mapper is never shared
+        """
+        if type(self).create is not Fac.create:
+            return None
+
+        return self._signature(*self.__mapper_args__)
+
+    def _signature(self, *names: str) -> Optional[Hashable]:
+        # `1 == True`, the type of each value keeps them apart
+        r = (self.__class__,) + tuple((k, v.__class__, v) for k in names for v in (getattr(self, k),))
+
+        try:
+            hash(r)
+        except TypeError:
+            return None
+
+        return r
+
     def __repr__(self) -> str:
         return f'{self.__class__.__name__}()'
 
@@ -0,0 +1,148 @@
+import sys
+import threading
+from collections import OrderedDict
+from types import FunctionType, MethodType
+from typing import Any, Callable, Hashable, Optional, TypeVar
+
+if sys.version_info >= (3, 7):
+    from typing import ForwardRef
+else:
+    from typing import _ForwardRef as ForwardRef
+
+T = TypeVar('T')
+
+
+class Cache:
+    """a process-wide LRU map with explicit invalidation, a `maxsize` of zero disables it"""
+
+    def __init__(self, maxsize: Optional[int] = 1024):
+        self.maxsize = maxsize
+        self.items: 'OrderedDict[Hashable, Any]' = OrderedDict()
+        self.lock = threading.RLock()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self.items)
+
+    def get(self, key: Optional[Hashable], factory: Callable[[], T]) -> T:
+        """return the cached value for `key`, or build it with `factory`; a key of `None` is never cached"""
+        if key is None or self.maxsize == 0:
+            return factory()
+
+        with self.lock:
+            try:
+                r = self.items[key]
+            except KeyError:
+                pass
+            else:
+                self.items.move_to_end(key)
+                self.hits += 1
+                return r
+
+        # factories may recurse into the same cache, so they are not called under the lock
+        r = factory()
+
+        with self.lock:
+            self.misses += 1
+            self.items[key] = r
+            self._evict()
+
+        return r
+
+    def _evict(self):
+        if self.maxsize is None:
+            return
+
+        while len(self.items) > self.maxsize:
+            self.items.popitem(last=False)
+
+    def resize(self, maxsize: Optional[int]):
+        with self.lock:
+            self.maxsize = maxsize
+            self._evict()
+
+    def clear(self):
+        with self.lock:
+            self.items.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def invalidate(self, *objs: Any) -> int:
+        """drop every entry whose key mentions any of `objs`, return the number of entries dropped"""
+        with self.lock:
+            keys = [k for k in self.items if any(_mentions(k, x) for x in objs)]
+
+            for k in keys:
+                del self.items[k]
+
+            return len(keys)
+
+
+def _mentions(key: Any, obj: Any) -> bool:
+    if key is obj:
+        return True
+    elif isinstance(key, tuple):
+        return any(_mentions(x, obj) for x in key)
+    else:
+        return any(_mentions(x, obj) for x in getattr(key, '__args__', None) or ())
+
+
+def is_local(obj: Any) -> bool:
+    """`obj` is defined in a function, the caches would keep it and everything it refers to alive"""
+    return '<locals>' in getattr(obj, '__qualname__', '')
+
+
+def is_stable(obj: Any) -> bool:
+    """
+    types that resolve the same way regardless of the frame they are resolved in; classes and functions defined in
+    functions, and bound methods, are never cached either, so that they can be collected
+    """
+    if isinstance(obj, (str, ForwardRef)):
+        return False
+
+    if isinstance(obj, (type, FunctionType)):
+        return not is_local(obj)
+
+    if isinstance(obj, MethodType):
+        # a bound method keeps its instance alive, `Args(obj.__func__)` is cached instead
+        return False
+
+    try:
+        hash(obj)
+    except TypeError:
+        return False
+
+    args = getattr(obj, '__args__', None) or ()
+
+    return all(is_stable(x) for x in args if x is not Ellipsis)
+
+
+def ordered(obj: Any) -> Any:
+    """
+    the key of `obj` in the caches, with its arguments in order: `Union[A, B] == Union[B, A]`, but the binary encoding
+    of a union depends on the order of its members
+    """
+    args = getattr(obj, '__args__', None)
+
+    if isinstance(obj, type) or not args:
+        return obj
+
+    return obj, tuple(ordered(x) for x in args)
+
+
+# (walker name, type) -> Fac
+RESOLVE_CACHE = Cache(maxsize=4096)
+
+# (walker name, root types, options) -> List[Mapper]
+MAPPER_CACHE = Cache(maxsize=1024)
+
+
+def invalidate(*objs: Any):
+    """drop everything cached about any of `objs`, or everything at all if none given"""
+    for cache in (RESOLVE_CACHE, MAPPER_CACHE):
+        if objs:
+            cache.invalidate(*objs)
+        else:
+            cache.clear()
+
@@ -0,0 +1,554 @@
+import hashlib
+import keyword
+import linecache
+from collections import OrderedDict, deque
+from contextlib import contextmanager
+from datetime import datetime
+from itertools import count
+from typing import Any, Callable, Dict, List, Optional, Type, Union, Deque
+
+from dataclasses import MISSING
+
+from vow.marsh import disk
+from vow.marsh.base import Mapper, Fields
+from vow.marsh.error import SerializationError
+from vow.marsh.impl.any import ThisMapper, AnyAnyAttrMapper, AnyAnyItemMapper, AnyAnyFieldMapper, \
+    AnyAnySelfMapper, AnyAnyWithMapper, AnyAnyLenMapper, AnyAnyLookupMapper, AnyAnyDiscriminantMapper, FieldValue, \
+    AnyAnyChainMapper
+from vow.marsh.impl.any_from import AnyFromStructMapper, AnyFromEnumMapper
+from vow.marsh.impl.any_into import AnyIntoStructMapper, AnyIntoEnumMapper
+from vow.marsh.impl.json import JsonAnyListMapper, JsonAnyDictMapper, JsonAnyOptionalMapper
+from vow.marsh.impl.json_from import JsonFromDateTimeMapper
+from vow.marsh.impl.json_into import JsonIntoDateTimeMapper
+
+# python refuses to compile more than 20 statically nested blocks, anything deeper is moved into a function
+MAX_DEPTH = 12
+
+Emitter = Callable[['Compiler', '_Function', Mapper, str], str]
+
+EMITTERS: Dict[Type[Mapper], Emitter] = {}
+
+
+def emitter(*clss: Type[Mapper]):
+    """register a code emitter for the exact mapper classes given"""
+
+    def wrapper(fn: Emitter) -> Emitter:
+        for cls in clss:
+            EMITTERS[cls] = fn
+        return fn
+
+    return wrapper
+
+
+class _Block:
+    def __init__(self, header: Optional[str] = None, path: tuple = ()):
+        self.header = header
+        self.path = path
+        self.items: List[Union[str, '_Block']] = []
+
+    def render(self, indent: int, out: List[str]):
+        pad = '    ' * indent
+
+        if self.header is not None:
+            out.append(pad + self.header)
+            self._render_items(self.items, indent + 1, out)
+        elif self.path:
+            path = list(self.path)
+            items = self.items
+
+            # guard(a) { guard(b) { x } } is the same as guard(a, b) { x }
+            while len(items) == 1 and isinstance(items[0], _Block) and items[0].header is None and items[0].path:
+                path.extend(items[0].path)
+                items = items[0].items
+
+            out.append(pad + 'try:')
+            self._render_items(items, indent + 1, out)
+            out.append(pad + 'except SerializationError as e:')
+            out.append(pad + f'    e.prepend_path({", ".join(path)})')
+            out.append(pad + '    raise')
+        else:
+            self._render_items(self.items, indent, out)
+
+    @staticmethod
+    def _render_items(items, indent: int, out: List[str]):
+        if not items:
+            out.append('    ' * indent + 'pass')
+
+        for x in items:
+            if isinstance(x, _Block):
+                x.render(indent, out)
+            else:
+                out.append('    ' * indent + x)
+
+
+class _Function:
+    def __init__(self, name: str):
+        self.name = name
+        self.root = _Block()
+        self.stack = [self.root]
+        self.ctr = count()
+
+    @property
+    def depth(self) -> int:
+        return len(self.stack) - 1
+
+    def var(self, prefix='v') -> str:
+        return f'{prefix}{next(self.ctr)}'
+
+    def line(self, line: str):
+        self.stack[-1].items.append(line)
+
+    @contextmanager
+    def _push(self, block: _Block):
+        self.stack[-1].items.append(block)
+        self.stack.append(block)
+        try:
+            yield
+        finally:
+            self.stack.pop()
+
+    def block(self, header: str):
+        return self._push(_Block(header=header))
+
+    def guard(self, *path: str):
+        """equivalent of `try/except SerializationError` prepending the `path`, path items are python expressions"""
+        return self._push(_Block(path=path))
+
+    def source(self, arg: str) -> List[str]:
+        out = [f'def {self.name}({arg}):']
+        self.root.render(1, out)
+        return out
+
+
+def _attr(src: str, name: str) -> str:
+    if name.isidentifier() and not keyword.iskeyword(name) and not name.startswith('__'):
+        return f'{src}.{name}'
+    else:
+        return f'getattr({src}, {name!r})'
+
+
+class Compiler:
+    """turn a linked graph of mappers into generated python functions, one per shared mapper"""
+
+    def __init__(self):
+        self.namespace: Dict[str, Any] = {
+            'SerializationError': SerializationError,
+            'MISSING': MISSING,
+            'FieldValue': FieldValue,
+            'OrderedDict': OrderedDict,
+            'datetime': datetime,
+        }
+        self.consts: Dict[int, str] = {}
+        self.mappers: Dict[int, Mapper] = {}
+        self.refs: Dict[int, int] = {}
+        self.roots: Dict[int, Mapper] = {}
+
+        self.names: Dict[int, str] = {}
+        self.to_generate: Deque[Mapper] = deque()
+        self.inlined: List[int] = []
+
+        self.functions: List[List[str]] = []
+        self.tail: List[str] = []
+
+    def const(self, value: Any, prefix='c') -> str:
+        key = id(value)
+        if key not in self.consts:
+            name = f'_{prefix}{len(self.consts)}'
+            self.consts[key] = name
+            self.namespace[name] = value
+        return self.consts[key]
+
+    def _count(self, *roots: Mapper):
+        to_visit = deque(roots)
+
+        for root in roots:
+            self.roots[id(root)] = root
+            self.refs[id(root)] = self.refs.get(id(root), 0) + 1
+
+        while len(to_visit):
+            item = to_visit.popleft()
+
+            if id(item) in self.mappers:
+                continue
+
+            self.mappers[id(item)] = item
+
+            for dep in item.dependencies.values():
+                self.refs[id(dep)] = self.refs.get(id(dep), 0) + 1
+                to_visit.append(dep)
+
+    def function(self, mapper: Mapper) -> str:
+        """name of the generated function for the `mapper`"""
+        key = id(mapper)
+        if key not in self.names:
+            self.names[key] = f'_f{len(self.names)}'
+            self.to_generate.append(mapper)
+        return self.names[key]
+
+    def is_inlined(self, mapper: Mapper, fn: _Function) -> bool:
+        key = id(mapper)
+
+        # leaves are cheap to emit twice, with `dedup` they are shared far more often than not
+        return (self.refs.get(key, 0) == 1 or not mapper.dependencies) and \
+               key not in self.roots and \
+               key not in self.inlined and \
+               type(mapper) in EMITTERS and \
+               fn.depth < MAX_DEPTH
+
+    def emit(self, mapper: Mapper, fn: _Function, src: str) -> str:
+        """emit the code running `mapper` over `src`, return the expression holding the result"""
+        if self.is_inlined(mapper, fn):
+            self.inlined.append(id(mapper))
+            try:
+                return EMITTERS[type(mapper)](self, fn, mapper, src)
+            finally:
+                self.inlined.pop()
+        elif type(mapper) in EMITTERS:
+            r = fn.var()
+            fn.line(f'{r} = {self.function(mapper)}({src})')
+            return r
+        else:
+            r = fn.var()
+            fn.line(f'{r} = {self.const(mapper.serialize, "s")}({src})')
+            return r
+
+    def _generate(self, mapper: Mapper):
+        fn = _Function(self.names[id(mapper)])
+        self.inlined.append(id(mapper))
+        try:
+            r = EMITTERS[type(mapper)](self, fn, mapper, 'obj')
+        finally:
+            self.inlined.pop()
+        fn.line(f'return {r}')
+        self.functions.append(fn.source('obj'))
+
+    def compile(self, *roots: Mapper) -> List['CompiledMapper']:
+        self._count(*roots)
+
+        names = []
+        for root in roots:
+            if type(root) in EMITTERS:
+                names.append(self.function(root))
+            else:
+                names.append(None)
+
+        while len(self.to_generate):
+            self._generate(self.to_generate.popleft())
+
+        lines = []
+        for x in self.functions:
+            lines.extend(x)
+            lines.append('')
+        lines.extend(self.tail)
+        source = '\n'.join(lines) + '\n'
+
+        # the same source gets the same name, so that code loaded from `vow.marsh.disk` still finds its lines
+        filename = f'<vow.marsh.compiler:{hashlib.sha1(source.encode()).hexdigest()[:16]}>'
+        linecache.cache[filename] = (len(source), None, source.splitlines(True), filename)
+
+        exec(disk.compile_source(source, filename), self.namespace)
+
+        return [
+            CompiledMapper(
+                root,
+                self.namespace[name] if name else root.serialize,
+                source,
+                dependencies={},
+            )
+            for root, name in zip(roots, names)
+        ]
+
+
+class CompiledMapper(Mapper):
+    __slots__ = 'mapper', 'fun', 'source'
+
+    def __init__(self, mapper: Mapper, fun: Callable[[Any], Any], source: str, dependencies: Fields):
+        self.mapper = mapper
+        self.fun = fun
+        self.source = source
+        super().__init__(dependencies)
+
+    def serialize(self, obj: Any) -> Any:
+        return self.fun(obj)
+
+    def __repr__(self) -> str:
+        return f'{self.__class__.__name__}({self.mapper!r})'
+
+
+def compile_mappers(*roots: Mapper) -> List[CompiledMapper]:
+    return Compiler().compile(*roots)
+
+
+@emitter(AnyAnySelfMapper)
+def _emit_self(c: Compiler, fn: _Function, m: AnyAnySelfMapper, src: str) -> str:
+    return c.emit(m.dependencies['self'], fn, src)
+
+
+@emitter(ThisMapper)
+def _emit_this(c: Compiler, fn: _Function, m: ThisMapper, src: str) -> str:
+    if m.type is None:
+        return src
+
+    r = fn.var()
+    t = c.const(m.type)
+
+    def convert():
+        with fn.block('try:'):
+            fn.line(f'{r} = {t}({src})')
+        with fn.block('except Exception as e:'):
+            fn.line(f"raise SerializationError(val={src}, exc=e, reason='unmappable', origin={c.const(m, 'm')})")
+
+    if m.type in (bool, int, float, str):
+        # conversion of an exact instance of these types is an identity
+        with fn.block(f'if {src}.__class__ is {t}:'):
+            fn.line(f'{r} = {src}')
+        with fn.block('else:'):
+            convert()
+    else:
+        convert()
+    return r
+
+
+@emitter(AnyAnyAttrMapper)
+def _emit_attr(c: Compiler, fn: _Function, m: AnyAnyAttrMapper, src: str) -> str:
+    r = fn.var()
+    with fn.block('try:'):
+        fn.line(f'{r} = {_attr(src, m.name)}')
+    with fn.block('except AttributeError as e:'):
+        fn.line(f"raise SerializationError(val={src}, reason='attr_missing', origin={c.const(m, 'm')}, exc=e)")
+
+    if len(m.dependencies):
+        with fn.guard(repr('$attr')):
+            r = c.emit(m.dependencies['type'], fn, r)
+    return r
+
+
+@emitter(AnyAnyItemMapper)
+def _emit_item(c: Compiler, fn: _Function, m: AnyAnyItemMapper, src: str) -> str:
+    r = fn.var()
+    mk = c.const(m, 'm')
+    with fn.block(f"if {src}.__class__ is not dict and not hasattr({src}, '__getitem__'):"):
+        fn.line(f"raise SerializationError(val={src}, reason='invalid_obj', origin={mk})")
+    with fn.block('try:'):
+        fn.line(f'{r} = {src}[{m.name!r}]')
+    with fn.block('except KeyError as e:'):
+        fn.line(f"raise SerializationError(val={src}, reason='key_missing', exc=e, origin={mk})")
+
+    with fn.guard(repr('$item')):
+        r = c.emit(m.dependencies['type'], fn, r)
+    return r
+
+
+@emitter(AnyAnyFieldMapper)
+def _emit_field(c: Compiler, fn: _Function, m: AnyAnyFieldMapper, src: str) -> str:
+    r = fn.var()
+    with fn.guard(repr(m.name)):
+        v = c.emit(m.dependencies['item'], fn, src)
+    fn.line(f'{r} = FieldValue({m.name!r}, {v})')
+    return r
+
+
+def _emit_fields(c: Compiler, fn: _Function, m: AnyIntoStructMapper, src: str, r: str):
+    for path, name, dep in m.fields:
+        if name is not None:
+            with fn.guard(*map(repr, path)):
+                v = c.emit(dep, fn, src)
+            with fn.block(f'if {v} is not MISSING:'):
+                fn.line(f'{r}[{name!r}] = {v}')
+        else:
+            with fn.guard(*map(repr, path)):
+                v = c.emit(dep, fn, src)
+                with fn.block(f'if not isinstance({v}, FieldValue):'):
+                    fn.line(
+                        f"raise SerializationError(val={v}, reason='unsupported_field_defn', origin={c.const(m, 'm')})"
+                    )
+            with fn.block(f'if {v}.value is not MISSING:'):
+                fn.line(f'{r}[{v}.name] = {v}.value')
+
+
+@emitter(AnyIntoStructMapper)
+def _emit_into_struct(c: Compiler, fn: _Function, m: AnyIntoStructMapper, src: str) -> str:
+    r = fn.var('r')
+
+    if m.cls:
+        with fn.block(f'if not isinstance({src}, {c.const(m.cls)}):'):
+            fn.line(f"raise SerializationError(val={src}, reason='not_instance', origin={c.const(m, 'm')})")
+
+    fn.line(f'{r} = OrderedDict()')
+    _emit_fields(c, fn, m, src, r)
+    return r
+
+
+@emitter(AnyFromStructMapper)
+def _emit_from_struct(c: Compiler, fn: _Function, m: AnyFromStructMapper, src: str) -> str:
+    r = fn.var('r')
+    fn.line(f'{r} = {{}}')
+    _emit_fields(c, fn, m, src, r)
+
+    if m.cls:
+        r2 = fn.var('r')
+        fn.line(f'{r2} = {c.const(m.cls)}(**{r})')
+        return r2
+    else:
+        return r
+
+
+@emitter(AnyIntoEnumMapper)
+def _emit_into_enum(c: Compiler, fn: _Function, m: AnyIntoEnumMapper, src: str) -> str:
+    mk = c.const(m, 'm')
+    r = fn.var()
+    with fn.guard(repr('value')):
+        v = c.emit(m.dependencies['value'], fn, src)
+    with fn.block(f'if {v}.__class__ is not {c.const(m.enum)}:'):
+        fn.line(f"raise SerializationError(val={v}, reason='enum_not_enum', origin={mk})")
+    with fn.block('try:'):
+        fn.line(f'{r} = {c.const(m.values, "e")}[{v}]')
+    with fn.block('except KeyError:'):
+        fn.line(f'{r} = {v}.value')
+    return r
+
+
+@emitter(AnyFromEnumMapper)
+def _emit_from_enum(c: Compiler, fn: _Function, m: AnyFromEnumMapper, src: str) -> str:
+    r = fn.var()
+    with fn.guard(repr('$value')):
+        v = c.emit(m.dependencies['value'], fn, src)
+    with fn.block('try:'):
+        fn.line(f'{r} = {c.const(m.members, "e")}[{v}]')
+    with fn.block('except (KeyError, TypeError):'):
+        fn.line(f"{r} = {c.const(m, 'm')}.missing({src}, {v})")
+    return r
+
+
+@emitter(JsonAnyListMapper)
+def _emit_list(c: Compiler, fn: _Function, m: JsonAnyListMapper, src: str) -> str:
+    r = fn.var('r')
+    i = fn.var('i')
+    x = fn.var('x')
+    fn.line(f'{r} = []')
+    with fn.block(f'for {i}, {x} in enumerate({src}):'):
+        with fn.guard(i):
+            v = c.emit(m.dependencies['value'], fn, x)
+            fn.line(f'{r}.append({v})')
+    return r
+
+
+@emitter(JsonAnyDictMapper)
+def _emit_dict(c: Compiler, fn: _Function, m: JsonAnyDictMapper, src: str) -> str:
+    r = fn.var('r')
+    k = fn.var('k')
+    x = fn.var('x')
+    fn.line(f'{r} = {{}}')
+    with fn.block(f'for {k}, {x} in {src}.items():'):
+        with fn.guard(repr('$key')):
+            k2 = c.emit(m.dependencies['key'], fn, k)
+        with fn.guard(repr('$value')):
+            v = c.emit(m.dependencies['value'], fn, x)
+        fn.line(f'{r}[{k2}] = {v}')
+    return r
+
+
+@emitter(JsonAnyOptionalMapper)
+def _emit_optional(c: Compiler, fn: _Function, m: JsonAnyOptionalMapper, src: str) -> str:
+    r = fn.var()
+    with fn.block(f'if {src} is None:'):
+        fn.line(f'{r} = None')
+    with fn.block('else:'):
+        v = c.emit(m.dependencies['value'], fn, src)
+        fn.line(f'{r} = {v}')
+    return r
+
+
+@emitter(AnyAnyWithMapper)
+def _emit_with(c: Compiler, fn: _Function, m: AnyAnyWithMapper, src: str) -> str:
+    with fn.guard(repr('$value')):
+        v = c.emit(m.dependencies['value'], fn, src)
+    with fn.guard(repr('$child')):
+        return c.emit(m.dependencies['child'], fn, v)
+
+
+@emitter(AnyAnyChainMapper)
+def _emit_chain(c: Compiler, fn: _Function, m: AnyAnyChainMapper, src: str) -> str:
+    for i, x in enumerate(m.dependencies.values()):
+        with fn.guard(repr(str(i))):
+            src = c.emit(x, fn, src)
+    return src
+
+
+@emitter(AnyAnyLenMapper)
+def _emit_len(c: Compiler, fn: _Function, m: AnyAnyLenMapper, src: str) -> str:
+    r = fn.var()
+    with fn.guard(repr('$item')):
+        v = c.emit(m.dependencies['item'], fn, src)
+    fn.line(f'{r} = len({v})')
+    return r
+
+
+@emitter(AnyAnyLookupMapper)
+def _emit_lookup(c: Compiler, fn: _Function, m: AnyAnyLookupMapper, src: str) -> str:
+    r = fn.var()
+    lookup = c.const(m.lookup)
+    with fn.guard(repr('$value')):
+        v = c.emit(m.dependencies['value'], fn, src)
+    with fn.block(f'if {v} not in {lookup}:'):
+        fn.line(f"raise SerializationError(val={src}, exc=KeyError({v}), reason='key_missing')")
+    fn.line(f'{r} = {lookup}[{v}]')
+    return r
+
+
+@emitter(AnyAnyDiscriminantMapper)
+def _emit_discriminant(c: Compiler, fn: _Function, m: AnyAnyDiscriminantMapper, src: str) -> str:
+    r = fn.var()
+    items = c.const(m.items)
+
+    if m.of_value:
+        with fn.guard(repr('$value')):
+            v = c.emit(m.dependencies['value'], fn, src)
+
+    with fn.guard(repr('$discriminant')):
+        d = c.emit(m.dependencies['discriminant'], fn, v if m.of_value else src)
+
+    with fn.block(f'if {d} not in {items}:'):
+        fn.line(
+            f"raise SerializationError(val={src}, path=['$value'], origin={c.const(m, 'm')}, "
+            f"reason=f'`{{{d}}}` is not in the map')"
+        )
+
+    if not m.of_value:
+        with fn.guard(repr('$value')):
+            v = c.emit(m.dependencies['value'], fn, src)
+
+    # every branch is a separate function, dispatched through a single dict lookup
+    table = f'_t{len(c.tail)}'
+    entries = []
+    for k, depk in m.items.items():
+        dep = m.dependencies[depk]
+        if type(dep) in EMITTERS:
+            target = c.function(dep)
+        else:
+            target = c.const(dep.serialize, 's')
+        entries.append(f'{c.const(k)}: {target}')
+    c.tail.append(f'{table} = {{{", ".join(entries)}}}')
+
+    with fn.guard(repr('$sub')):
+        fn.line(f'{r} = {table}[{d}]({v})')
+    return r
+
+
+@emitter(JsonIntoDateTimeMapper)
+def _emit_into_datetime(c: Compiler, fn: _Function, m: JsonIntoDateTimeMapper, src: str) -> str:
+    r = fn.var()
+    with fn.block(f'if not isinstance({src}, datetime):'):
+        fn.line(f'raise SerializationError(val={src})')
+    fn.line(f'{r} = {c.const(m.convert)}({src})')
+    return r
+
+
+@emitter(JsonFromDateTimeMapper)
+def _emit_from_datetime(c: Compiler, fn: _Function, m: JsonFromDateTimeMapper, src: str) -> str:
+    r = fn.var()
+    with fn.block('try:'):
+        fn.line(f'{r} = {c.const(m.convert)}({src})')
+    with fn.block('except Exception as e:'):
+        fn.line(f'raise SerializationError(val={src}, reason=str(e))')
+    return r
@@ -1,13 +1,16 @@
 import inspect
 
-from typing import List, Type, Any
+from typing import List, Type, Any, Optional, Iterable
 
 from dataclasses import dataclass, is_dataclass, field
 
 from vow.marsh.base import Mapper, Fac
-from vow.marsh.helper import DECL_CALLABLE_ATTR
-from vow.marsh.walker import Walker, Serializers, Deferred, CallableSerializers, auto_callable_fac, \
-    auto_callable_kind_reply
+from vow.marsh import disk
+from vow.marsh.cache import MAPPER_CACHE, is_stable, ordered
+from vow.marsh.compiler import compile_mappers
+from vow.marsh.helper import register
+from vow.marsh.profile import Profile
+from vow.marsh.walker import Walker, Serializers, Deferred, CallableSerializers, Args, Return
 
 
 @dataclass
@@ -25,31 +28,81 @@ class infer:
             for ctx in self.ctxs:
                 serde = Serializers.assign(obj)
                 serde[ctx.name] = Deferred(ctx, obj)
+                register(ctx.name, obj)
         else:
-            # assume the object is a callable
-            if not hasattr(obj, DECL_CALLABLE_ATTR):
-                kind, _ = auto_callable_kind_reply(obj, is_method=self.is_method)
-                setattr(obj, DECL_CALLABLE_ATTR, CallableSerializers(kind))
-
-            dx: CallableSerializers = getattr(obj, DECL_CALLABLE_ATTR)
+            # assume the object is a callable, its signature is only looked at once `Args` or `Return` are resolved
+            dx = CallableSerializers.assign(obj, is_method=self.is_method)
 
             for ctx in self.ctxs:
-                pars, rep = auto_callable_fac(ctx, ctx, obj, is_method=self.is_method)
-
-                dx.parameters[ctx.name] = pars
-                dx.return_[ctx.name] = rep
+                dx.add(ctx)
 
         return obj
 
 
-def get_serializers(name: str, *clss: Any) -> List[Mapper]:
-    walker = Walker(name)
+def get_serializers(name: str, *clss: Any, compiled: bool = False, lazy: bool = False, validate: bool = False,
+                    select: Optional[Iterable[str]] = None, optimize: bool = False,
+                    dedup: bool = False, memo: bool = False, profile: Optional[Profile] = None) -> List[Mapper]:
+    """
+    mappers are shared process-wide by (name, clss, options), see `vow.marsh.cache`, and across processes if a disk
+    cache is enabled, see `vow.marsh.disk`; the options are described in `Walker.mappers`
+    """
+    frame = inspect.currentframe().f_back
 
-    factories = [walker.resolve(cls) for cls in clss]
+    if isinstance(select, str):
+        select = select,
 
-    walker = Walker(None)
+    if select is not None:
+        select = tuple(sorted(select))
+
+    def walk():
+        walker = Walker(name, frame=frame)
+
+        factories = [walker.resolve(cls) for cls in clss]
+
+        walker = Walker(None)
+
+        return walker.mappers(*factories, lazy=lazy, validate=validate, select=select, optimize=optimize,
+                              dedup=dedup, memo=memo, profile=profile)
+
+    def build():
+        cache = disk.DISK_CACHE
+
+        roots = [_persistent(cls) for cls in clss]
+
+        if cache is None or key is None or profile is not None or any(x is None for x in roots):
+            r = walk()
+        else:
+            # compiled mappers are generated from the same graph as the interpreted ones
+            disk_key = name, tuple(roots), lazy, validate, select, optimize, dedup, memo
+            r = cache.load(disk_key)
+
+            if r is None:
+                r = walk()
+                cache.save(disk_key, r, [cls.type.__module__ for cls in clss if isinstance(cls, (Args, Return))])
+
+        return compile_mappers(*r) if compiled else r
+
+    if all(is_stable(cls.type if isinstance(cls, (Args, Return)) else cls) for cls in clss):
+        key = name, tuple(ordered(cls) for cls in clss), compiled, lazy, validate, select, optimize, dedup, memo, profile
+    else:
+        key = None
+
+    return list(MAPPER_CACHE.get(key, build))
+
+
+def _persistent(cls: Any) -> Optional[Any]:
+    """`cls` as the disk cache keys it, `None` if it is not known by the same name in every process"""
+    if isinstance(cls, (Args, Return)):
+        fun = cls.type
+
+        if '<locals>' in fun.__qualname__:
+            return None
+
+        return type(cls).__name__, fun.__module__, fun.__qualname__
+    elif ' at 0x' in repr(cls):
+        return None
 
-    return walker.mappers(*factories)
+    return cls
 
 
 def get_mappers(*facs: Fac) -> List[Mapper]:
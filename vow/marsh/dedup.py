@@ -0,0 +1,61 @@
+"""
+nodes of the graph `Walker._visit_objs` builds that would create interchangeable mappers are merged into one
+
+two nodes are interchangeable if their factories have the same `Fac.signature` and their dependencies are
+interchangeable under the same keys, in the same order. Recursive types make the graph cyclic, so the nodes are
+split into classes by refining the partition by signature until it is stable (Moore's algorithm), instead of
+hashing subtrees.
+"""
+from typing import Dict, List, Tuple, Hashable
+
+from vow.marsh.optimizer import Nodes, NodeId
+
+
+def _relabel(labels: Dict[NodeId, Hashable]) -> Dict[NodeId, int]:
+    ids = {}
+    return {k: ids.setdefault(v, len(ids)) for k, v in labels.items()}
+
+
+def partition(nodes: Nodes) -> Dict[NodeId, int]:
+    """the class of every node, interchangeable nodes are in the same class"""
+    labels = {}
+
+    for k, (_, fac, _) in nodes.items():
+        x = fac.signature()
+        labels[k] = ('unique', k) if x is None else x
+
+    classes = _relabel(labels)
+    size = len(set(classes.values()))
+
+    # leaves are never split
+    edges = [(k, tuple(deps.items())) for k, (_, _, deps) in nodes.items() if deps]
+
+    while True:
+        labels = dict(classes)
+        labels.update((k, (classes[k], tuple([(dk, classes[dv]) for dk, dv in deps]))) for k, deps in edges)
+        classes = _relabel(labels)
+
+        new_size = len(set(classes.values()))
+
+        if new_size == size:
+            return classes
+
+        size = new_size
+
+
+def dedup(nodes: Nodes, roots: List[NodeId]) -> Tuple[Nodes, List[NodeId]]:
+    """the copy of `nodes` with a single node per class, and the nodes `roots` map to in it"""
+    classes = partition(nodes)
+
+    first = {}
+
+    for k in sorted(nodes):
+        first.setdefault(classes[k], k)
+
+    r = {
+        k: (path, fac, {dk: first[classes[dv]] for dk, dv in deps.items()})
+        for k, (path, fac, deps) in nodes.items()
+        if first[classes[k]] == k
+    }
+
+    return r, [first[classes[x]] for x in roots]
@@ -0,0 +1,268 @@
+"""
+mapper graphs persisted to a directory, so that a new process loads them instead of walking the types again:
+
+    enable('/var/cache/vow')  # or VOW_MARSH_CACHE=/var/cache/vow in the environment
+
+`get_serializers` then looks every graph up on disk before it builds one, and saves the ones it builds. Entries are
+keyed by the walker name, the root types and the options, and by the sources of `vow.marsh` itself; an entry is only
+used while the modules of all the types it mentions and of their base classes are unchanged on disk (by size and
+mtime). The arguments and
+replies of callables are keyed by the dotted names of the callables, whose modules are checked as well; roots that
+are not known by the same name in every process, e.g. functions defined in functions, are not persisted. Compiled mappers are
+generated again from the loaded graph, but the code objects of the generated source are kept as well. Graphs that
+can not be pickled, e.g. of classes that are not importable by their dotted names, are not persisted.
+
+entries are unpickled when they are loaded, so the directory must only be writable by those trusted to run code in
+the process.
+"""
+import hashlib
+import marshal
+import os
+import pickle
+import sys
+import tempfile
+from collections import deque
+from copy import copy
+from types import CodeType
+from typing import Any, List, Optional, Tuple, Iterable, Set, Dict
+
+from xrpc.trace import trc
+
+from vow.marsh.base import Mapper
+
+ENV = 'VOW_MARSH_CACHE'
+
+Stamp = Tuple[str, int, int]
+
+
+def _stamp(path: str) -> Optional[Stamp]:
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+
+    return path, st.st_mtime_ns, st.st_size
+
+
+def _types(roots: Iterable[Mapper]) -> Set[type]:
+    """the types the mappers of the graph refer to"""
+    r = set()
+    seen = set()
+    to_visit = deque(roots)
+
+    def add(x):
+        if isinstance(x, type):
+            r.add(x)
+        elif isinstance(x, (tuple, list)):
+            for y in x:
+                add(y)
+        elif isinstance(x, dict):
+            for y in x:
+                add(y)
+
+    while to_visit:
+        x = to_visit.popleft()
+
+        if id(x) in seen:
+            continue
+
+        seen.add(id(x))
+
+        for cls in type(x).__mro__:
+            for k in getattr(cls, '__slots__', ()):
+                if k != 'dependencies':
+                    add(getattr(x, k, None))
+
+        to_visit.extend(x.dependencies.values())
+
+    return r
+
+
+def stamps(roots: Iterable[Mapper], modules: Iterable[str] = ()) -> List[Stamp]:
+    """
+    size and mtime of `modules` and of the modules that define the types of the graph and their base classes, whose
+    fields and the globals their annotations are resolved in belong to the graph as well
+    """
+    r = set()
+    names = {y.__module__ for x in _types(roots) for y in x.__mro__} | set(modules)
+
+    for x in names - {'builtins', 'typing'}:
+        module = sys.modules.get(x)
+        path = getattr(module, '__file__', None)
+
+        if path:
+            stamp = _stamp(path)
+
+            if stamp:
+                r.add(stamp)
+
+    return sorted(r)
+
+
+_VERSION: Optional[str] = None
+
+
+def version() -> str:
+    """changes whenever python or any source of `vow.marsh` does"""
+    global _VERSION
+
+    if _VERSION is None:
+        root = os.path.dirname(os.path.abspath(__file__))
+        r = hashlib.sha1(sys.version.encode())
+
+        for base, dirs, files in sorted(os.walk(root)):
+            dirs.sort()
+
+            for name in sorted(files):
+                if name.endswith('.py'):
+                    r.update(repr(_stamp(os.path.join(base, name))).encode())
+
+        _VERSION = r.hexdigest()
+
+    return _VERSION
+
+
+def flatten(roots: List[Mapper]) -> Tuple[List[Mapper], List[Dict[str, int]], List[int]]:
+    """
+    the nodes of the graph without their dependencies, the dependencies as indices of the nodes, and the indices of the
+    roots; `pickle` recurses into every dependency, which deep graphs run out of stack for
+    """
+    nodes = []
+    index = {}
+    to_visit = deque(roots)
+
+    while to_visit:
+        x = to_visit.popleft()
+
+        if id(x) not in index:
+            index[id(x)] = len(nodes)
+            nodes.append(x)
+            to_visit.extend(x.dependencies.values())
+
+    r = []
+
+    for x in nodes:
+        y = copy(x)
+        y.dependencies = {}
+        r.append(y)
+
+    return r, [{k: index[id(v)] for k, v in x.dependencies.items()} for x in nodes], [index[id(x)] for x in roots]
+
+
+def unflatten(nodes: List[Mapper], edges: List[Dict[str, int]], roots: List[int]) -> List[Mapper]:
+    for x, deps in zip(nodes, edges):
+        x.dependencies = {k: nodes[v] for k, v in deps.items()}
+
+    return [nodes[x] for x in roots]
+
+
+class DiskCache:
+    def __init__(self, path: str):
+        self.path = path
+        self.hits = 0
+        self.misses = 0
+
+    def filename(self, key: Tuple[Any, ...]) -> str:
+        # types are written out with their dotted names
+        digest = hashlib.sha1(f'{version()}:{key!r}'.encode()).hexdigest()
+        return os.path.join(self.path, f'{digest}.pickle')
+
+    def load(self, key: Tuple[Any, ...]) -> Optional[List[Mapper]]:
+        try:
+            with open(self.filename(key), 'rb') as f:
+                saved = pickle.load(f)
+
+                if any(_stamp(path) != (path, mtime, size) for path, mtime, size in saved):
+                    r = None
+                else:
+                    r = unflatten(*pickle.load(f))
+        except FileNotFoundError:
+            r = None
+        except Exception:
+            # the entry refers to something that no longer exists
+            trc('load').debug('%r', key, exc_info=True)
+            r = None
+
+        if r is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+
+        return r
+
+    def save(self, key: Tuple[Any, ...], mappers: List[Mapper], modules: Iterable[str] = ()) -> bool:
+        """`modules` are stamped along with the modules of the types of `mappers`"""
+        try:
+            body = pickle.dumps(flatten(mappers), pickle.HIGHEST_PROTOCOL)
+        except Exception:
+            trc('save').debug('%r', key, exc_info=True)
+            return False
+
+        self._write(self.filename(key), pickle.dumps(stamps(mappers, modules), pickle.HIGHEST_PROTOCOL) + body)
+
+        return True
+
+    def code(self, source: str, filename: str) -> CodeType:
+        """`compile(source, filename, 'exec')`, the code objects are kept next to the graphs"""
+        digest = hashlib.sha1(f'{version()}:{filename}:{source}'.encode()).hexdigest()
+        path = os.path.join(self.path, f'{digest}.code')
+
+        try:
+            with open(path, 'rb') as f:
+                r = marshal.load(f)
+        except FileNotFoundError:
+            pass
+        except Exception:
+            trc('code').debug('%s', path, exc_info=True)
+        else:
+            self.hits += 1
+            return r
+
+        self.misses += 1
+
+        r = compile(source, filename, 'exec')
+        self._write(path, marshal.dumps(r))
+
+        return r
+
+    def _write(self, path: str, body: bytes):
+        os.makedirs(self.path, exist_ok=True)
+
+        fd, tmp = tempfile.mkstemp(dir=self.path, suffix='.tmp')
+
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(body)
+
+            # readers in other processes either see the whole entry or none
+            os.replace(tmp, path)
+        except BaseException:
+            os.unlink(tmp)
+            raise
+
+    def clear(self):
+        for name in os.listdir(self.path):
+            if name.endswith(('.pickle', '.code')):
+                os.unlink(os.path.join(self.path, name))
+
+
+DISK_CACHE: Optional[DiskCache] = DiskCache(os.environ[ENV]) if os.environ.get(ENV) else None
+
+
+def compile_source(source: str, filename: str) -> CodeType:
+    """`compile(source, filename, 'exec')`, through the disk cache if one is enabled"""
+    cache = DISK_CACHE
+
+    if cache is None:
+        return compile(source, filename, 'exec')
+
+    return cache.code(source, filename)
+
+
+def enable(path: Optional[str]) -> Optional[DiskCache]:
+    """persist mapper graphs to `path`, or stop doing so if `None`"""
+    global DISK_CACHE
+
+    DISK_CACHE = DiskCache(path) if path else None
+
+    return DISK_CACHE
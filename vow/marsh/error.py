@@ -1,10 +1,11 @@
 import sys
 from contextlib import contextmanager
-from typing import List, Optional, Any
+from typing import List, Optional, Any, TYPE_CHECKING
 
 from dataclasses import MISSING, dataclass, replace, field, fields
 
-from vow.marsh.base import Mapper
+if TYPE_CHECKING:
+    from vow.marsh.base import Mapper
 
 BUFFER_NEEDED = 'buffer_overrun'
 
@@ -14,7 +15,7 @@ class SerializationError(Exception):
     val: Any = MISSING
     path: List[str] = field(default_factory=list)
     reason: Optional[str] = None
-    origin: Optional[Mapper] = None
+    origin: Optional['Mapper'] = None
     exc: Optional[Exception] = None
 
     def __repr__(self):
@@ -30,9 +31,21 @@ class SerializationError(Exception):
     def __str__(self) -> str:
         return repr(self)
 
+    def __reduce__(self):
+        # `val` is a required argument, errors raised by a process pool are pickled, see `vow.marsh.pool`
+        return self.__class__, (self.val,), self.__dict__
+
     def with_path(self, *path):
         return replace(self, path=list(path) + self.path)
 
+    def prepend_path(self, *path) -> 'SerializationError':
+        """
+        the in-place version of `with_path`, mappers call it from their `except` clauses and then re-raise,
+        so that the path is only ever built while the error is propagating
+        """
+        self.path[:0] = path
+        return self
+
 
 class subserializer:
     def __init__(self, *path):
@@ -44,7 +57,8 @@ class subserializer:
     def __exit__(self, exc_type, e, exc_tb):
         if exc_type is not None:
             if issubclass(exc_type, SerializationError):
-                raise e.with_path(*self.path).with_traceback(exc_tb) from None
+                e.prepend_path(*self.path)
+        return False
 
 # @contextmanager
 # def subserializer(*path):
@@ -1,4 +1,5 @@
-from typing import Type
+from typing import Type, Optional
+from weakref import WeakValueDictionary
 
 DECL_ATTR = '__serde__'
 DECL_CALLABLE_ATTR = '__serde_callable__'
@@ -8,3 +9,25 @@ FIELD_FACTORY = '__marsh_factory__'
 
 def is_serializable(cls: Type):
     return hasattr(cls, DECL_ATTR)
+
+
+# `Ref.full_name` -> the class carrying the serializers, weak so that classes defined in functions can be collected
+REGISTRY: 'WeakValueDictionary[str, Type]' = WeakValueDictionary()
+
+
+def full_name(name: str, item: str) -> str:
+    return f'{name}:{item}'
+
+
+def item_name(cls: Type) -> str:
+    # classes of the same name in different scopes of a module differ by their `__qualname__`; those defined in
+    # different calls of a function do not, `Ref` tells them apart by identity
+    return f'{cls.__module__}.{cls.__qualname__}'
+
+
+def register(name: str, cls: Type):
+    REGISTRY[full_name(name, item_name(cls))] = cls
+
+
+def lookup(full_name: str) -> Optional[Type]:
+    return REGISTRY.get(full_name)
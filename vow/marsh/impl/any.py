@@ -1,22 +1,25 @@
 import logging
 from importlib import import_module
-from typing import Any, Type, Optional, Dict, Tuple, List, Callable
+from operator import attrgetter, itemgetter
+from typing import Any, Type, Optional, Dict, Tuple, List, Callable, Hashable
 
 from dataclasses import dataclass, field, MISSING
 from xrpc.trace import trc
 
-from vow.marsh.error import SerializationError, subserializer
-from vow.marsh.helper import is_serializable, DECL_ATTR
-from vow.marsh.base import Mapper, Fac, FieldsFac, Fields
+from vow.marsh.error import SerializationError
+from vow.marsh.helper import is_serializable, DECL_ATTR, register, lookup, full_name, item_name
+from vow.marsh.base import Mapper, Fac, FieldsFac, Fields, batch
 
 
 class AnyAnySelfMapper(Mapper):
+    __slots__ = ()
 
     def serialize(self, obj: Any) -> Any:
         return self.dependencies['self'].serialize(obj)
 
 
 class ThisMapper(Mapper):
+    __slots__ = 'type',
 
     def __init__(self, type: Optional[Type], dependencies: Fields):
         self.type = type
@@ -31,6 +34,17 @@ class ThisMapper(Mapper):
 
         return obj
 
+    @batch
+    def serialize_many(self, objs: List[Any]) -> List[Any]:
+        if self.type is None:
+            return list(objs)
+
+        try:
+            return list(map(self.type, objs))
+        except Exception:
+            # `type` may raise anything, which `serialize` reports as `unmappable`
+            return Mapper.serialize_many(self, objs)
+
     def __repr__(self) -> str:
         return f'{self.__class__.__name__}({self.type})'
 
@@ -47,6 +61,7 @@ class This(Fac):
 
 
 class AnyAnyAttrMapper(Mapper):
+    __slots__ = 'name',
 
     def __init__(self, name: str, dependencies: Fields):
         self.name = name
@@ -59,11 +74,23 @@ class AnyAnyAttrMapper(Mapper):
             raise SerializationError(val=obj, reason=f'attr_missing', origin=self, exc=e)
 
         if len(self.dependencies):
-            with subserializer('$attr'):
+            try:
                 return self.dependencies['type'].serialize(r)
+            except SerializationError as e:
+                e.prepend_path('$attr')
+                raise
         else:
             return r
 
+    @batch
+    def serialize_many(self, objs: List[Any]) -> List[Any]:
+        r = list(map(attrgetter(self.name), objs))
+
+        if len(self.dependencies):
+            r = self.dependencies['type'].serialize_many(r)
+
+        return r
+
 
 @dataclass()
 class AnyAnyAttr(Fac):
@@ -81,6 +108,7 @@ class AnyAnyAttr(Fac):
 
 
 class AnyAnyItemMapper(Mapper):
+    __slots__ = 'name',
 
     def __init__(self, name: str, dependencies: Fields):
         self.name = name
@@ -95,8 +123,15 @@ class AnyAnyItemMapper(Mapper):
         except KeyError as e:
             raise SerializationError(val=obj, reason='key_missing', exc=e, origin=self)
 
-        with subserializer('$item'):
+        try:
             return self.dependencies['type'].serialize(r)
+        except SerializationError as e:
+            e.prepend_path('$item')
+            raise
+
+    @batch
+    def serialize_many(self, objs: List[Any]) -> List[Any]:
+        return self.dependencies['type'].serialize_many(list(map(itemgetter(self.name), objs)))
 
 
 @dataclass()
@@ -111,6 +146,24 @@ class AnyAnyItem(Fac):
         return {'type': self.type}
 
 
+def _import(item: str) -> Any:
+    """the object at the dotted `__module__` and `__qualname__` of `item`"""
+    parts = item.split('.')
+
+    for i in range(len(parts) - 1, 0, -1):
+        try:
+            r = import_module('.'.join(parts[:i]))
+        except ImportError:
+            continue
+
+        for x in parts[i:]:
+            r = getattr(r, x)
+
+        return r
+
+    raise ImportError(item)
+
+
 @dataclass
 class Ref(Fac):
     name: str
@@ -120,18 +173,31 @@ class Ref(Fac):
         self.name = name
         if isinstance(item, str):
             self.item = item
+            self.cls = None
         else:
-            self.item = f'{item.__module__}.{item.__name__}'
+            self.item = item_name(item)
+            self.cls = item
+            register(name, item)
+        self.full_name = full_name(self.name, self.item)
 
-    @property
-    def full_name(self):
-        return f'{self.name}:{self.item}'
+    def target(self) -> Type:
+        """the class carrying the serializers"""
+        r = self.cls
 
-    def resolve(self) -> Fac:
-        module, item = self.item.rsplit('.', 1)
-        r = getattr(import_module(module), item)
+        if r is None:
+            r = lookup(self.full_name)
+
+        if r is None:
+            r = _import(self.item)
 
-        assert is_serializable(r), (self.item, r)
+            assert is_serializable(r), (self.item, r)
+
+            register(self.name, r)
+
+        return r
+
+    def resolve(self) -> Fac:
+        r = self.target()
 
         try:
             return getattr(r, DECL_ATTR)[self.name]
@@ -143,27 +209,47 @@ class Ref(Fac):
 
 
 class AnyAnyDiscriminantMapper(Mapper):
+    """`of_value` takes the discriminant of the value instead of the object, so that the value is only built once"""
+    __slots__ = 'items', 'of_value'
 
-    def __init__(self, items: Dict[Any, str], dependencies: Fields):
+    def __init__(self, items: Dict[Any, str], dependencies: Fields, of_value: bool = False):
         self.items = items
+        self.of_value = of_value
         super().__init__(dependencies)
 
     def serialize(self, obj: Any) -> Any:
-        with subserializer('$discriminant'):
-            discriminant = self.dependencies['discriminant'].serialize(obj)
+        if self.of_value:
+            try:
+                value = self.dependencies['value'].serialize(obj)
+            except SerializationError as e:
+                e.prepend_path('$value')
+                raise
+
+        try:
+            discriminant = self.dependencies['discriminant'].serialize(value if self.of_value else obj)
+        except SerializationError as e:
+            e.prepend_path('$discriminant')
+            raise
 
         if discriminant not in self.items:
             raise SerializationError(val=obj, path=['$value'], origin=self,
                                      reason=f'`{discriminant}` is not in the map')
 
-        with subserializer('$value'):
-            value = self.dependencies['value'].serialize(obj)
+        if not self.of_value:
+            try:
+                value = self.dependencies['value'].serialize(obj)
+            except SerializationError as e:
+                e.prepend_path('$value')
+                raise
 
         depk = self.items[discriminant]
         dep = self.dependencies[depk]
 
-        with subserializer('$sub'):
+        try:
             return dep.serialize(value)
+        except SerializationError as e:
+            e.prepend_path('$sub')
+            raise
 
 
 @dataclass
@@ -172,11 +258,22 @@ class AnyAnyDiscriminant(Fac):
     discriminant: Fac
     value: Fac
     mappers: List[Tuple[Any, Fac]]
+    of_value: bool = False
 
     def create(self, dependencies: Fields) -> Mapper:
         return self.__mapper_cls__(items={
             x: str(i) for i, (x, _) in enumerate(self.mappers)
-        }, dependencies=dependencies)
+        }, dependencies=dependencies, of_value=self.of_value)
+
+    def signature(self) -> Optional[Hashable]:
+        r = self.__class__, tuple((x.__class__, x) for x, _ in self.mappers), self.of_value
+
+        try:
+            hash(r)
+        except TypeError:
+            return None
+
+        return r
 
     def dependencies(self) -> FieldsFac:
         r = {str(i): x for i, (_, x) in enumerate(self.mappers)}
@@ -197,6 +294,7 @@ class FieldValue:
 
 @dataclass
 class AnyAnyFieldMapper(Mapper):
+    __slots__ = 'name',
 
     def __init__(self, name: str, dependencies: Fields):
         self.name = name
@@ -205,8 +303,11 @@ class AnyAnyFieldMapper(Mapper):
     def serialize(self, obj: Any) -> FieldValue:
         v = self.dependencies['item']
 
-        with subserializer(self.name):
+        try:
             obj = v.serialize(obj)
+        except SerializationError as e:
+            e.prepend_path(self.name)
+            raise
 
         return FieldValue(self.name, obj)
 
@@ -224,10 +325,14 @@ class AnyAnyField(Fac):
 
 
 class AnyAnyLenMapper(Mapper):
+    __slots__ = ()
 
     def serialize(self, obj: Any) -> Any:
-        with subserializer('$item'):
+        try:
             obj = self.dependencies['item'].serialize(obj)
+        except SerializationError as e:
+            e.prepend_path('$item')
+            raise
         return len(obj)
 
 
@@ -241,14 +346,18 @@ class AnyAnyLen(Fac):
 
 
 class AnyAnyLookupMapper(Mapper):
+    __slots__ = 'lookup',
 
     def __init__(self, lookup: Dict[Any, Any], dependencies: Fields):
         self.lookup = lookup
         super().__init__(dependencies)
 
     def serialize(self, obj: Any) -> Any:
-        with subserializer('$value'):
+        try:
             obj2 = self.dependencies['value'].serialize(obj)
+        except SerializationError as e:
+            e.prepend_path('$value')
+            raise
 
         if obj2 not in self.lookup:
             raise SerializationError(val=obj, exc=KeyError(obj2), reason='key_missing')
@@ -269,13 +378,20 @@ class AnyAnyLookup(Fac):
 
 
 class AnyAnyWithMapper(Mapper):
+    __slots__ = ()
 
     def serialize(self, obj: Any) -> Any:
-        with subserializer('$value'):
+        try:
             obj = self.dependencies['value'].serialize(obj)
+        except SerializationError as e:
+            e.prepend_path('$value')
+            raise
 
-        with subserializer('$child'):
+        try:
             r = self.dependencies['child'].serialize(obj)
+        except SerializationError as e:
+            e.prepend_path('$child')
+            raise
 
         return r
 
@@ -291,7 +407,34 @@ class AnyAnyWith(Fac):
         return {'value': self.value, 'child': self.child}
 
 
+class AnyAnyChainMapper(Mapper):
+    """`AnyAnyWith` nested into itself, as a flat list of mappers each one fed with the result of the previous"""
+    __slots__ = ()
+
+    def serialize(self, obj: Any) -> Any:
+        for i, x in enumerate(self.dependencies.values()):
+            try:
+                obj = x.serialize(obj)
+            except SerializationError as e:
+                e.prepend_path(str(i))
+                raise
+
+        return obj
+
+
+@dataclass
+class AnyAnyChain(Fac):
+    __mapper_cls__ = AnyAnyChainMapper
+
+    items: List[Fac]
+
+    def dependencies(self) -> FieldsFac:
+        return {str(i): v for i, v in enumerate(self.items)}
+
+
 class AnyAnyTraceMapper(Mapper):
+    __slots__ = 'logger', 'level', 'mapper'
+
     def __init__(self, logger: logging.Logger, level, mapper, dependencies: Fields):
         self.logger = logger
         self.level = level
@@ -322,5 +465,8 @@ class AnyAnyTrace(Fac):
             dependencies=dependencies
         )
 
+    def signature(self) -> Optional[Hashable]:
+        return self._signature('name', 'level', 'mapper')
+
     def dependencies(self) -> FieldsFac:
         return {'child': self.child}
@@ -1,31 +1,147 @@
-from typing import Any
+from enum import Enum
+from typing import Any, List, Tuple, Type, Dict, Optional
 
 from dataclasses import dataclass
 
-from vow.marsh.error import SerializationError, subserializer
-from vow.marsh.impl.any import FieldValue
+from vow.marsh.base import Mapper, Fields, batch
+from vow.marsh.error import SerializationError
 from vow.marsh.impl.any_into import AnyIntoStructMapper, AnyIntoStruct, AnyIntoEnumMapper, AnyIntoEnum
 
 
 class AnyFromStructMapper(AnyIntoStructMapper):
+    __slots__ = ()
 
     def serialize(self, obj: Any) -> Any:
-        r = {}
-        for idx, v in self.dependencies.items():
-            with subserializer(idx):
-                item = v.serialize(obj)
-
-                if not isinstance(item, FieldValue):
-                    raise SerializationError(val=item, reason='unsupported_field_defn', origin=self)
-
-            if item.has_value:
-                r[item.name] = item.value
+        r = self.serialize_fields(obj, {})
 
         if self.cls:
             return self.cls(**r)
         else:
             return r
 
+    @batch
+    def serialize_many(self, objs: List[Any]) -> List[Any]:
+        r = self.serialize_rows(objs)
+
+        if r is None:
+            return Mapper.serialize_many(self, objs)
+
+        if self.cls:
+            cls = self.cls
+            return [cls(**x) for x in r]
+        else:
+            return list(r)
+
+
+class PartialFromStructMapper(AnyFromStructMapper):
+    """
+    builds `cls` from a subset of its fields, without calling `__init__`; the fields that were left out are not set,
+    so reading them returns the class-level default or raises `AttributeError`
+    """
+    __slots__ = ()
+
+    def serialize(self, obj: Any) -> Any:
+        return _materialize(self.cls, self.serialize_fields(obj, {}))
+
+    @batch
+    def serialize_many(self, objs: List[Any]) -> List[Any]:
+        r = self.serialize_rows(objs)
+
+        if r is None:
+            return Mapper.serialize_many(self, objs)
+
+        cls = self.cls
+        return [_materialize(cls, x) for x in r]
+
+
+RAW_ATTR = '__vow_raw__'
+
+
+class LazyField:
+    """decodes a single field of a `LazyFromStructMapper` proxy on first access, and caches it on the instance"""
+    __slots__ = 'path', 'name', 'mapper'
+
+    def __init__(self, path: Tuple[Any, ...], name: str, mapper: Mapper):
+        self.path = path
+        self.name = name
+        self.mapper = mapper
+
+    def __get__(self, instance: Any, owner: Type) -> Any:
+        if instance is None:
+            return self
+
+        try:
+            r = self.mapper.serialize(instance.__dict__[RAW_ATTR])
+        except SerializationError as e:
+            e.prepend_path(*self.path)
+            raise
+
+        instance.__dict__[self.name] = r
+
+        return r
+
+
+def _materialize(cls: Type, values: Dict[str, Any]) -> Any:
+    r = object.__new__(cls)
+
+    # instances of slotted or frozen dataclasses
+    for k, v in values.items():
+        object.__setattr__(r, k, v)
+
+    return r
+
+
+class LazyFromStructMapper(AnyFromStructMapper):
+    """
+    returns an instance of a subclass of `cls` that keeps the raw value, every field is only decoded on first access;
+    errors in a field are therefore raised when it is accessed, and `__post_init__` is not called
+    """
+    __slots__ = '_lazy',
+
+    def __init__(self, cls: Type, dependencies: Fields):
+        self._lazy = None
+        super().__init__(cls, dependencies)
+
+    @property
+    def lazy(self) -> Optional[Type]:
+        r = self._lazy
+
+        if r is None and self.cls and all(name is not None for _, name, _ in self.fields):
+            names = [name for _, name, _ in self.fields]
+
+            attrs = {name: LazyField(path, name, v) for path, name, v in self.fields}
+            attrs['__module__'] = self.cls.__module__
+            attrs['__qualname__'] = self.cls.__qualname__
+            attrs['__reduce__'] = lambda x: (_materialize, (self.cls, {k: getattr(x, k) for k in names}))
+
+            if self.cls.__dataclass_params__.eq:
+                # dataclasses only compare equal to instances of the exact same class
+                def __eq__(x, y):
+                    if y.__class__ is self.cls or y.__class__ is r:
+                        return all(getattr(x, k) == getattr(y, k) for k in names)
+                    return NotImplemented
+
+                attrs['__eq__'] = __eq__
+                attrs['__hash__'] = self.cls.__hash__
+
+            r = self._lazy = type(self.cls.__name__, (self.cls,), attrs)
+
+        return r
+
+    def serialize(self, obj: Any) -> Any:
+        lazy = self.lazy
+
+        if lazy is None:
+            return super().serialize(obj)
+
+        if not hasattr(obj, '__getitem__'):
+            raise SerializationError(val=obj, reason='invalid_obj', origin=self)
+
+        return _materialize(lazy, {RAW_ATTR: obj})
+
+    # proxies are cheap enough to be created one at a time
+    serialize_many = Mapper.serialize_many
+
 
 @dataclass
 class AnyFromStruct(AnyIntoStruct):
@@ -33,15 +149,36 @@ class AnyFromStruct(AnyIntoStruct):
 
 
 class AnyFromEnumMapper(AnyIntoEnumMapper):
+    """`members` maps every value to its member, any other value is looked up by the enum itself"""
+    __slots__ = 'members',
+
+    def __init__(self, enum: Type[Enum], dependencies: Fields):
+        self.members: Dict[Any, Enum] = {x.value: x for x in enum}
+        super().__init__(enum, dependencies)
+
     def serialize(self, obj: Any) -> Any:
-        with subserializer('$value'):
+        try:
             obj2 = self.dependencies['value'].serialize(obj)
+        except SerializationError as e:
+            e.prepend_path('$value')
+            raise
 
+        try:
+            return self.members[obj2]
+        except (KeyError, TypeError):
+            return self.missing(obj, obj2)
+
+    def missing(self, obj: Any, obj2: Any) -> Enum:
+        """`obj2` is not the value of any member, but `_missing_` of the enum may still know it"""
         try:
             return self.enum(obj2)
         except Exception as e:
             raise SerializationError(path=['$enum'], val=obj, exc=e, reason=f'invalid_enum_key', origin=self)
 
+    @batch
+    def serialize_many(self, objs: List[Any]) -> List[Any]:
+        return list(map(self.members.__getitem__, self.dependencies['value'].serialize_many(objs)))
+
 
 @dataclass
 class AnyFromEnum(AnyIntoEnum):
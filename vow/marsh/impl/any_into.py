@@ -1,37 +1,90 @@
 from collections import OrderedDict
 from enum import Enum
-from typing import Type, List, Tuple, Any, Optional
+from typing import Type, List, Tuple, Any, Optional, Dict, Iterable, Hashable
 
-from dataclasses import dataclass, field
+from dataclasses import dataclass, field, MISSING
 
-from vow.marsh.error import SerializationError, subserializer
-from vow.marsh.base import Fields, FieldsFac, Mapper, Fac
-from vow.marsh.impl.any import This, FieldValue
+from vow.marsh.error import SerializationError
+from vow.marsh.base import Fields, FieldsFac, Mapper, Fac, batch
+from vow.marsh.impl.any import This, FieldValue, AnyAnyFieldMapper
 
 
 class AnyIntoStructMapper(Mapper):
+    __slots__ = 'cls', '_fields'
 
     def __init__(self, cls: Type, dependencies: Fields):
         self.cls = cls
+        self._fields = None
         super().__init__(dependencies)
 
-    def serialize(self, obj: Any) -> Any:
-        if self.cls and not isinstance(obj, self.cls):
-            raise SerializationError(val=obj, reason='not_instance', origin=self)
+    @property
+    def fields(self) -> List[Tuple[Tuple[str, ...], Optional[str], Mapper]]:
+        """
+        (path, name, mapper) for every dependency, `AnyAnyFieldMapper` is skipped and its item mapper is called
+        directly, so that no `FieldValue` is built per field; `name` is `None` for any other field mapper
+        """
+        r = self._fields
+
+        if r is None:
+            # dependencies are only assigned after the mapper is created
+            r = self._fields = [
+                ((idx, v.name), v.name, v.dependencies['item']) if type(v) is AnyAnyFieldMapper else ((idx,), None, v)
+                for idx, v in self.dependencies.items()
+            ]
 
-        r = OrderedDict()
+        return r
 
-        for idx, v in self.dependencies.items():
-            with subserializer(idx):
+    def serialize_fields(self, obj: Any, r: Dict[str, Any]) -> Dict[str, Any]:
+        for path, name, v in self.fields:
+            try:
                 item = v.serialize(obj)
+            except SerializationError as e:
+                e.prepend_path(*path)
+                raise
 
+            if name is None:
                 if not isinstance(item, FieldValue):
-                    raise SerializationError(val=item, reason='unsupported_field_defn', origin=self)
+                    raise SerializationError(val=item, path=[path[0]], reason='unsupported_field_defn', origin=self)
+
+                name, item = item.name, item.value
 
-            if item.has_value:
-                r[item.name] = item.value
+            if item is not MISSING:
+                r[name] = item
         return r
 
+    def serialize(self, obj: Any) -> Any:
+        if self.cls and not isinstance(obj, self.cls):
+            raise SerializationError(val=obj, reason='not_instance', origin=self)
+
+        return self.serialize_fields(obj, OrderedDict())
+
+    def serialize_rows(self, objs: List[Any], factory: Type[dict] = dict) -> Optional[Iterable[Dict[str, Any]]]:
+        """serialize `objs` a field at a time, so that every field mapper sees the whole batch"""
+        fields = self.fields
+
+        if any(name is None for _, name, _ in fields):
+            return None
+
+        names = [name for _, name, _ in fields]
+        columns = [v.serialize_many(objs) for _, _, v in fields]
+
+        if any(MISSING in x for x in columns):
+            return (factory((k, v) for k, v in zip(names, row) if v is not MISSING) for row in zip(*columns))
+        else:
+            return (factory(zip(names, row)) for row in zip(*columns))
+
+    @batch
+    def serialize_many(self, objs: List[Any]) -> List[Any]:
+        if self.cls and not all(isinstance(x, self.cls) for x in objs):
+            raise TypeError('not_instance')
+
+        r = self.serialize_rows(objs, OrderedDict)
+
+        if r is None:
+            return Mapper.serialize_many(self, objs)
+
+        return list(r)
+
 
 @dataclass
 class AnyIntoStruct(Fac):
@@ -46,29 +99,52 @@ class AnyIntoStruct(Fac):
             dependencies=dependencies,
         )
 
+    def signature(self) -> Optional[Hashable]:
+        return self._signature('cls')
+
     def dependencies(self) -> FieldsFac:
         return {str(i): v for i, v in enumerate(self.fields)}
 
 
 class AnyIntoEnumMapper(Mapper):
+    """
+    `values` maps every member to its value; the members are checked for their exact class, as the members of an
+    `IntEnum` are equal to plain ints, and nothing else may be a member of an enum. Members that are not iterated over,
+    e.g. the combinations of a `Flag`, fall back to their `value`
+    """
+    __slots__ = 'enum', 'values'
 
     def __init__(self, enum: Type[Enum], dependencies: Fields):
         self.enum = enum
+        self.values: Dict[Enum, Any] = {x: x.value for x in enum}
         super().__init__(dependencies)
 
     def serialize(self, obj: Any) -> Any:
-        with subserializer('value'):
+        try:
             obj = self.dependencies['value'].serialize(obj)
+        except SerializationError as e:
+            e.prepend_path('value')
+            raise
 
-        if not isinstance(obj, self.enum):
+        if obj.__class__ is not self.enum:
             raise SerializationError(val=obj, reason='enum_not_enum', origin=self)
 
         try:
-            obj = obj.value
-        except AttributeError as e:
-            raise SerializationError(val=obj, exc=e, reason='invalid_enum', origin=self)
+            return self.values[obj]
+        except KeyError:
+            return obj.value
+
+    @batch
+    def serialize_many(self, objs: List[Any]) -> List[Any]:
+        objs = self.dependencies['value'].serialize_many(objs)
 
-        return obj
+        if not set(map(type, objs)) <= {self.enum}:
+            raise TypeError('enum_not_enum')
+
+        try:
+            return list(map(self.values.__getitem__, objs))
+        except KeyError:
+            return [x.value for x in objs]
 
 
 @dataclass
@@ -82,5 +158,8 @@ class AnyIntoEnum(Fac):
     def create(self, dependencies: Fields) -> Mapper:
         return self.__mapper_cls__(enum=self.enum, dependencies=dependencies)
 
+    def signature(self) -> Optional[Hashable]:
+        return self._signature('enum')
+
     def dependencies(self) -> FieldsFac:
         return {'value': self.value}
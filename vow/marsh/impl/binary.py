@@ -1,13 +1,19 @@
-from typing import Any, Union
+from typing import Any, Union, Optional, Type, List, Tuple
 
 from dataclasses import dataclass
 
+from vow.marsh.base import Mapper, Fields
+from vow.marsh.error import SerializationError
+from vow.marsh.impl.any import AnyAnyFieldMapper
+
 BINARY_FROM = 'bin_from'
 BINARY_INTO = 'bin_into'
 
 
 @dataclass
 class BinaryNext:
+    __slots__ = 'val', 'next'
+
     val: Any
     next: Union[bytes, memoryview]
 
@@ -20,3 +26,31 @@ class BinaryNext:
             bts = repr(bts)
 
         return f'{self.__class__.__name__}({repr(self.val)}, {bts})'
+
+
+class BinaryStructMapper(Mapper):
+    """fields of a binary struct are positional, they are written and read in the order of `dependencies`"""
+    __slots__ = 'cls', '_fields'
+
+    def __init__(self, cls: Optional[Type], dependencies: Fields):
+        self.cls = cls
+        self._fields = None
+        super().__init__(dependencies)
+
+    @property
+    def fields(self) -> List[Tuple[Tuple[str, ...], str, Mapper]]:
+        """(path, name, mapper) for every `AnyAnyField` dependency"""
+        r = self._fields
+
+        if r is None:
+            r = []
+
+            for idx, v in self.dependencies.items():
+                if type(v) is not AnyAnyFieldMapper:
+                    raise SerializationError(val=v, path=[idx], reason='unsupported_field_defn', origin=self)
+
+                r.append(((idx, v.name), v.name, v.dependencies['item']))
+
+            self._fields = r
+
+        return r
@@ -0,0 +1,431 @@
+"""
+dataclasses marked with `fixed` are packed by a single precompiled `struct.Struct` in the binary encodings, the fields
+must all have a fixed width, and nested dataclasses are flattened into the layout of their parent:
+
+    @infer(BINARY_INTO, BINARY_FROM)
+    @fixed
+    @dataclass
+    class Point:
+        x: Int32
+        y: Int32
+
+the layout is a different wire format from the one of an unmarked dataclass: bounded ints and enums with int values
+are written in their own width instead of as zigzag varints, floats as they are.
+"""
+import struct
+import typing
+from enum import Enum
+from itertools import starmap
+from operator import attrgetter
+from typing import Any, Callable, Dict, List, Optional, Tuple, Type, Iterator
+
+from dataclasses import dataclass, field, fields, is_dataclass, Field
+
+from vow.marsh.base import Mapper, Fac, FieldsFac, Fields
+from vow.marsh.error import SerializationError, BUFFER_NEEDED
+from vow.marsh.helper import FIELD_OVERRIDE, FIELD_FACTORY
+from vow.marsh.impl.binary_from import BinaryReaderMapper, BinaryFromVarInt
+from vow.marsh.impl.binary_into import BinaryIntoVarInt
+
+
+# bounded ints and single precision floats, anywhere outside of a fixed layout these are plain `int` and `float`
+
+class Int8(int):
+    pass
+
+
+class Int16(int):
+    pass
+
+
+class Int32(int):
+    pass
+
+
+class Int64(int):
+    pass
+
+
+class UInt8(int):
+    pass
+
+
+class UInt16(int):
+    pass
+
+
+class UInt32(int):
+    pass
+
+
+class UInt64(int):
+    pass
+
+
+class Float32(float):
+    pass
+
+
+FORMATS: Dict[Type, str] = {
+    # a byte, which is checked to be 0 or 1 when it is decoded
+    bool: 'B',
+    Int8: 'b',
+    Int16: 'h',
+    Int32: 'i',
+    Int64: 'q',
+    UInt8: 'B',
+    UInt16: 'H',
+    UInt32: 'I',
+    UInt64: 'Q',
+    Float32: 'f',
+    float: 'd',
+}
+
+# formats an enum with int values is packed as, the first one that fits all of the values wins
+ENUM_FORMATS = 'bhiq'
+
+FIXED_ATTR = '__vow_fixed__'
+
+# a check of the values of a layout that `struct` does not do: dotted path, reason, and the condition on `o`
+Check = Tuple[str, str, str]
+
+
+def fixed(cls: Type) -> Type:
+    """packs the dataclass `cls` with a fixed layout in the binary encodings"""
+    setattr(cls, FIXED_ATTR, True)
+    return cls
+
+
+class Layout:
+    """the `struct.Struct` of a fixed dataclass, how to flatten an instance into it and how to build one back"""
+    __slots__ = 'cls', 'struct', 'names', 'checks', 'get', 'build', 'flat'
+
+    def __init__(self, cls: Type, format: str, names: List[str], build: str, namespace: Dict[str, Any],
+                 checks: List[Check]):
+        self.cls = cls
+        self.struct = struct.Struct('<' + format)
+        # dotted attribute paths of the values, `attrgetter` reads all of them in a single call
+        self.names = tuple(names)
+        # the dotted path, the reason and the predicate of every check
+        self.checks = tuple((path, reason, eval(f'lambda o: {x}', namespace)) for path, reason, x in checks)
+
+        get = attrgetter(*names)
+        get = get if len(names) > 1 else lambda x: (get(x),)
+
+        if checks:
+            # the values of an instance that fails a check raise `TypeError`, as `struct` does not check them
+            namespace = dict(namespace, get=get, invalid=_invalid)
+            cond = ' and '.join(x for _, _, x in checks)
+            get = eval(f'lambda o: get(o) if {cond} else invalid(o)', namespace)
+
+        self.get = get
+
+        # `cls(*values)` is what `build` does for a dataclass of scalars, which `starmap` does without a lambda
+        self.flat = build == 'c0(' + ', '.join(f't[{i}]' for i in range(len(names))) + ')'
+        self.build: Callable[[Tuple], Any] = eval(f'lambda t: {build}', namespace)
+
+    @property
+    def size(self) -> int:
+        return self.struct.size
+
+    def pack(self, obj: Any) -> bytes:
+        return self.struct.pack(*self.get(obj))
+
+    def invalid(self, obj: Any) -> SerializationError:
+        """the error of the first value of `obj` that fails its check"""
+        for path, reason, check in self.checks:
+            if not check(obj):
+                return SerializationError(val=attrgetter(path)(obj), path=path.split('.'), reason=reason)
+
+        return SerializationError(val=obj, reason='not_fixed')
+
+    def unpack_from(self, buf: Any, offset: int = 0) -> Any:
+        return self.build(self.struct.unpack_from(buf, offset))
+
+    def iter_unpack(self, buf: Any) -> Iterator[Any]:
+        """the records packed one after another in `buf`"""
+        if self.flat:
+            return starmap(self.cls, self.struct.iter_unpack(buf))
+        return map(self.build, self.struct.iter_unpack(buf))
+
+    def __repr__(self) -> str:
+        return f'{self.__class__.__name__}({self.cls.__name__}, {self.struct.format!r})'
+
+    def __reduce__(self):
+        # `get` and `build` are generated, the layout is derived again from the class
+        return fixed_layout, (self.cls,)
+
+
+def _invalid(obj: Any):
+    raise TypeError('not_fixed')
+
+
+def _enum_format(cls: Type[Enum]) -> Optional[str]:
+    values = [x.value for x in cls]
+
+    if not values or not all(x.__class__ is int for x in values):
+        return None
+
+    for x in ENUM_FORMATS:
+        bits = struct.calcsize(x) * 8 - 1
+
+        if all(-2 ** bits <= y < 2 ** bits for y in values):
+            return x
+
+    return None
+
+
+def _fields(cls: Type) -> Optional[List[Tuple[str, Type]]]:
+    try:
+        hints = typing.get_type_hints(cls)
+    except Exception:
+        return None
+
+    r = []
+
+    for item in fields(cls):
+        item: Field
+
+        if not item.init or FIELD_FACTORY in item.metadata:
+            return None
+
+        r.append((item.name, item.metadata.get(FIELD_OVERRIDE, hints.get(item.name, item.type))))
+
+    return r
+
+
+def _layout(cls: Type, prefix: str, format: List[str], names: List[str], namespace: Dict[str, Any],
+            checks: List[Check]) -> Optional[str]:
+    """appends the fields of `cls` to the layout, and returns the expression that builds it from the values `t`"""
+    items = _fields(cls)
+
+    if items is None:
+        return None
+
+    const = f'c{len(namespace)}'
+    namespace[const] = cls
+
+    args = []
+
+    for name, t in items:
+        path = prefix + name
+
+        if t is bool:
+            format.append(FORMATS[t])
+            names.append(path)
+            checks.append((path, 'not_bool', f'o.{path}.__class__ is bool'))
+            # any byte other than 0 and 1 raises `IndexError`
+            args.append(f'bools[t[{len(names) - 1}]]')
+        elif t in FORMATS:
+            format.append(FORMATS[t])
+            names.append(path)
+            args.append(f't[{len(names) - 1}]')
+        elif isinstance(t, type) and issubclass(t, Enum):
+            x = _enum_format(t)
+
+            if x is None:
+                return None
+
+            enum = f'c{len(namespace)}'
+            namespace[enum] = t
+
+            format.append(x)
+            names.append(path + '.value')
+            checks.append((path, 'enum_not_enum', f'o.{path}.__class__ is {enum}'))
+            args.append(f'{enum}(t[{len(names) - 1}])')
+        elif isinstance(t, type) and is_dataclass(t):
+            checks.append((path, 'not_instance', f'isinstance(o.{path}, c{len(namespace)})'))
+            x = _layout(t, path + '.', format, names, namespace, checks)
+
+            if x is None:
+                return None
+
+            args.append(x)
+        else:
+            return None
+
+    if not names:
+        return None
+
+    return f'{const}({", ".join(args)})'
+
+
+def fixed_layout(cls: Type) -> Optional[Layout]:
+    """the layout of `cls` if it is marked with `fixed`, which is kept on the class"""
+    if not isinstance(cls, type) or not is_dataclass(cls):
+        return None
+
+    r = cls.__dict__.get(FIXED_ATTR)
+
+    if r is None or isinstance(r, Layout):
+        return r
+
+    format = []
+    names = []
+    namespace = {'bools': (False, True)}
+    checks = []
+
+    build = _layout(cls, '', format, names, namespace, checks)
+
+    if build is None:
+        raise ValueError(f'{cls} is marked as fixed but has fields that are not fixed-width')
+
+    r = Layout(cls, ''.join(format), names, build, namespace, checks)
+    setattr(cls, FIXED_ATTR, r)
+
+    return r
+
+
+class BinaryIntoFixedMapper(Mapper):
+    __slots__ = 'layout',
+
+    def __init__(self, cls: Type, dependencies: Fields):
+        self.layout = fixed_layout(cls)
+        super().__init__(dependencies)
+
+    def serialize(self, obj: Any) -> bytes:
+        layout = self.layout
+
+        if not isinstance(obj, layout.cls):
+            raise SerializationError(val=obj, reason='not_instance', origin=self)
+
+        try:
+            return layout.struct.pack(*layout.get(obj))
+        except AttributeError as e:
+            raise SerializationError(val=obj, reason='attr_missing', origin=self, exc=e)
+        except TypeError:
+            e = layout.invalid(obj)
+            e.origin = self
+            raise e from None
+        except struct.error as e:
+            raise SerializationError(val=obj, reason='not_fixed', origin=self, exc=e)
+
+
+@dataclass
+class BinaryIntoFixed(Fac):
+    __mapper_cls__ = BinaryIntoFixedMapper
+    __mapper_args__ = 'cls',
+
+    cls: Type
+
+
+class BinaryFromFixedMapper(BinaryReaderMapper):
+    __slots__ = 'layout',
+
+    def __init__(self, cls: Type, dependencies: Fields):
+        self.layout = fixed_layout(cls)
+        super().__init__(dependencies)
+
+    def read(self, buf: memoryview, pos: int) -> Tuple[Any, int]:
+        layout = self.layout
+        end = pos + layout.struct.size
+
+        if end > len(buf):
+            raise SerializationError(val=buf[pos:], reason=BUFFER_NEEDED, origin=self)
+
+        try:
+            return layout.build(layout.struct.unpack_from(buf, pos)), end
+        except ValueError as e:
+            raise SerializationError(val=buf[pos:end], reason='enum_value_invalid', origin=self, exc=e)
+        except IndexError as e:
+            raise SerializationError(val=buf[pos:end], reason='not_bool', origin=self, exc=e)
+
+
+@dataclass
+class BinaryFromFixed(Fac):
+    __mapper_cls__ = BinaryFromFixedMapper
+    __mapper_args__ = 'cls',
+
+    cls: Type
+
+
+class BinaryIntoFixedArrayMapper(Mapper):
+    """the same bytes as `BinaryIntoList` of `BinaryIntoFixed`, without a mapper call per item"""
+    __slots__ = 'layout',
+
+    def __init__(self, cls: Type, dependencies: Fields):
+        self.layout = fixed_layout(cls)
+        super().__init__(dependencies)
+
+    def serialize(self, obj: Any) -> bytes:
+        if not isinstance(obj, (list, tuple)):
+            raise SerializationError(val=obj, reason='not_list', origin=self)
+
+        layout = self.layout
+        cls = layout.cls
+        pack = layout.struct.pack
+        get = layout.get
+
+        try:
+            r = [pack(*get(x)) for x in obj if x.__class__ is cls or isinstance(x, cls)]
+        except (AttributeError, TypeError, struct.error):
+            r = None
+
+        if r is None or len(r) != len(obj):
+            # the offending item reports the error
+            item = BinaryIntoFixedMapper(cls, {})
+            r = []
+
+            for i, x in enumerate(obj):
+                try:
+                    r.append(item.serialize(x))
+                except SerializationError as e:
+                    e.prepend_path(i)
+                    raise
+
+        r.insert(0, self.dependencies['size'].serialize(len(obj)))
+
+        return b''.join(r)
+
+
+@dataclass
+class BinaryIntoFixedArray(Fac):
+    __mapper_cls__ = BinaryIntoFixedArrayMapper
+    __mapper_args__ = 'cls',
+
+    cls: Type
+    size: Fac = field(default_factory=BinaryIntoVarInt)
+
+    def dependencies(self) -> FieldsFac:
+        return {'size': self.size}
+
+
+class BinaryFromFixedArrayMapper(BinaryReaderMapper):
+    """unpacks the items in a single `iter_unpack` over the buffer"""
+    __slots__ = 'layout',
+
+    def __init__(self, cls: Type, dependencies: Fields):
+        self.layout = fixed_layout(cls)
+        super().__init__(dependencies)
+
+    def read(self, buf: memoryview, pos: int) -> Tuple[List[Any], int]:
+        try:
+            size, start = self.dependencies['size'].read(buf, pos)
+        except SerializationError as e:
+            e.prepend_path('$size')
+            raise
+
+        layout = self.layout
+        end = start + size * layout.struct.size
+
+        if end > len(buf):
+            raise SerializationError(val=buf[pos:], reason=BUFFER_NEEDED, origin=self)
+
+        try:
+            return list(layout.iter_unpack(buf[start:end])), end
+        except ValueError as e:
+            raise SerializationError(val=buf[pos:end], reason='enum_value_invalid', origin=self, exc=e)
+        except IndexError as e:
+            raise SerializationError(val=buf[pos:end], reason='not_bool', origin=self, exc=e)
+
+
+@dataclass
+class BinaryFromFixedArray(Fac):
+    __mapper_cls__ = BinaryFromFixedArrayMapper
+    __mapper_args__ = 'cls',
+
+    cls: Type
+    size: Fac = field(default_factory=BinaryFromVarInt)
+
+    def dependencies(self) -> FieldsFac:
+        return {'size': self.size}
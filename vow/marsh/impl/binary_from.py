@@ -1,37 +1,88 @@
 import json
-from typing import Tuple, Any
+from datetime import timedelta
+from enum import Enum
+from typing import Tuple, Any, List, Optional, Type, Union, Callable, Dict
 
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 
-from vow.marsh.base import FieldsFac, Mapper, Fac
-from vow.marsh.error import subserializer, SerializationError, BUFFER_NEEDED
-from vow.marsh.impl.binary import BinaryNext
+from vow.marsh.base import FieldsFac, Mapper, Fac, Fields
+from vow.marsh.error import SerializationError, BUFFER_NEEDED
+from vow.marsh.impl.binary import BinaryNext, BinaryStructMapper
+from vow.marsh.impl.binary_into import EPOCH, DOUBLE
+from vow.marsh.impl.json_from import UTC
 
+Buffer = Union[bytes, memoryview]
 
-class BinaryFromVarIntMapper(Mapper):
+Reader = Callable[[memoryview, int], Tuple[Any, int]]
 
-    def serialize(self, obj: bytes) -> BinaryNext:
-        if not isinstance(obj, bytes) and not isinstance(obj, memoryview):
-            raise SerializationError(val=obj, reason='not_bytes', origin=self)
 
-        r = 0
-        i = 0
-        curr = memoryview(obj)
+class BinaryReaderMapper(Mapper):
+    """
+    decodes the value at an offset of the buffer; readers nested into each other pass the offset along through
+    `read`, so that only the outermost one slices the buffer and builds a `BinaryNext`. The `size` and `value`
+    dependencies of scalars must be readers themselves, any other dependency may be an arbitrary `bin_from` mapper
+    """
+    __slots__ = ()
+
+    def read(self, buf: memoryview, pos: int) -> Tuple[Any, int]:
+        """the value at `pos` and the offset right after it"""
+        raise NotImplementedError
+
+    def serialize(self, obj: Buffer) -> BinaryNext:
+        if obj.__class__ is not memoryview:
+            if not isinstance(obj, bytes) and not isinstance(obj, memoryview):
+                raise SerializationError(val=obj, reason='not_bytes', origin=self)
+
+            obj = memoryview(obj)
+
+        val, pos = self.read(obj, 0)
+
+        return BinaryNext(val, obj[pos:])
+
+
+def reader(mapper: Mapper) -> Reader:
+    """`read` of `mapper`, any other mapper is given the rest of the buffer and must return a `BinaryNext`"""
+    if isinstance(mapper, BinaryReaderMapper):
+        return mapper.read
+
+    def read(buf: memoryview, pos: int) -> Tuple[Any, int]:
+        r = mapper.serialize(buf[pos:])
+        return r.val, len(buf) - len(r.next)
+
+    return read
 
-        while True:
-            if len(curr) == 0:
-                raise SerializationError(val=obj, reason=BUFFER_NEEDED, origin=self)
 
-            item, curr = curr[0], curr[1:]
+def _needed(mapper: Mapper, buf: memoryview, pos: int) -> SerializationError:
+    return SerializationError(val=buf[pos:], reason=BUFFER_NEEDED, origin=mapper)
 
-            r = r | ((item & 127) << (7 * i))
 
-            i += 1
+class BinaryFromVarIntMapper(BinaryReaderMapper):
+    __slots__ = ()
 
-            if item & 128 == 0:
-                break
+    def read(self, buf: memoryview, pos: int) -> Tuple[int, int]:
+        start = pos
 
-        return BinaryNext(r, curr)
+        try:
+            item = buf[pos]
+
+            # most varints are lengths and small ints that fit into a single byte
+            if item < 128:
+                return item, pos + 1
+
+            r = item & 127
+            shift = 7
+
+            while True:
+                pos += 1
+                item = buf[pos]
+                r |= (item & 127) << shift
+
+                if item < 128:
+                    return r, pos + 1
+
+                shift += 7
+        except IndexError:
+            raise _needed(self, buf, start)
 
 
 class BinaryFromVarInt(Fac):
@@ -39,12 +90,20 @@ class BinaryFromVarInt(Fac):
 
 
 class BinaryFromBytesMapper(Mapper):
+    __slots__ = ()
+
     def serialize(self, obj: Tuple[int, bytes]) -> BinaryNext:
-        with subserializer('$size'):
+        try:
             size = self.dependencies['size'].serialize(obj)
+        except SerializationError as e:
+            e.prepend_path('$size')
+            raise
 
-        with subserializer('$body'):
+        try:
             body = self.dependencies['body'].serialize(obj)
+        except SerializationError as e:
+            e.prepend_path('$body')
+            raise
 
         if not isinstance(size, int):
             raise SerializationError(val=obj, reason='not_int', origin=self)
@@ -70,10 +129,14 @@ class BinaryFromBytes(Fac):
 
 
 class BinaryFromJsonMapper(Mapper):
+    __slots__ = ()
 
     def serialize(self, obj: Any) -> Any:
-        with subserializer('$body'):
+        try:
             val = self.dependencies['body'].serialize(obj)
+        except SerializationError as e:
+            e.prepend_path('$body')
+            raise
 
         try:
             return json.loads(bytes(val))
@@ -88,3 +151,337 @@ class BinaryFromJson(Fac):
 
     def dependencies(self) -> FieldsFac:
         return {'body': self.body}
+
+
+class BinaryFromZigZagMapper(BinaryReaderMapper):
+    __slots__ = ()
+
+    def read(self, buf: memoryview, pos: int) -> Tuple[int, int]:
+        val, pos = self.dependencies['value'].read(buf, pos)
+        return ~(val >> 1) if val & 1 else val >> 1, pos
+
+
+@dataclass
+class BinaryFromZigZag(Fac):
+    __mapper_cls__ = BinaryFromZigZagMapper
+
+    value: Fac = field(default_factory=BinaryFromVarInt)
+
+    def dependencies(self) -> FieldsFac:
+        return {'value': self.value}
+
+
+class BinaryFromBoolMapper(BinaryReaderMapper):
+    __slots__ = ()
+
+    def read(self, buf: memoryview, pos: int) -> Tuple[bool, int]:
+        try:
+            tag = buf[pos]
+        except IndexError:
+            raise _needed(self, buf, pos)
+
+        if tag > 1:
+            raise SerializationError(val=buf[pos:], reason='not_bool', origin=self)
+
+        return tag == 1, pos + 1
+
+
+class BinaryFromBool(Fac):
+    __mapper_cls__ = BinaryFromBoolMapper
+
+
+class BinaryFromFloatMapper(BinaryReaderMapper):
+    __slots__ = ()
+
+    def read(self, buf: memoryview, pos: int) -> Tuple[float, int]:
+        if len(buf) - pos < DOUBLE.size:
+            raise _needed(self, buf, pos)
+
+        val, = DOUBLE.unpack_from(buf, pos)
+
+        return val, pos + DOUBLE.size
+
+
+class BinaryFromFloat(Fac):
+    __mapper_cls__ = BinaryFromFloatMapper
+
+
+class BinaryFromBlobMapper(BinaryReaderMapper):
+    __slots__ = ()
+
+    def body(self, buf: memoryview, pos: int) -> Tuple[memoryview, int]:
+        try:
+            size, start = self.dependencies['size'].read(buf, pos)
+        except SerializationError as e:
+            e.prepend_path('$size')
+            raise
+
+        end = start + size
+
+        if end > len(buf):
+            raise _needed(self, buf, pos)
+
+        return buf[start:end], end
+
+    def read(self, buf: memoryview, pos: int) -> Tuple[bytes, int]:
+        val, pos = self.body(buf, pos)
+        return bytes(val), pos
+
+
+@dataclass
+class BinaryFromBlob(Fac):
+    __mapper_cls__ = BinaryFromBlobMapper
+
+    size: Fac = field(default_factory=BinaryFromVarInt)
+
+    def dependencies(self) -> FieldsFac:
+        return {'size': self.size}
+
+
+class BinaryFromStrMapper(BinaryFromBlobMapper):
+    __slots__ = ()
+
+    def read(self, buf: memoryview, pos: int) -> Tuple[str, int]:
+        val, end = self.body(buf, pos)
+
+        try:
+            return str(val, 'utf-8'), end
+        except UnicodeDecodeError as e:
+            raise SerializationError(val=buf[pos:], reason='utf8', origin=self, exc=e)
+
+
+@dataclass
+class BinaryFromStr(BinaryFromBlob):
+    __mapper_cls__ = BinaryFromStrMapper
+
+
+class BinaryFromDateTimeMapper(BinaryReaderMapper):
+    """UTC, the same as `JsonFromDateTime`"""
+    __slots__ = ()
+
+    def read(self, buf: memoryview, pos: int) -> Tuple[Any, int]:
+        val, end = self.dependencies['value'].read(buf, pos)
+
+        try:
+            return (EPOCH + timedelta(microseconds=val)).replace(tzinfo=UTC), end
+        except OverflowError as e:
+            raise SerializationError(val=buf[pos:], reason='not_datetime', origin=self, exc=e)
+
+
+@dataclass
+class BinaryFromDateTime(Fac):
+    __mapper_cls__ = BinaryFromDateTimeMapper
+
+    value: Fac = field(default_factory=BinaryFromZigZag)
+
+    def dependencies(self) -> FieldsFac:
+        return {'value': self.value}
+
+
+class BinaryFromTimeDeltaMapper(BinaryReaderMapper):
+    __slots__ = ()
+
+    def read(self, buf: memoryview, pos: int) -> Tuple[timedelta, int]:
+        val, end = self.dependencies['value'].read(buf, pos)
+
+        try:
+            return timedelta(microseconds=val), end
+        except OverflowError as e:
+            raise SerializationError(val=buf[pos:], reason='not_timedelta', origin=self, exc=e)
+
+
+@dataclass
+class BinaryFromTimeDelta(Fac):
+    __mapper_cls__ = BinaryFromTimeDeltaMapper
+
+    value: Fac = field(default_factory=BinaryFromZigZag)
+
+    def dependencies(self) -> FieldsFac:
+        return {'value': self.value}
+
+
+class BinaryFromEnumMapper(BinaryReaderMapper):
+    """`members` maps every value to its member, any other value is looked up by the enum itself"""
+    __slots__ = 'enum', 'members'
+
+    def __init__(self, enum: Type[Enum], dependencies: Fields):
+        self.enum = enum
+        self.members: Dict[Any, Enum] = {x.value: x for x in enum}
+        super().__init__(dependencies)
+
+    def read(self, buf: memoryview, pos: int) -> Tuple[Enum, int]:
+        try:
+            val, end = reader(self.dependencies['value'])(buf, pos)
+        except SerializationError as e:
+            e.prepend_path('value')
+            raise
+
+        try:
+            return self.members[val], end
+        except (KeyError, TypeError):
+            pass
+
+        try:
+            return self.enum(val), end
+        except ValueError as e:
+            raise SerializationError(val=val, reason='enum_value_invalid', origin=self, exc=e)
+
+
+@dataclass
+class BinaryFromEnum(Fac):
+    __mapper_cls__ = BinaryFromEnumMapper
+    __mapper_args__ = 'enum',
+
+    enum: Type[Enum]
+    value: Fac
+
+    def dependencies(self) -> FieldsFac:
+        return {'value': self.value}
+
+
+class BinaryFromOptionalMapper(BinaryReaderMapper):
+    __slots__ = ()
+
+    def read(self, buf: memoryview, pos: int) -> Tuple[Any, int]:
+        try:
+            tag = buf[pos]
+        except IndexError:
+            raise _needed(self, buf, pos)
+
+        if tag == 0:
+            return None, pos + 1
+        elif tag == 1:
+            return reader(self.dependencies['value'])(buf, pos + 1)
+        else:
+            raise SerializationError(val=buf[pos:], reason='invalid_tag', origin=self)
+
+
+@dataclass
+class BinaryFromOptional(Fac):
+    __mapper_cls__ = BinaryFromOptionalMapper
+
+    value: Fac
+
+    def dependencies(self) -> FieldsFac:
+        return {'value': self.value}
+
+
+class BinaryFromListMapper(BinaryReaderMapper):
+    __slots__ = ()
+
+    def read(self, buf: memoryview, pos: int) -> Tuple[List[Any], int]:
+        try:
+            size, pos = self.dependencies['size'].read(buf, pos)
+        except SerializationError as e:
+            e.prepend_path('$size')
+            raise
+
+        read = reader(self.dependencies['value'])
+        r = []
+
+        for i in range(size):
+            try:
+                val, pos = read(buf, pos)
+            except SerializationError as e:
+                e.prepend_path(i)
+                raise
+
+            r.append(val)
+
+        return r, pos
+
+
+@dataclass
+class BinaryFromList(Fac):
+    __mapper_cls__ = BinaryFromListMapper
+
+    value: Fac
+    size: Fac = field(default_factory=BinaryFromVarInt)
+
+    def dependencies(self) -> FieldsFac:
+        return {'value': self.value, 'size': self.size}
+
+
+class BinaryFromDictMapper(BinaryReaderMapper):
+    __slots__ = ()
+
+    def read(self, buf: memoryview, pos: int) -> Tuple[dict, int]:
+        try:
+            size, pos = self.dependencies['size'].read(buf, pos)
+        except SerializationError as e:
+            e.prepend_path('$size')
+            raise
+
+        key = reader(self.dependencies['key'])
+        value = reader(self.dependencies['value'])
+        r = {}
+
+        for _ in range(size):
+            try:
+                k, pos = key(buf, pos)
+            except SerializationError as e:
+                e.prepend_path('$key')
+                raise
+
+            try:
+                r[k], pos = value(buf, pos)
+            except SerializationError as e:
+                e.prepend_path('$value')
+                raise
+
+        return r, pos
+
+
+@dataclass
+class BinaryFromDict(Fac):
+    __mapper_cls__ = BinaryFromDictMapper
+
+    key: Fac
+    value: Fac
+    size: Fac = field(default_factory=BinaryFromVarInt)
+
+    def dependencies(self) -> FieldsFac:
+        return {'key': self.key, 'value': self.value, 'size': self.size}
+
+
+class BinaryFromStructMapper(BinaryStructMapper, BinaryReaderMapper):
+    """reads the fields one after another"""
+    __slots__ = '_readers',
+
+    def __init__(self, cls: Optional[Type], dependencies: Fields):
+        self._readers = None
+        super().__init__(cls, dependencies)
+
+    def read_fields(self, buf: memoryview, pos: int) -> Tuple[Dict[str, Any], int]:
+        readers = self._readers
+
+        if readers is None:
+            readers = self._readers = [(path, name, reader(v)) for path, name, v in self.fields]
+
+        r = {}
+
+        for path, name, read in readers:
+            try:
+                r[name], pos = read(buf, pos)
+            except SerializationError as e:
+                e.prepend_path(*path)
+                raise
+
+        return r, pos
+
+    def read(self, buf: memoryview, pos: int) -> Tuple[Any, int]:
+        r, pos = self.read_fields(buf, pos)
+
+        return self.cls(**r) if self.cls else r, pos
+
+
+@dataclass
+class BinaryFromStruct(Fac):
+    __mapper_cls__ = BinaryFromStructMapper
+    __mapper_args__ = 'cls',
+
+    fields: List[Fac]
+    cls: Optional[Type] = None
+
+    def dependencies(self) -> FieldsFac:
+        return {str(i): v for i, v in enumerate(self.fields)}
@@ -1,18 +1,32 @@
 import json
-from typing import Any, List
+import struct
+from datetime import datetime, timedelta
+from enum import Enum
+from typing import Any, List, Type, Optional, Dict
 
 from dataclasses import dataclass, field
 
-from vow.marsh.base import FieldsFac, Mapper, Fac
-from vow.marsh.error import subserializer, SerializationError
+from vow.marsh.base import FieldsFac, Mapper, Fac, Fields
+from vow.marsh.error import SerializationError
+from vow.marsh.impl.binary import BinaryStructMapper
+
+EPOCH = datetime(1970, 1, 1)
+
+MICROSECOND = timedelta(microseconds=1)
+
+DOUBLE = struct.Struct('<d')
 
 
 class BinaryIntoVarIntMapper(Mapper):
+    __slots__ = ()
 
     def serialize(self, obj: Any) -> Any:
         if not isinstance(obj, int):
             raise SerializationError(val=obj, reason='not_int', origin=self)
 
+        if obj < 0:
+            raise SerializationError(val=obj, reason='negative', origin=self)
+
         r = []
 
         while True:
@@ -34,10 +48,14 @@ class BinaryIntoVarInt(Fac):
 
 
 class BinaryIntoJsonMapper(Mapper):
+    __slots__ = ()
 
     def serialize(self, obj: Any) -> Any:
-        with subserializer('$body'):
+        try:
             val = self.dependencies['body'].serialize(obj)
+        except SerializationError as e:
+            e.prepend_path('$body')
+            raise
 
         try:
             return json.dumps(val).encode()
@@ -55,12 +73,16 @@ class BinaryIntoJson(Fac):
 
 
 class BinaryIntoConcatMapper(Mapper):
+    __slots__ = ()
 
     def serialize(self, obj: Any) -> Any:
         r = b''
         for x in range(len(self.dependencies)):
-            with subserializer(str(x)):
+            try:
                 r += self.dependencies[str(x)].serialize(obj)
+            except SerializationError as e:
+                e.prepend_path(str(x))
+                raise
 
         return r
 
@@ -73,3 +95,308 @@ class BinaryIntoConcat(Fac):
 
     def dependencies(self) -> FieldsFac:
         return {str(i): v for i, v in enumerate(self.items)}
+
+
+class BinaryIntoZigZagMapper(Mapper):
+    """signed ints, `0, -1, 1, -2, ...` are written as the varints `0, 1, 2, 3, ...`"""
+    __slots__ = ()
+
+    def serialize(self, obj: Any) -> bytes:
+        if not isinstance(obj, int):
+            raise SerializationError(val=obj, reason='not_int', origin=self)
+
+        return self.dependencies['value'].serialize(obj << 1 if obj >= 0 else (~obj << 1) | 1)
+
+
+@dataclass
+class BinaryIntoZigZag(Fac):
+    __mapper_cls__ = BinaryIntoZigZagMapper
+
+    value: Fac = field(default_factory=BinaryIntoVarInt)
+
+    def dependencies(self) -> FieldsFac:
+        return {'value': self.value}
+
+
+class BinaryIntoBoolMapper(Mapper):
+    __slots__ = ()
+
+    def serialize(self, obj: Any) -> bytes:
+        if obj is True:
+            return b'\x01'
+        elif obj is False:
+            return b'\x00'
+        else:
+            raise SerializationError(val=obj, reason='not_bool', origin=self)
+
+
+class BinaryIntoBool(Fac):
+    __mapper_cls__ = BinaryIntoBoolMapper
+
+
+class BinaryIntoFloatMapper(Mapper):
+    __slots__ = ()
+
+    def serialize(self, obj: Any) -> bytes:
+        try:
+            return DOUBLE.pack(obj)
+        except struct.error as e:
+            raise SerializationError(val=obj, reason='not_float', origin=self, exc=e)
+
+
+class BinaryIntoFloat(Fac):
+    __mapper_cls__ = BinaryIntoFloatMapper
+
+
+class BinaryIntoBlobMapper(Mapper):
+    """bytes prefixed with their length"""
+    __slots__ = ()
+
+    def serialize(self, obj: Any) -> bytes:
+        if not isinstance(obj, (bytes, bytearray, memoryview)):
+            raise SerializationError(val=obj, reason='not_bytes', origin=self)
+
+        return self.dependencies['size'].serialize(len(obj)) + obj
+
+
+@dataclass
+class BinaryIntoBlob(Fac):
+    __mapper_cls__ = BinaryIntoBlobMapper
+
+    size: Fac = field(default_factory=BinaryIntoVarInt)
+
+    def dependencies(self) -> FieldsFac:
+        return {'size': self.size}
+
+
+class BinaryIntoStrMapper(Mapper):
+    """UTF-8 prefixed with its length in bytes"""
+    __slots__ = ()
+
+    def serialize(self, obj: Any) -> bytes:
+        if not isinstance(obj, str):
+            raise SerializationError(val=obj, reason='not_str', origin=self)
+
+        try:
+            obj = obj.encode()
+        except UnicodeEncodeError as e:
+            raise SerializationError(val=obj, reason='utf8', origin=self, exc=e)
+
+        return self.dependencies['size'].serialize(len(obj)) + obj
+
+
+@dataclass
+class BinaryIntoStr(Fac):
+    __mapper_cls__ = BinaryIntoStrMapper
+
+    size: Fac = field(default_factory=BinaryIntoVarInt)
+
+    def dependencies(self) -> FieldsFac:
+        return {'size': self.size}
+
+
+class BinaryIntoDateTimeMapper(Mapper):
+    """microseconds since the epoch, the timezone is dropped the same way `JsonIntoDateTime` drops it"""
+    __slots__ = ()
+
+    def serialize(self, obj: Any) -> bytes:
+        if not isinstance(obj, datetime):
+            raise SerializationError(val=obj, reason='not_datetime', origin=self)
+
+        return self.dependencies['value'].serialize((obj.replace(tzinfo=None) - EPOCH) // MICROSECOND)
+
+
+@dataclass
+class BinaryIntoDateTime(Fac):
+    __mapper_cls__ = BinaryIntoDateTimeMapper
+
+    value: Fac = field(default_factory=BinaryIntoZigZag)
+
+    def dependencies(self) -> FieldsFac:
+        return {'value': self.value}
+
+
+class BinaryIntoTimeDeltaMapper(Mapper):
+    """microseconds"""
+    __slots__ = ()
+
+    def serialize(self, obj: Any) -> bytes:
+        if not isinstance(obj, timedelta):
+            raise SerializationError(val=obj, reason='not_timedelta', origin=self)
+
+        return self.dependencies['value'].serialize(obj // MICROSECOND)
+
+
+@dataclass
+class BinaryIntoTimeDelta(Fac):
+    __mapper_cls__ = BinaryIntoTimeDeltaMapper
+
+    value: Fac = field(default_factory=BinaryIntoZigZag)
+
+    def dependencies(self) -> FieldsFac:
+        return {'value': self.value}
+
+
+class BinaryIntoEnumMapper(Mapper):
+    """the value of the member, the encoded values are kept per member the first time it is seen"""
+    __slots__ = 'enum', 'encoded'
+
+    def __init__(self, enum: Type[Enum], dependencies: Fields):
+        self.enum = enum
+        self.encoded: Dict[Enum, bytes] = {}
+        super().__init__(dependencies)
+
+    def serialize(self, obj: Any) -> bytes:
+        # the members of an `IntEnum` are equal to plain ints, which are not members
+        if obj.__class__ is not self.enum:
+            raise SerializationError(val=obj, reason='enum_not_enum', origin=self)
+
+        try:
+            return self.encoded[obj]
+        except KeyError:
+            pass
+
+        try:
+            r = self.encoded[obj] = self.dependencies['value'].serialize(obj.value)
+        except SerializationError as e:
+            e.prepend_path('value')
+            raise
+
+        return r
+
+
+@dataclass
+class BinaryIntoEnum(Fac):
+    __mapper_cls__ = BinaryIntoEnumMapper
+    __mapper_args__ = 'enum',
+
+    enum: Type[Enum]
+    value: Fac
+
+    def dependencies(self) -> FieldsFac:
+        return {'value': self.value}
+
+
+class BinaryIntoOptionalMapper(Mapper):
+    """a `0` tag for `None`, otherwise a `1` tag followed by the value"""
+    __slots__ = ()
+
+    def serialize(self, obj: Any) -> bytes:
+        if obj is None:
+            return b'\x00'
+
+        return b'\x01' + self.dependencies['value'].serialize(obj)
+
+
+@dataclass
+class BinaryIntoOptional(Fac):
+    __mapper_cls__ = BinaryIntoOptionalMapper
+
+    value: Fac
+
+    def dependencies(self) -> FieldsFac:
+        return {'value': self.value}
+
+
+class BinaryIntoListMapper(Mapper):
+    """the number of items followed by the items"""
+    __slots__ = ()
+
+    def serialize(self, obj: Any) -> bytes:
+        if not isinstance(obj, (list, tuple)):
+            raise SerializationError(val=obj, reason='not_list', origin=self)
+
+        value = self.dependencies['value']
+        r = [self.dependencies['size'].serialize(len(obj))]
+
+        for i, x in enumerate(obj):
+            try:
+                r.append(value.serialize(x))
+            except SerializationError as e:
+                e.prepend_path(i)
+                raise
+
+        return b''.join(r)
+
+
+@dataclass
+class BinaryIntoList(Fac):
+    __mapper_cls__ = BinaryIntoListMapper
+
+    value: Fac
+    size: Fac = field(default_factory=BinaryIntoVarInt)
+
+    def dependencies(self) -> FieldsFac:
+        return {'value': self.value, 'size': self.size}
+
+
+class BinaryIntoDictMapper(Mapper):
+    """the number of items followed by the key and the value of every item"""
+    __slots__ = ()
+
+    def serialize(self, obj: Any) -> bytes:
+        if not isinstance(obj, dict):
+            raise SerializationError(val=obj, reason='not_dict', origin=self)
+
+        key = self.dependencies['key']
+        value = self.dependencies['value']
+        r = [self.dependencies['size'].serialize(len(obj))]
+
+        for k, v in obj.items():
+            try:
+                r.append(key.serialize(k))
+            except SerializationError as e:
+                e.prepend_path('$key')
+                raise
+
+            try:
+                r.append(value.serialize(v))
+            except SerializationError as e:
+                e.prepend_path('$value')
+                raise
+
+        return b''.join(r)
+
+
+@dataclass
+class BinaryIntoDict(Fac):
+    __mapper_cls__ = BinaryIntoDictMapper
+
+    key: Fac
+    value: Fac
+    size: Fac = field(default_factory=BinaryIntoVarInt)
+
+    def dependencies(self) -> FieldsFac:
+        return {'key': self.key, 'value': self.value, 'size': self.size}
+
+
+class BinaryIntoStructMapper(BinaryStructMapper):
+    """the fields one after another, without names"""
+    __slots__ = ()
+
+    def serialize(self, obj: Any) -> bytes:
+        if self.cls and not isinstance(obj, self.cls):
+            raise SerializationError(val=obj, reason='not_instance', origin=self)
+
+        r = []
+
+        for path, _, v in self.fields:
+            try:
+                r.append(v.serialize(obj))
+            except SerializationError as e:
+                e.prepend_path(*path)
+                raise
+
+        return b''.join(r)
+
+
+@dataclass
+class BinaryIntoStruct(Fac):
+    __mapper_cls__ = BinaryIntoStructMapper
+    __mapper_args__ = 'cls',
+
+    fields: List[Fac]
+    cls: Optional[Type] = None
+
+    def dependencies(self) -> FieldsFac:
+        return {str(i): v for i, v in enumerate(self.fields)}
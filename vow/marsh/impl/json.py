@@ -1,20 +1,31 @@
-from typing import Any
+from typing import Any, List
 
 from dataclasses import dataclass
 
-from vow.marsh.error import SerializationError, subserializer
-from vow.marsh.base import Mapper, Fac, FieldsFac
+from vow.marsh.error import SerializationError
+from vow.marsh.base import Mapper, Fac, FieldsFac, batch
 
 JSON_FROM = 'json_from'
 JSON_INTO = 'json_into'
 
 
 class JsonAnyListMapper(Mapper):
+    __slots__ = ()
+
     def serialize(self, obj: Any) -> Any:
+        return self.dependencies['value'].serialize_many(obj)
+
+    @batch
+    def serialize_many(self, objs: List[Any]) -> List[Any]:
+        # a single batch over the items of every list
+        lens = [len(x) for x in objs]
+        items = self.serialize([y for x in objs for y in x])
+
         r = []
-        for i, x in enumerate(obj):
-            with subserializer(i):
-                r.append(self.dependencies['value'].serialize(x))
+        i = 0
+        for x in lens:
+            r.append(items[i:i + x])
+            i += x
         return r
 
 
@@ -29,15 +40,23 @@ class JsonAnyList(Fac):
 
 
 class JsonAnyDictMapper(Mapper):
+    __slots__ = ()
+
     def serialize(self, obj: Any) -> Any:
         r = {}
 
         for k, v in obj.items():
-            with subserializer('$key'):
+            try:
                 k = self.dependencies['key'].serialize(k)
+            except SerializationError as e:
+                e.prepend_path('$key')
+                raise
 
-            with subserializer('$value'):
+            try:
                 v = self.dependencies['value'].serialize(v)
+            except SerializationError as e:
+                e.prepend_path('$value')
+                raise
 
             r[k] = v
         return r
@@ -55,6 +74,7 @@ class JsonAnyDict(Fac):
 
 
 class JsonAnyOptionalMapper(Mapper):
+    __slots__ = ()
 
     def serialize(self, obj: Any) -> Any:
         if obj is None:
@@ -62,6 +82,16 @@ class JsonAnyOptionalMapper(Mapper):
         else:
             return self.dependencies['value'].serialize(obj)
 
+    @batch
+    def serialize_many(self, objs: List[Any]) -> List[Any]:
+        idxs = [i for i, x in enumerate(objs) if x is not None]
+
+        r = [None] * len(objs)
+
+        for i, x in zip(idxs, self.dependencies['value'].serialize_many([objs[i] for i in idxs])):
+            r[i] = x
+        return r
+
 
 @dataclass
 class JsonAnyOptional(Fac):
@@ -73,17 +103,24 @@ class JsonAnyOptional(Fac):
 
 
 class JsonAnyAnyMapper(Mapper):
+    __slots__ = ()
 
     def serialize(self, obj: Any) -> Any:
         if isinstance(obj, dict):
             r = {}
             for k, v in obj.items():
-                with subserializer('$key'):
+                try:
                     k = self.serialize(k)
+                except SerializationError as e:
+                    e.prepend_path('$key')
+                    raise
                 assert isinstance(k, str), k
 
-                with subserializer('$value'):
+                try:
                     v = self.serialize(v)
+                except SerializationError as e:
+                    e.prepend_path('$value')
+                    raise
 
                 r[k] = v
             return r
@@ -91,8 +128,11 @@ class JsonAnyAnyMapper(Mapper):
             r = []
 
             for i, v in enumerate(obj):
-                with subserializer(i):
+                try:
                     r.append(self.serialize(v))
+                except SerializationError as e:
+                    e.prepend_path(i)
+                    raise
             return r
         elif isinstance(obj, str):
             return obj
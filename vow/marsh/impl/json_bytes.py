@@ -0,0 +1,226 @@
+import json
+from math import inf as INFINITY
+from json.encoder import encode_basestring_ascii
+from typing import Any, Callable, Dict, List, Type, BinaryIO
+
+from dataclasses import dataclass, MISSING
+
+from vow.marsh.base import Mapper, Fac, FieldsFac
+from vow.marsh.error import SerializationError
+from vow.marsh.impl.any import AnyAnyAttrMapper
+from vow.marsh.impl.any_into import AnyIntoStructMapper
+from vow.marsh.impl.json import JsonAnyListMapper, JsonAnyDictMapper, JsonAnyOptionalMapper
+
+JSON_BYTES = 'json_bytes'
+
+# number of pending parts after which they are encoded and handed over to the output
+FLUSH_PARTS = 4096
+
+Writer = Callable[[Mapper, Any, 'JsonWriter'], None]
+
+WRITERS: Dict[Type[Mapper], Writer] = {}
+
+
+def writer(*clss: Type[Mapper]):
+    def dec(fn: Writer) -> Writer:
+        for cls in clss:
+            WRITERS[cls] = fn
+        return fn
+
+    return dec
+
+
+class JsonWriter:
+    """collects the parts of a JSON document and encodes them into `out` every `FLUSH_PARTS` parts"""
+    __slots__ = 'parts', 'out'
+
+    def __init__(self, out: Callable[[bytes], Any]):
+        self.parts: List[str] = []
+        self.out = out
+
+    def flush(self):
+        if self.parts:
+            self.out(''.join(self.parts).encode())
+            self.parts.clear()
+
+    def value(self, m: Mapper, obj: Any):
+        WRITERS.get(m.__class__, write_any)(m, obj, self)
+
+
+def dumps(val: Any) -> str:
+    """the same text `json.dumps` would produce for `val`"""
+    cls = val.__class__
+
+    if cls is str:
+        return encode_basestring_ascii(val)
+    elif cls is int:
+        return int.__repr__(val)
+    elif cls is bool:
+        return 'true' if val else 'false'
+    elif cls is float:
+        if val != val:
+            return 'NaN'
+        elif val == INFINITY:
+            return 'Infinity'
+        elif val == -INFINITY:
+            return '-Infinity'
+        return float.__repr__(val)
+    elif val is None:
+        return 'null'
+    else:
+        return json.dumps(val)
+
+
+def write_any(m: Mapper, obj: Any, w: JsonWriter):
+    """
+    any mapper without a writer builds its value, which is then dumped as a whole; this is also the fastest
+    way to write scalars and lists of scalars
+    """
+    w.parts.append(dumps(m.serialize(obj)))
+
+
+@writer(AnyIntoStructMapper)
+def write_struct(m: AnyIntoStructMapper, obj: Any, w: JsonWriter):
+    if m.cls and not isinstance(obj, m.cls):
+        raise SerializationError(val=obj, reason='not_instance', origin=m)
+
+    parts = w.parts
+    sep = '{'
+
+    for path, name, v in m.fields:
+        try:
+            if name is not None and v.__class__ is AnyAnyAttrMapper:
+                try:
+                    item = getattr(obj, v.name)
+                except AttributeError as e:
+                    raise SerializationError(val=obj, reason='attr_missing', origin=v, exc=e)
+
+                if item is MISSING:
+                    continue
+
+                parts.append(sep)
+                parts.append(encode_basestring_ascii(name))
+                parts.append(': ')
+
+                if len(v.dependencies):
+                    try:
+                        w.value(v.dependencies['type'], item)
+                    except SerializationError as e:
+                        e.prepend_path('$attr')
+                        raise
+                else:
+                    parts.append(dumps(item))
+            else:
+                item = v.serialize(obj)
+
+                if name is None:
+                    # `FieldValue` protocol
+                    name, item = item.name, item.value
+
+                if item is MISSING:
+                    continue
+
+                parts.append(sep)
+                parts.append(encode_basestring_ascii(name))
+                parts.append(': ')
+                parts.append(dumps(item))
+        except SerializationError as e:
+            e.prepend_path(*path)
+            raise
+
+        sep = ', '
+
+    parts.append('{}' if sep == '{' else '}')
+
+
+@writer(JsonAnyListMapper)
+def write_list(m: JsonAnyListMapper, obj: Any, w: JsonWriter):
+    value = m.dependencies['value']
+    parts = w.parts
+    sep = '['
+
+    for i, x in enumerate(obj):
+        parts.append(sep)
+
+        try:
+            w.value(value, x)
+        except SerializationError as e:
+            e.prepend_path(i)
+            raise
+
+        sep = ', '
+
+        if len(parts) > FLUSH_PARTS:
+            w.flush()
+
+    parts.append('[]' if sep == '[' else ']')
+
+
+@writer(JsonAnyDictMapper)
+def write_dict(m: JsonAnyDictMapper, obj: Any, w: JsonWriter):
+    key = m.dependencies['key']
+    value = m.dependencies['value']
+    parts = w.parts
+    sep = '{'
+
+    for k, v in obj.items():
+        try:
+            k = key.serialize(k)
+        except SerializationError as e:
+            e.prepend_path('$key')
+            raise
+
+        parts.append(sep)
+        # non-string keys are quoted the way `json.dumps` quotes them
+        parts.append(encode_basestring_ascii(k if k.__class__ is str else dumps(k)))
+        parts.append(': ')
+
+        try:
+            w.value(value, v)
+        except SerializationError as e:
+            e.prepend_path('$value')
+            raise
+
+        sep = ', '
+
+        if len(parts) > FLUSH_PARTS:
+            w.flush()
+
+    parts.append('{}' if sep == '{' else '}')
+
+
+@writer(JsonAnyOptionalMapper)
+def write_optional(m: JsonAnyOptionalMapper, obj: Any, w: JsonWriter):
+    if obj is None:
+        w.parts.append('null')
+    else:
+        w.value(m.dependencies['value'], obj)
+
+
+class JsonBytesMapper(Mapper):
+    """writes UTF-8 JSON straight from a `json_into` graph, without building the intermediate tree"""
+    __slots__ = ()
+
+    def dump(self, obj: Any, out: Callable[[bytes], Any]):
+        """write the JSON of `obj` into `out` in chunks, on error whatever was already written stays there"""
+        w = JsonWriter(out)
+        w.value(self.dependencies['value'], obj)
+        w.flush()
+
+    def dump_stream(self, obj: Any, fp: BinaryIO):
+        self.dump(obj, fp.write)
+
+    def serialize(self, obj: Any) -> bytes:
+        r = bytearray()
+        self.dump(obj, r.extend)
+        return bytes(r)
+
+
+@dataclass
+class JsonBytes(Fac):
+    __mapper_cls__ = JsonBytesMapper
+
+    value: Fac
+
+    def dependencies(self) -> FieldsFac:
+        return {'value': self.value}
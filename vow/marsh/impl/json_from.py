@@ -1,29 +1,89 @@
 from datetime import datetime, timedelta
-from typing import Any
+from functools import lru_cache
+from typing import Any, List, Callable
 
 import pytz
+from dataclasses import dataclass
 
 from vow.marsh.error import SerializationError
 from vow.marsh.impl.json_into import JsonIntoDateTime, \
-    JsonIntoDateTimeMapper
-from vow.marsh.base import Mapper, Fac
+    JsonIntoDateTimeMapper, ISO8601
+from vow.marsh.base import Mapper, Fac, Fields, batch
+
+UTC = pytz.utc
+
+if hasattr(datetime, 'fromisoformat'):
+    fromisoformat = datetime.fromisoformat
+else:
+    fromisoformat = None
+
+
+def parse_iso8601(obj: str) -> datetime:
+    """`datetime.strptime(obj, ISO8601)` in utc, the exact layout `format_iso8601` writes is parsed by `fromisoformat`"""
+    if fromisoformat is not None and obj.__class__ is str and len(obj) == 27 and obj[26] == 'Z' and \
+            obj[4] == '-' and obj[7] == '-' and obj[10] == 'T' and obj[13] == ':' and obj[16] == ':' and \
+            obj[19] == '.' and obj.isascii() and \
+            (obj[:4] + obj[5:7] + obj[8:10] + obj[11:13] + obj[14:16] + obj[17:19] + obj[20:26]).isdigit():
+        # `fromisoformat` also takes e.g. offsets in place of the fraction, which `strptime` does not
+        try:
+            return fromisoformat(obj[:26]).replace(tzinfo=UTC)
+        except ValueError:
+            pass
+
+    return datetime.strptime(obj, ISO8601).replace(tzinfo=UTC)
+
+
+def parser(format: str, cache: int = 0) -> Callable[[str], datetime]:
+    if format == ISO8601:
+        parse = parse_iso8601
+    else:
+        def parse(obj: str) -> datetime:
+            return datetime.strptime(obj, format).replace(tzinfo=UTC)
+
+    if cache:
+        cached = lru_cache(cache)(parse)
+
+        def parse_cached(obj: str) -> datetime:
+            return cached(obj) if obj.__class__ is str else parse(obj)
+
+        return parse_cached
+    else:
+        return parse
 
 
 class JsonFromDateTimeMapper(JsonIntoDateTimeMapper):
+    __slots__ = 'cache',
+
+    def __init__(self, format: str, cache: int, dependencies: Fields):
+        super().__init__(format, dependencies)
+        self.cache = cache
+        self.convert = parser(format, cache)
 
     def serialize(self, obj: Any) -> Any:
         try:
-            r = datetime.strptime(obj, self.format)
+            return self.convert(obj)
         except Exception as e:
             raise SerializationError(val=obj, reason=str(e))
-        return r.replace(tzinfo=pytz.utc)
 
+    @batch
+    def serialize_many(self, objs: List[Any]) -> List[Any]:
+        return list(map(self.convert, objs))
 
+
+@dataclass
 class JsonFromDateTime(JsonIntoDateTime):
+    """
+    :param cache: keep up to this many parsed timestamps, for inputs that repeat the same timestamps a lot
+    """
     __mapper_cls__ = JsonFromDateTimeMapper
+    __mapper_args__ = 'format', 'cache'
+
+    cache: int = 0
 
 
 class JsonFromTimeDeltaMapper(Mapper):
+    __slots__ = ()
+
     def serialize(self, obj: float) -> timedelta:
         try:
             obj = float(obj)
@@ -1,25 +1,42 @@
-from typing import Any
+from typing import Any, List
 
 from dataclasses import dataclass
 from datetime import timedelta, datetime
 
 from vow.marsh.error import SerializationError
-from vow.marsh.base import Mapper, Fac, Fields
+from vow.marsh.base import Mapper, Fac, Fields, batch
 
 ISO8601 = '%Y-%m-%dT%H:%M:%S.%fZ'
 
 
+def format_iso8601(obj: datetime) -> str:
+    """`format(obj, ISO8601)`, which ignores the timezone of `obj` just as `strftime` does"""
+    if obj.__class__ is datetime and obj.year >= 1000:
+        # `isoformat` appends the utc offset of aware datetimes after the 26th character
+        return obj.isoformat('T', 'microseconds')[:26] + 'Z'
+    return format(obj, ISO8601)
+
+
 class JsonIntoDateTimeMapper(Mapper):
+    __slots__ = 'format', 'convert'
 
     def __init__(self, format: str, dependencies: Fields):
         self.format = format
+        self.convert = format_iso8601 if format == ISO8601 else lambda x: x.__format__(format)
         super().__init__(dependencies)
 
     def serialize(self, obj: datetime) -> Any:
         if not isinstance(obj, datetime):
             raise SerializationError(val=obj)
 
-        return format(obj, self.format)
+        return self.convert(obj)
+
+    @batch
+    def serialize_many(self, objs: List[Any]) -> List[Any]:
+        if not all(isinstance(x, datetime) for x in objs):
+            raise TypeError('not_datetime')
+
+        return list(map(self.convert, objs))
 
 
 @dataclass
@@ -30,12 +47,21 @@ class JsonIntoDateTime(Fac):
 
 
 class JsonIntoTimeDeltaMapper(Mapper):
+    __slots__ = ()
+
     def serialize(self, obj: timedelta) -> Any:
         if not isinstance(obj, timedelta):
             raise SerializationError(val=obj)
 
         return obj.total_seconds()
 
+    @batch
+    def serialize_many(self, objs: List[Any]) -> List[Any]:
+        if not all(isinstance(x, timedelta) for x in objs):
+            raise TypeError('not_timedelta')
+
+        return [x.total_seconds() for x in objs]
+
 
 class JsonIntoTimeDelta(Fac):
     __mapper_cls__ = JsonIntoTimeDeltaMapper
@@ -0,0 +1,138 @@
+from typing import Any, Optional, Type, List
+
+from dataclasses import dataclass
+
+from vow.marsh.base import Mapper, Fac, Fields, FieldsFac
+from vow.marsh.error import SerializationError
+from vow.marsh.impl.any import This
+from vow.marsh.impl.json import JsonAnyListMapper, JsonAnyList
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+DTYPES = {
+    bool: 'bool',
+    int: 'int64',
+    float: 'float64',
+}
+
+
+def to_list(arr: 'numpy.ndarray', type: Type) -> Optional[List[Any]]:
+    """convert a numeric array with a single numpy call, `None` if it can not be converted exactly"""
+    kind = arr.dtype.kind
+
+    if arr.ndim != 1 or kind not in 'biuf':
+        return None
+
+    if type is int:
+        if kind in 'iu':
+            return arr.tolist()
+        elif kind == 'f' and not (numpy.isfinite(arr).all() and (numpy.abs(arr) < 2 ** 63).all()):
+            return None
+
+    return arr.astype(DTYPES[type]).tolist()
+
+
+class JsonAnyArrayMapper(JsonAnyListMapper):
+    """
+    a list of `bool`, `int` or `float` that converts `numpy.ndarray` values in a single call; plain lists are
+    already converted by a single `map` in `ThisMapper.serialize_many`, which is faster than a round trip through numpy
+    """
+    __slots__ = 'type',
+
+    def __init__(self, type: Type, dependencies: Fields):
+        self.type = type
+        super().__init__(dependencies)
+
+    def serialize(self, obj: Any) -> Any:
+        if isinstance(obj, numpy.ndarray):
+            r = to_list(obj, self.type)
+
+            if r is not None:
+                return r
+
+        return super().serialize(obj)
+
+
+@dataclass
+class JsonAnyArray(JsonAnyList):
+    __mapper_cls__ = JsonAnyArrayMapper
+    __mapper_args__ = 'type',
+
+    type: Type
+
+    def __init__(self, type: Type):
+        self.type = type
+        self.value = This(type)
+
+
+class JsonIntoNdArrayMapper(Mapper):
+    __slots__ = 'dtype',
+
+    def __init__(self, dtype: Optional[Any], dependencies: Fields):
+        self.dtype = dtype
+        super().__init__(dependencies)
+
+    def serialize(self, obj: Any) -> Any:
+        if not isinstance(obj, numpy.ndarray):
+            raise SerializationError(val=obj, reason='not_ndarray', origin=self)
+
+        if self.dtype is not None and obj.dtype != self.dtype:
+            try:
+                obj = obj.astype(self.dtype, casting='same_kind')
+            except TypeError as e:
+                raise SerializationError(val=obj, reason='invalid_dtype', exc=e, origin=self)
+
+        return obj.tolist()
+
+
+@dataclass
+class JsonIntoNdArray(Fac):
+    __mapper_cls__ = JsonIntoNdArrayMapper
+    __mapper_args__ = 'dtype',
+
+    dtype: Optional[Any] = None
+
+    def dependencies(self) -> FieldsFac:
+        return {}
+
+
+class JsonFromNdArrayMapper(JsonIntoNdArrayMapper):
+    __slots__ = ()
+
+    def serialize(self, obj: Any) -> Any:
+        try:
+            r = numpy.asarray(obj, dtype=self.dtype)
+        except (TypeError, ValueError, OverflowError) as e:
+            raise SerializationError(val=obj, reason='unmappable', exc=e, origin=self)
+
+        if r.dtype.kind not in 'biufc':
+            raise SerializationError(val=obj, reason='not_numeric', origin=self)
+
+        return r
+
+
+@dataclass
+class JsonFromNdArray(JsonIntoNdArray):
+    __mapper_cls__ = JsonFromNdArrayMapper
+
+
+def ndarray_dtype(cls: Any) -> Optional[Any]:
+    """the dtype of `numpy.typing.NDArray[...]`, `None` for a bare `numpy.ndarray`"""
+    args = getattr(cls, '__args__', None)
+
+    if not args or len(args) != 2:
+        return None
+
+    dtype_args = getattr(args[1], '__args__', None)
+
+    if not dtype_args or not isinstance(dtype_args[0], type):
+        return None
+
+    return numpy.dtype(dtype_args[0])
+
+
+def is_ndarray(cls: Any) -> bool:
+    return numpy is not None and (cls is numpy.ndarray or getattr(cls, '__origin__', None) is numpy.ndarray)
@@ -0,0 +1,227 @@
+import codecs
+import json
+import re
+from typing import Any, Iterator, List, Sequence, BinaryIO, AsyncIterator, Optional, Tuple
+
+from vow.marsh.base import Mapper
+from vow.marsh.error import SerializationError
+from vow.marsh.impl.json import JsonAnyListMapper
+
+CHUNK_SIZE = 2 ** 16
+
+WS = re.compile(r'[ \t\n\r]*')
+
+# what is left of the buffer after a value could still become valid once more data arrives
+TRUNCATED = re.compile(r'[^,:\[\]{}\s]*')
+
+DECODER = json.JSONDecoder()
+
+
+class NeedMore(Exception):
+    pass
+
+
+class JsonArrayParser:
+    """
+    an incremental parser for the items of a JSON array; the array is either the document itself, or found by
+    following `path` through the keys of nested objects, everything after the array is ignored.
+
+    a value that is not complete yet is decoded again from its start once the data held for it has doubled, so that
+    a value spanning many chunks is decoded a logarithmic number of times; an item may therefore be returned a few
+    chunks after the one that completed it
+    """
+
+    __slots__ = 'path', 'depth', 'buf', 'pos', 'final', 'state', 'idx', 'decoder', 'wait'
+
+    def __init__(self, path: Sequence[str] = ()):
+        self.path = list(path)
+        self.depth = 0
+        self.buf = ''
+        self.pos = 0
+        self.final = False
+        self.state = 'open'
+        self.idx = 0
+        self.decoder = codecs.getincrementaldecoder('utf-8')()
+        # the length of `buf` the step that needed more data is retried at
+        self.wait = 0
+
+    @property
+    def done(self) -> bool:
+        return self.state == 'done'
+
+    def feed(self, data: bytes, final: bool = False) -> List[Tuple[int, Any]]:
+        """feed the next chunk of the document, return the (index, item) pairs it completed"""
+        try:
+            text = self.decoder.decode(data, final)
+        except UnicodeDecodeError as e:
+            raise SerializationError(val=data, path=self.path[:self.depth], reason='utf8', exc=e)
+
+        self.buf = self.buf[self.pos:] + text
+        self.pos = 0
+        self.final = final
+
+        r = []
+
+        if len(self.buf) < self.wait and not final:
+            return r
+
+        while self.state != 'done':
+            pos = self.pos
+
+            try:
+                self._step(r)
+            except NeedMore:
+                # every step either completes or is retried from scratch with more data
+                self.pos = pos
+                self.wait = 2 * (len(self.buf) - pos)
+
+                if final:
+                    self._error('truncated')
+                break
+            except json.JSONDecodeError as e:
+                self._error('json', e)
+
+        return r
+
+    def _error(self, reason: str, exc: Optional[Exception] = None):
+        path = self.path[:self.depth]
+
+        if self.state == 'key':
+            path.append(self.path[self.depth])
+        elif self.state in ('item', 'next'):
+            path.append(self.idx)
+
+        raise SerializationError(val=self.buf[self.pos:self.pos + 32], path=path, reason=reason, exc=exc)
+
+    def _char(self) -> str:
+        pos = WS.match(self.buf, self.pos).end()
+
+        if pos >= len(self.buf):
+            raise NeedMore()
+
+        self.pos = pos
+        return self.buf[pos]
+
+    def _truncated(self, pos: int) -> bool:
+        return not self.final and TRUNCATED.fullmatch(self.buf, pos) is not None
+
+    def _value(self) -> Any:
+        try:
+            r, end = DECODER.raw_decode(self.buf, self.pos)
+        except json.JSONDecodeError as e:
+            if (e.msg.startswith('Unterminated string') and not self.final) or self._truncated(e.pos):
+                raise NeedMore()
+            raise
+
+        # a value is only complete once it is followed by a delimiter, e.g. `1.5` may arrive as `1.` and `5`
+        pos = WS.match(self.buf, end).end()
+
+        if pos >= len(self.buf):
+            if not self.final:
+                raise NeedMore()
+        elif self.buf[pos] not in ',:]}':
+            if self._truncated(end):
+                raise NeedMore()
+            raise json.JSONDecodeError('Expecting \',\' delimiter', self.buf, pos)
+
+        self.pos = end
+        return r
+
+    def _step(self, r: List[Tuple[int, Any]]):
+        state = self.state
+
+        if state == 'open':
+            if self.depth < len(self.path):
+                if self._char() != '{':
+                    self._error('not_dict')
+                self.state = 'key'
+            else:
+                if self._char() != '[':
+                    self._error('not_list')
+                self.state = 'item'
+            self.pos += 1
+        elif state == 'key':
+            c = self._char()
+
+            if c == '}':
+                self._error('key_missing')
+            elif c == ',':
+                self.pos += 1
+                self._char()
+
+            key = self._value()
+
+            if not isinstance(key, str) or self._char() != ':':
+                raise json.JSONDecodeError('Expecting property name', self.buf, self.pos)
+
+            self.pos += 1
+
+            if key == self.path[self.depth]:
+                self.depth += 1
+                self.state = 'open'
+            else:
+                # siblings of the array are decoded in one go, so they are expected to be small
+                self._char()
+                self._value()
+        elif state == 'item':
+            if self._char() == ']':
+                self.pos += 1
+                self.state = 'done'
+            else:
+                r.append((self.idx, self._value()))
+                self.state = 'next'
+        elif state == 'next':
+            c = self._char()
+
+            if c == ']':
+                self.state = 'done'
+            elif c == ',':
+                self.idx += 1
+                self.state = 'item'
+            else:
+                raise json.JSONDecodeError('Expecting \',\' delimiter', self.buf, self.pos)
+
+            self.pos += 1
+
+
+def item_mapper(mapper: Mapper) -> Mapper:
+    """the items of a `List[T]` are decoded by the mapper of `T`"""
+    if isinstance(mapper, JsonAnyListMapper):
+        return mapper.dependencies['value']
+    return mapper
+
+
+def _decoded(mapper: Mapper, parser: JsonArrayParser, items: List[Tuple[int, Any]]) -> Iterator[Any]:
+    for i, x in items:
+        try:
+            yield mapper.serialize(x)
+        except SerializationError as e:
+            e.prepend_path(*parser.path, i)
+            raise
+
+
+def decode_items(mapper: Mapper, fp: BinaryIO, path: Sequence[str] = (), chunk_size: int = CHUNK_SIZE) -> \
+        Iterator[Any]:
+    """
+    yield the items of a JSON array read from `fp` one at a time, decoded by `mapper` (either the `json_from`
+    mapper of `List[T]` or of `T`); only a single chunk and the items it completed are held in memory at a time
+    """
+    mapper = item_mapper(mapper)
+    parser = JsonArrayParser(path)
+
+    while not parser.done:
+        chunk = fp.read(chunk_size)
+        yield from _decoded(mapper, parser, parser.feed(chunk, final=not chunk))
+
+
+async def decode_items_async(mapper: Mapper, reader: Any, path: Sequence[str] = (), chunk_size: int = CHUNK_SIZE) -> \
+        AsyncIterator[Any]:
+    """same as `decode_items`, but reads from any object with a coroutine `read(n)`, e.g. `asyncio.StreamReader`"""
+    mapper = item_mapper(mapper)
+    parser = JsonArrayParser(path)
+
+    while not parser.done:
+        chunk = await reader.read(chunk_size)
+
+        for x in _decoded(mapper, parser, parser.feed(chunk, final=not chunk)):
+            yield x
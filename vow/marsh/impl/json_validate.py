@@ -0,0 +1,95 @@
+from typing import Any, Callable, Dict, Type
+
+from vow.marsh.base import Mapper
+from vow.marsh.error import SerializationError
+from vow.marsh.impl.any import FieldValue
+from vow.marsh.impl.any_from import AnyFromStructMapper
+from vow.marsh.impl.json import JsonAnyListMapper, JsonAnyDictMapper
+from vow.marsh.impl.json_from import JsonFromDateTimeMapper
+from vow.marsh.impl.json_numpy import JsonAnyArrayMapper
+
+
+class ValidateStructMapper(AnyFromStructMapper):
+    """checks every field of a `json_from` struct, but returns the raw value instead of building `cls`"""
+    __slots__ = ()
+
+    def serialize(self, obj: Any) -> Any:
+        for path, name, v in self.fields:
+            try:
+                item = v.serialize(obj)
+            except SerializationError as e:
+                e.prepend_path(*path)
+                raise
+
+            if name is None and not isinstance(item, FieldValue):
+                raise SerializationError(val=item, path=[path[0]], reason='unsupported_field_defn', origin=self)
+        return obj
+
+    serialize_many = Mapper.serialize_many
+
+
+class ValidateListMapper(JsonAnyListMapper):
+    __slots__ = ()
+
+    def serialize(self, obj: Any) -> Any:
+        value = self.dependencies['value']
+
+        for i, x in enumerate(obj):
+            try:
+                value.serialize(x)
+            except SerializationError as e:
+                e.prepend_path(i)
+                raise
+        return obj
+
+    serialize_many = Mapper.serialize_many
+
+
+class ValidateDictMapper(JsonAnyDictMapper):
+    __slots__ = ()
+
+    def serialize(self, obj: Any) -> Any:
+        key = self.dependencies['key']
+        value = self.dependencies['value']
+
+        for k, v in obj.items():
+            try:
+                key.serialize(k)
+            except SerializationError as e:
+                e.prepend_path('$key')
+                raise
+
+            try:
+                value.serialize(v)
+            except SerializationError as e:
+                e.prepend_path('$value')
+                raise
+        return obj
+
+
+class ValidateDateTimeMapper(JsonFromDateTimeMapper):
+    """parsing is the check, the parsed value is dropped"""
+    __slots__ = ()
+
+    def serialize(self, obj: Any) -> Any:
+        super().serialize(obj)
+        return obj
+
+    serialize_many = Mapper.serialize_many
+
+
+# mapper class -> the validating mapper that replaces it
+VALIDATORS: Dict[Type[Mapper], Callable[[Mapper], Mapper]] = {
+    AnyFromStructMapper: lambda x: ValidateStructMapper(x.cls, x.dependencies),
+    JsonAnyListMapper: lambda x: ValidateListMapper(x.dependencies),
+    JsonAnyArrayMapper: lambda x: ValidateListMapper(x.dependencies),
+    JsonAnyDictMapper: lambda x: ValidateDictMapper(x.dependencies),
+    JsonFromDateTimeMapper: lambda x: ValidateDateTimeMapper(x.format, x.cache, x.dependencies),
+}
+
+
+def validator(mapper: Mapper) -> Mapper:
+    """the validating version of a `json_from` mapper, mappers that build nothing worth skipping are kept"""
+    fn = VALIDATORS.get(mapper.__class__)
+
+    return mapper if fn is None else fn(mapper)
@@ -0,0 +1,215 @@
+"""
+unions of dataclasses, told apart by a tag: `Union[A, B]` resolves to `Tagged((A, B))`, which writes JSON as the
+fields of the member along with `"type": "A"`. The name of the tag field and the tags are configurable, as is
+writing the member under a field of its own next to the tag instead:
+
+    shape: Union[Circle, Square]
+    event: Event = field(metadata={FIELD_OVERRIDE: Tagged((Login, Logout), tag='kind', tags=('in', 'out'))})
+
+the binary encoding is the index of the member among the members sorted by their tags, followed by the member; it
+does not depend on the order of `types`, which `typing` does not keep for equal unions, but adding a member or
+changing a tag changes it.
+Encoding dispatches on `type(obj)` and decoding on the tag, each through a single dict built on first use.
+"""
+from typing import Any, Dict, List, Optional, Tuple, Type, Callable
+
+from dataclasses import dataclass
+
+from vow.marsh.base import Mapper, Fac, FieldsFac, Fields
+from vow.marsh.error import SerializationError
+from vow.marsh.impl.binary_from import BinaryReaderMapper, BinaryFromVarInt, reader
+from vow.marsh.impl.binary_into import BinaryIntoVarInt
+
+
+@dataclass(frozen=True)
+class Tagged:
+    """a union of the dataclasses `types`, for `Walker.resolve`"""
+    types: Tuple[Any, ...]
+    tag: str = 'type'
+    # the tag of each of `types`, the names of the classes if not given
+    tags: Optional[Tuple[Any, ...]] = None
+    # the field the member is written into, or `None` for the fields of the member itself
+    content: Optional[str] = None
+
+
+class UnionMapper(Mapper):
+    __slots__ = 'types', 'tags', 'tag', 'content', 'by_type', 'by_tag'
+
+    def __init__(self, types: Tuple[Type, ...], tags: Tuple[Any, ...], tag: str, content: Optional[str],
+                 dependencies: Fields):
+        self.types = types
+        self.tags = tags
+        self.tag = tag
+        self.content = content
+        # built on first use, the dependencies are only linked once every mapper of the graph exists
+        self.by_type: Optional[Dict[Type, Tuple[Any, Mapper]]] = None
+        self.by_tag: Optional[Dict[Any, Mapper]] = None
+        super().__init__(dependencies)
+
+    def link(self):
+        members = [self.dependencies[str(i)] for i in range(len(self.types))]
+
+        self.by_type = {x: (y, z) for x, y, z in zip(self.types, self.tags, members)}
+        self.by_tag = dict(zip(self.tags, members))
+
+    def order(self) -> List[int]:
+        """the indices of `types` sorted by their tags"""
+        return sorted(range(len(self.types)), key=lambda i: repr(self.tags[i]))
+
+    def member(self, obj: Any) -> Tuple[Any, Mapper]:
+        """the tag and the mapper of `obj`"""
+        if self.by_type is None:
+            self.link()
+
+        try:
+            return self.by_type[obj.__class__]
+        except KeyError:
+            pass
+
+        # subclasses of the members are found once, and then dispatched on as well
+        for x in self.types:
+            if isinstance(obj, x):
+                r = self.by_type[obj.__class__] = self.by_type[x]
+                return r
+
+        raise SerializationError(val=obj, reason='union_unknown', origin=self)
+
+
+class AnyIntoUnionMapper(UnionMapper):
+    __slots__ = ()
+
+    def serialize(self, obj: Any) -> Any:
+        try:
+            tag, mapper = self.by_type[obj.__class__]
+        except (KeyError, TypeError):
+            tag, mapper = self.member(obj)
+
+        content = self.content
+
+        if content is None:
+            r = mapper.serialize(obj)
+            r[self.tag] = tag
+            return r
+
+        try:
+            return {self.tag: tag, content: mapper.serialize(obj)}
+        except SerializationError as e:
+            e.prepend_path(content)
+            raise
+
+
+class AnyFromUnionMapper(UnionMapper):
+    __slots__ = ()
+
+    def serialize(self, obj: Any) -> Any:
+        if self.by_tag is None:
+            self.link()
+
+        try:
+            tag = obj[self.tag]
+        except (KeyError, TypeError, IndexError):
+            raise SerializationError(val=obj, path=[self.tag], reason='union_no_tag', origin=self)
+
+        try:
+            mapper = self.by_tag[tag]
+        except (KeyError, TypeError):
+            raise SerializationError(val=tag, path=[self.tag], reason='union_unknown', origin=self)
+
+        content = self.content
+
+        if content is None:
+            return mapper.serialize(obj)
+
+        try:
+            return mapper.serialize(obj[content])
+        except KeyError:
+            raise SerializationError(val=obj, path=[content], reason='union_no_content', origin=self)
+        except SerializationError as e:
+            e.prepend_path(content)
+            raise
+
+
+class BinaryIntoUnionMapper(UnionMapper):
+    __slots__ = ()
+
+    def link(self):
+        # the tags are the encoded positions of the members in `order`
+        index = self.dependencies['index']
+
+        self.by_type = {
+            self.types[i]: (index.serialize(j), self.dependencies[str(i)]) for j, i in enumerate(self.order())
+        }
+
+    def serialize(self, obj: Any) -> bytes:
+        try:
+            prefix, mapper = self.by_type[obj.__class__]
+        except (KeyError, TypeError):
+            prefix, mapper = self.member(obj)
+
+        return prefix + mapper.serialize(obj)
+
+
+class BinaryFromUnionMapper(UnionMapper, BinaryReaderMapper):
+    __slots__ = 'readers',
+
+    def __init__(self, types: Tuple[Type, ...], tags: Tuple[Any, ...], tag: str, content: Optional[str],
+                 dependencies: Fields):
+        self.readers: Optional[List[Callable[[memoryview, int], Tuple[Any, int]]]] = None
+        super().__init__(types, tags, tag, content, dependencies)
+
+    def link(self):
+        self.readers = [reader(self.dependencies[str(i)]) for i in self.order()]
+
+    def read(self, buf: memoryview, pos: int) -> Tuple[Any, int]:
+        if self.readers is None:
+            self.link()
+
+        try:
+            index, pos = self.dependencies['index'].read(buf, pos)
+        except SerializationError as e:
+            e.prepend_path('$index')
+            raise
+
+        try:
+            read = self.readers[index]
+        except IndexError:
+            raise SerializationError(val=index, path=['$index'], reason='union_unknown', origin=self)
+
+        return read(buf, pos)
+
+
+@dataclass
+class AnyIntoUnion(Fac):
+    __mapper_cls__ = AnyIntoUnionMapper
+    __mapper_args__ = 'types', 'tags', 'tag', 'content'
+
+    types: Tuple[Type, ...]
+    members: List[Fac]
+    tags: Tuple[Any, ...]
+    tag: str = 'type'
+    content: Optional[str] = None
+
+    def dependencies(self) -> FieldsFac:
+        return {str(i): x for i, x in enumerate(self.members)}
+
+
+class AnyFromUnion(AnyIntoUnion):
+    __mapper_cls__ = AnyFromUnionMapper
+
+
+class BinaryIntoUnion(AnyIntoUnion):
+    __mapper_cls__ = BinaryIntoUnionMapper
+
+    def dependencies(self) -> FieldsFac:
+        r = super().dependencies()
+        r['index'] = BinaryIntoVarInt()
+        return r
+
+
+class BinaryFromUnion(AnyIntoUnion):
+    __mapper_cls__ = BinaryFromUnionMapper
+
+    def dependencies(self) -> FieldsFac:
+        r = super().dependencies()
+        r['index'] = BinaryFromVarInt()
+        return r
@@ -0,0 +1,224 @@
+"""
+dataclass instances that are reachable more than once from the serialized object are written once, every other
+occurrence is a back-reference to it; cycles are back-references to an instance that is still being written.
+
+- `json_into` adds `$id` to the first occurrence once a back-reference `{"$ref": <id>}` to it is written
+- `bin_into` prefixes every struct with a varint, `0` is an inline struct and `n` the `n`-th one written before it
+
+decoding restores the sharing. An instance that is referred to before its fields are decoded is allocated without
+calling `__init__`, which is only called once its fields are known. Lists, dicts and dataclasses marked `fixed` are
+copied as they are, see `vow.marsh.impl.binary_fixed`.
+"""
+from collections import OrderedDict
+from contextvars import ContextVar
+from typing import Any, Dict, Optional, Tuple, Type
+
+from vow.marsh.base import Mapper, ONE_BY_ONE
+from vow.marsh.error import SerializationError
+from vow.marsh.impl.any_from import AnyFromStructMapper
+from vow.marsh.impl.any_into import AnyIntoStructMapper
+from vow.marsh.impl.binary_from import BinaryFromStructMapper, BinaryFromVarIntMapper
+from vow.marsh.impl.binary_into import BinaryIntoStructMapper, BinaryIntoVarIntMapper
+
+ID = '$id'
+REF = '$ref'
+
+VARINT_INTO = BinaryIntoVarIntMapper({})
+VARINT_FROM = BinaryFromVarIntMapper({})
+INLINE = b'\x00'
+
+
+class Pending:
+    """an instance whose fields are still being decoded, it is only allocated once it is referred to"""
+    __slots__ = 'cls', 'obj'
+
+    def __init__(self, cls: Type):
+        self.cls = cls
+        self.obj = None
+
+
+class Memo:
+    """the instances seen by a single call of a `MemoMapper`"""
+    __slots__ = 'seen', 'objs', 'size'
+
+    def __init__(self):
+        # id of an encoded instance -> the instance, and its encoded value or index
+        self.seen: Dict[int, Tuple[Any, Any]] = {}
+        # id or index -> decoded instance or `Pending`
+        self.objs: Dict[Any, Any] = {}
+        self.size = 0
+
+    def pending(self, key: Any, cls: Type) -> Pending:
+        r = self.objs[key] = Pending(cls)
+        return r
+
+    def done(self, key: Any, pending: Pending, fields: Dict[str, Any]) -> Any:
+        r = pending.obj
+
+        if r is None:
+            r = pending.cls(**fields)
+        else:
+            r.__init__(**fields)
+
+        self.objs[key] = r
+
+        return r
+
+    def get(self, key: Any, origin: Mapper) -> Any:
+        try:
+            r = self.objs[key]
+        except (KeyError, TypeError):
+            raise SerializationError(val=key, path=[REF], reason='ref_invalid', origin=origin)
+
+        if r.__class__ is Pending:
+            if r.obj is None:
+                r.obj = r.cls.__new__(r.cls)
+            r = r.obj
+
+        return r
+
+
+MEMO: ContextVar[Optional[Memo]] = ContextVar('MEMO', default=None)
+
+
+class MemoMapper(Mapper):
+    """
+    every call of the `child` starts with an empty `Memo`; the batch implementations are skipped, as a failed batch
+    that is run again would find its own instances in the `Memo`
+    """
+    __slots__ = ()
+
+    def serialize(self, obj: Any) -> Any:
+        token = MEMO.set(Memo())
+        single = ONE_BY_ONE.set(True)
+
+        try:
+            return self.dependencies['child'].serialize(obj)
+        finally:
+            ONE_BY_ONE.reset(single)
+            MEMO.reset(token)
+
+
+class MemoIntoStructMapper(AnyIntoStructMapper):
+    __slots__ = ()
+
+    def serialize(self, obj: Any) -> Any:
+        memo = MEMO.get()
+
+        if memo is None or not self.cls:
+            return super().serialize(obj)
+
+        if not isinstance(obj, self.cls):
+            raise SerializationError(val=obj, reason='not_instance', origin=self)
+
+        seen = memo.seen.get(id(obj))
+
+        if seen is not None:
+            _, r = seen
+
+            if ID not in r:
+                r[ID] = memo.size
+                memo.size += 1
+
+            return {REF: r[ID]}
+
+        r = OrderedDict()
+        # the instance is kept alive, so that its id is not reused by another one
+        memo.seen[id(obj)] = obj, r
+
+        return self.serialize_fields(obj, r)
+
+    serialize_many = Mapper.serialize_many
+
+
+class MemoFromStructMapper(AnyFromStructMapper):
+    __slots__ = ()
+
+    def serialize(self, obj: Any) -> Any:
+        memo = MEMO.get()
+
+        if memo is None or not self.cls or not isinstance(obj, dict):
+            return super().serialize(obj)
+
+        if REF in obj:
+            return memo.get(obj[REF], self)
+
+        key = obj.get(ID)
+
+        if key is None:
+            return super().serialize(obj)
+
+        pending = memo.pending(key, self.cls)
+
+        return memo.done(key, pending, self.serialize_fields(obj, {}))
+
+    serialize_many = Mapper.serialize_many
+
+
+class MemoBinaryIntoStructMapper(BinaryIntoStructMapper):
+    __slots__ = ()
+
+    def serialize(self, obj: Any) -> bytes:
+        memo = MEMO.get()
+
+        if memo is None or not self.cls:
+            return super().serialize(obj)
+
+        seen = memo.seen.get(id(obj))
+
+        if seen is not None:
+            return VARINT_INTO.serialize(seen[1] + 1)
+
+        if not isinstance(obj, self.cls):
+            raise SerializationError(val=obj, reason='not_instance', origin=self)
+
+        memo.seen[id(obj)] = obj, memo.size
+        memo.size += 1
+
+        return INLINE + super().serialize(obj)
+
+
+class MemoBinaryFromStructMapper(BinaryFromStructMapper):
+    __slots__ = ()
+
+    def read(self, buf: memoryview, pos: int) -> Tuple[Any, int]:
+        memo = MEMO.get()
+
+        if memo is None or not self.cls:
+            return super().read(buf, pos)
+
+        try:
+            tag, pos = VARINT_FROM.read(buf, pos)
+        except SerializationError as e:
+            e.prepend_path(REF)
+            raise
+
+        if tag:
+            return memo.get(tag - 1, self), pos
+
+        key = memo.size
+        memo.size += 1
+
+        pending = memo.pending(key, self.cls)
+        r, pos = self.read_fields(buf, pos)
+
+        return memo.done(key, pending, r), pos
+
+
+MEMO_MAPPERS: Dict[Type[Mapper], Type[Mapper]] = {
+    AnyIntoStructMapper: MemoIntoStructMapper,
+    AnyFromStructMapper: MemoFromStructMapper,
+    BinaryIntoStructMapper: MemoBinaryIntoStructMapper,
+    BinaryFromStructMapper: MemoBinaryFromStructMapper,
+}
+
+
+def memoized(mapper: Mapper) -> Mapper:
+    """the memoizing counterpart of `mapper`, sharing its dependencies"""
+    cls = MEMO_MAPPERS.get(type(mapper))
+
+    if cls is None:
+        return mapper
+
+    return cls(mapper.cls, mapper.dependencies)
+
@@ -0,0 +1,143 @@
+"""
+rewrites of the node graph `Walker._visit_objs` builds, applied before any mapper is created:
+
+- `AnyAnySelfMapper` hops are replaced by the node they forward to
+- `AnyAnyWith` with an identity `This()` on either side is replaced by the other side
+- the `This()` type of `AnyAnyAttr` is dropped
+- `AnyAnyWith` nested into each other becomes a single `AnyAnyChain`
+- `AnyAnyDiscriminant` whose discriminant starts with the same mapper as its value takes the discriminant of the value
+
+`AnyAnyField(AnyAnyAttr(...))` pairs are left as they are, struct mappers already call the attribute directly, see
+`AnyIntoStructMapper.fields`. Errors raised by an optimized graph do not mention the hops that were removed.
+"""
+from itertools import count
+from typing import Dict, List, Tuple, Optional
+
+from vow.marsh.base import Fac
+from vow.marsh.impl.any import This, AnyAnySelfMapper, AnyAnyWithMapper, AnyAnyAttr, AnyAnyChain, \
+    AnyAnyChainMapper, AnyAnyDiscriminant
+
+NodeId = int
+DepId = str
+
+Nodes = Dict[NodeId, Tuple[List[DepId], Fac, Dict[DepId, NodeId]]]
+
+
+class _Graph:
+    def __init__(self, nodes: Nodes):
+        self.nodes = dict(nodes)
+        self.ctr = count(max(nodes, default=-1) + 1)
+
+    def fac(self, node: NodeId) -> Fac:
+        return self.nodes[node][1]
+
+    def deps(self, node: NodeId) -> Dict[DepId, NodeId]:
+        return self.nodes[node][2]
+
+    def add(self, path: List[DepId], fac: Fac, deps: Dict[DepId, NodeId]) -> NodeId:
+        r = next(self.ctr)
+        self.nodes[r] = path, fac, deps
+        return r
+
+    def is_identity(self, node: NodeId) -> bool:
+        fac = self.fac(node)
+        return type(fac) is This and fac.type is None
+
+    def forward(self, node: NodeId) -> Optional[NodeId]:
+        """the node that does exactly what `node` does, if `node` only passes its input along"""
+        fac = self.fac(node)
+        deps = self.deps(node)
+
+        if fac.__mapper_cls__ is AnyAnySelfMapper:
+            return deps['self']
+        elif fac.__mapper_cls__ is AnyAnyWithMapper:
+            if self.is_identity(deps['value']):
+                return deps['child']
+            elif self.is_identity(deps['child']):
+                return deps['value']
+
+        return None
+
+    def resolve(self, node: NodeId) -> NodeId:
+        seen = {node}
+
+        while True:
+            x = self.forward(node)
+
+            if x is None or x in seen:
+                return node
+
+            seen.add(x)
+            node = x
+
+    def chain(self, node: NodeId, seen=frozenset()) -> List[NodeId]:
+        """the nodes `node` feeds its input through, one after another"""
+        fac = self.fac(node)
+
+        if node in seen:
+            return [node]
+        elif fac.__mapper_cls__ is AnyAnyWithMapper:
+            deps = self.deps(node)
+            return self.chain(deps['value'], seen | {node}) + self.chain(deps['child'], seen | {node})
+        elif fac.__mapper_cls__ is AnyAnyChainMapper:
+            return [y for x in self.deps(node).values() for y in self.chain(x, seen | {node})]
+        else:
+            return [node]
+
+    def chained(self, path: List[DepId], nodes: List[NodeId]) -> NodeId:
+        if len(nodes) == 1:
+            return nodes[0]
+        elif not nodes:
+            return self.add(path, This(), {})
+
+        return self.add(path, AnyAnyChain([self.fac(x) for x in nodes]), {str(i): x for i, x in enumerate(nodes)})
+
+    def same(self, a: NodeId, b: NodeId) -> bool:
+        # factories are compared as whole trees, so that equal subtrees visited twice are found as well
+        return a == b or self.fac(a) == self.fac(b)
+
+
+def optimize(nodes: Nodes, roots: List[NodeId]) -> Tuple[Nodes, List[NodeId]]:
+    """the optimized copy of `nodes`, and the nodes `roots` map to in it"""
+    g = _Graph(nodes)
+
+    for k, (path, fac, deps) in nodes.items():
+        g.nodes[k] = path, fac, {dk: g.resolve(dv) for dk, dv in deps.items()}
+
+    roots = [g.resolve(x) for x in roots]
+
+    for k, (path, fac, deps) in list(g.nodes.items()):
+        if type(fac) is AnyAnyAttr and 'type' in deps and g.is_identity(deps['type']):
+            g.nodes[k] = path, AnyAnyAttr(fac.name), {}
+
+    for k, (path, fac, deps) in list(g.nodes.items()):
+        cls = fac.__mapper_cls__
+
+        if cls is AnyAnyWithMapper:
+            items = g.chain(k)
+
+            if len(items) > 2:
+                g.nodes[k] = path, AnyAnyChain([g.fac(x) for x in items]), {str(i): x for i, x in enumerate(items)}
+        elif type(fac) is AnyAnyDiscriminant and not fac.of_value:
+            items = g.chain(deps['discriminant'])
+
+            if g.same(items[0], deps['value']):
+                deps = dict(deps)
+                deps['discriminant'] = g.chained(path + ['discriminant'], items[1:])
+
+                fac = AnyAnyDiscriminant(g.fac(deps['discriminant']), fac.value, fac.mappers, of_value=True)
+
+                g.nodes[k] = path, fac, deps
+
+    # nodes that were forwarded past, or merged into a chain, are no longer reachable
+    r = {}
+    to_visit = list(roots)
+
+    while to_visit:
+        x = to_visit.pop()
+
+        if x not in r:
+            r[x] = g.nodes[x]
+            to_visit.extend(g.deps(x).values())
+
+    return r, roots
@@ -0,0 +1,113 @@
+"""
+maps a large iterable on a pool of processes, a chunk at a time through `Mapper.serialize_many`:
+
+    with ParallelMapper(JSON_INTO, Shape, processes=8) as pool:
+        rows = pool.serialize_many(shapes)
+
+mapper graphs are not sent to the workers, every worker builds its own once through `get_serializers`; the types are
+sent the way `pickle` sends them, by their dotted name, so they have to be importable from the workers, as do the
+values that are mapped and returned
+"""
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, Future
+from itertools import islice
+from typing import Any, Iterable, Iterator, List, Optional, Deque, Dict
+
+from dataclasses import replace
+
+from vow.marsh.base import Mapper
+from vow.marsh.decl import get_serializers
+from vow.marsh.error import SerializationError
+from vow.marsh.impl.binary import BinaryNext
+
+_MAPPER: Optional[Mapper] = None
+
+
+def _init(name: str, cls: Any, options: Dict[str, Any]):
+    global _MAPPER
+
+    _MAPPER, = get_serializers(name, cls, **options)
+
+
+def _chunk(start: int, objs: List[Any]) -> List[Any]:
+    try:
+        r = _MAPPER.serialize_many(objs)
+    except SerializationError as e:
+        # the mapper can not be sent back, and the index is that of the item in the whole iterable
+        path = list(e.path)
+
+        if path and isinstance(path[0], int):
+            path[0] += start
+
+        raise replace(e, path=path, origin=None) from None
+
+    if r and r[0].__class__ is BinaryNext:
+        # the rest of the buffer is a `memoryview`, which can not be sent back
+        r = [BinaryNext(x.val, bytes(x.next)) for x in r]
+
+    return r
+
+
+class ParallelMapper:
+    """
+    the mapper of `cls` built with `get_serializers(name, cls, **options)`, run on a process pool; results keep the
+    order of the input. At most `ahead` chunks per process are in flight at any time
+    """
+
+    def __init__(self, name: str, cls: Any, processes: Optional[int] = None, chunksize: int = 1024, ahead: int = 2,
+                 mp_context=None, **options):
+        self.name = name
+        self.cls = cls
+        self.processes = processes
+        self.chunksize = chunksize
+        self.ahead = ahead
+        self.options = options
+
+        self.executor = ProcessPoolExecutor(
+            max_workers=processes,
+            mp_context=mp_context,
+            initializer=_init,
+            initargs=(name, cls, options),
+        )
+
+    def map(self, objs: Iterable[Any]) -> Iterator[Any]:
+        """lazily maps `objs`, the input is only consumed as far as the chunks in flight"""
+        it = iter(objs)
+        limit = self.ahead * (self.processes or os.cpu_count() or 1)
+        pending: Deque[Future] = deque()
+        start = 0
+
+        while True:
+            while len(pending) < limit:
+                chunk = list(islice(it, self.chunksize))
+
+                if not chunk:
+                    break
+
+                pending.append(self.executor.submit(_chunk, start, chunk))
+                start += len(chunk)
+
+            if not pending:
+                return
+
+            yield from pending.popleft().result()
+
+    def serialize_many(self, objs: Iterable[Any]) -> List[Any]:
+        return list(self.map(objs))
+
+    def close(self):
+        self.executor.shutdown()
+
+    def __enter__(self) -> 'ParallelMapper':
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+
+def serialize_parallel(name: str, cls: Any, objs: Iterable[Any], processes: Optional[int] = None,
+                       chunksize: int = 1024, **options) -> List[Any]:
+    """maps `objs` with a `ParallelMapper` that is shut down afterwards"""
+    with ParallelMapper(name, cls, processes=processes, chunksize=chunksize, **options) as pool:
+        return pool.serialize_many(objs)
@@ -0,0 +1,174 @@
+"""
+every node of a graph built with `Walker.mappers(profile=...)` is wrapped into a `ProfileMapper`, which counts the
+calls, errors and time spent in it into the `Profile`:
+
+    profile = Profile()
+    mapper, = get_serializers(JSON_INTO, Shape, profile=profile)
+    ...
+    print(profile.format(10))
+
+`total` is the time spent in the node and everything below it, `self` less what the profiled nodes below it took;
+the `total` of a recursive node counts the nested calls twice. `AnyAnyField` nodes are left as they are, so that the
+struct mappers still call the fields directly, the time of a field is that of its item. The wrappers add their own
+overhead, mostly to the `self` time of the nodes above them. Profiled graphs are not deduplicated, see
+`vow.marsh.dedup`, so that the fields of every dataclass are reported under their own paths. A `Profile` is not
+thread-safe.
+"""
+from time import perf_counter
+from typing import Any, Dict, List, Tuple, Iterable
+
+from vow.marsh.base import Mapper, Fac
+from vow.marsh.error import SerializationError
+from vow.marsh.impl.any import AnyAnyField, AnyAnyFieldMapper
+from vow.marsh.impl.binary_from import BinaryReaderMapper
+
+
+class NodeStats:
+    __slots__ = 'path', 'name', 'fac', 'calls', 'errors', 'total', 'self'
+
+    def __init__(self, path: Tuple[str, ...], name: str, fac: Fac):
+        # the dependency keys leading to the node, as visited by `Walker._visit_objs`
+        self.path = path
+        # the fields and dataclasses along `path`
+        self.name = name
+        self.fac = fac
+        self.calls = 0
+        self.errors = 0
+        self.total = 0.
+        self.self = 0.
+
+    def __repr__(self) -> str:
+        return f'{self.__class__.__name__}({self.name!r}, {_fac_name(self.fac)}, calls={self.calls}, ' \
+               f'errors={self.errors}, total={self.total:.6f}, self={self.self:.6f})'
+
+
+class Profile:
+    __slots__ = 'nodes', 'stack'
+
+    def __init__(self):
+        self.nodes: List[NodeStats] = []
+        # time spent in the profiled nodes below each of the running ones
+        self.stack: List[float] = [0.]
+
+    def node(self, path: Tuple[str, ...], name: str, fac: Fac) -> NodeStats:
+        r = NodeStats(path, name, fac)
+        self.nodes.append(r)
+        return r
+
+    def report(self, top: int = 20, key: str = 'self') -> List[NodeStats]:
+        """the `top` nodes that took the most `self` or `total` time, or had the most `calls` or `errors`"""
+        return sorted((x for x in self.nodes if x.calls), key=lambda x: getattr(x, key), reverse=True)[:top]
+
+    def format(self, top: int = 20, key: str = 'self') -> str:
+        lines = [f'{"self ms":>10}{"total ms":>10}{"calls":>10}{"errors":>8}  node']
+
+        for x in self.report(top, key):
+            lines.append(
+                f'{x.self * 1000:>10.2f}{x.total * 1000:>10.2f}{x.calls:>10}{x.errors:>8}  '
+                f'{x.name} {_fac_name(x.fac)}'
+            )
+
+        return '\n'.join(lines)
+
+    def reset(self):
+        for x in self.nodes:
+            x.calls = x.errors = 0
+            x.total = x.self = 0.
+
+
+def _fac_name(fac: Fac) -> str:
+    cls = getattr(fac, 'cls', None)
+    return f'{fac.__class__.__name__}({cls.__name__})' if isinstance(cls, type) else fac.__class__.__name__
+
+
+class ProfileMapper(Mapper):
+    __slots__ = 'profile', 'stats'
+
+    def __init__(self, profile: Profile, stats: NodeStats, dependencies: Dict[str, Mapper]):
+        self.profile = profile
+        self.stats = stats
+        super().__init__(dependencies)
+
+    def serialize(self, obj: Any) -> Any:
+        stack = self.profile.stack
+        stack.append(0.)
+        started = perf_counter()
+
+        try:
+            return self.dependencies['child'].serialize(obj)
+        except SerializationError:
+            self.stats.errors += 1
+            raise
+        finally:
+            self._done(stack, perf_counter() - started, 1)
+
+    def serialize_many(self, objs: Iterable[Any]) -> List[Any]:
+        if not isinstance(objs, list):
+            objs = list(objs)
+
+        stack = self.profile.stack
+        stack.append(0.)
+        started = perf_counter()
+
+        try:
+            return self.dependencies['child'].serialize_many(objs)
+        except SerializationError:
+            self.stats.errors += 1
+            raise
+        finally:
+            self._done(stack, perf_counter() - started, len(objs))
+
+    def _done(self, stack: List[float], took: float, calls: int):
+        inner = stack.pop()
+        stack[-1] += took
+
+        stats = self.stats
+        stats.calls += calls
+        stats.total += took
+        stats.self += took - inner
+
+
+class ProfileReaderMapper(ProfileMapper, BinaryReaderMapper):
+    """profiles `read` of a reader, which the readers above it call instead of `serialize`"""
+    __slots__ = ()
+
+    def read(self, buf: memoryview, pos: int) -> Tuple[Any, int]:
+        stack = self.profile.stack
+        stack.append(0.)
+        started = perf_counter()
+
+        try:
+            return self.dependencies['child'].read(buf, pos)
+        except SerializationError:
+            self.stats.errors += 1
+            raise
+        finally:
+            self._done(stack, perf_counter() - started, 1)
+
+    serialize = BinaryReaderMapper.serialize
+
+
+def describe(path: Tuple[str, ...], facs: Dict[Tuple[str, ...], Fac]) -> str:
+    """`Shape.points.x` for the fields and dataclasses along `path`, or the dependency keys where they are unknown"""
+    r = []
+
+    for i in range(len(path) + 1):
+        fac = facs.get(path[:i])
+
+        if fac is None:
+            if i:
+                r.append(path[i - 1])
+        elif isinstance(fac, AnyAnyField):
+            r.append(fac.name)
+        elif getattr(fac, 'cls', None) is not None and not r:
+            r.append(fac.cls.__name__)
+
+    return '.'.join(r) or '$'
+
+
+def profiled(profile: Profile, mapper: Mapper, path: List[str], name: str, fac: Fac) -> Mapper:
+    if type(mapper) is AnyAnyFieldMapper:
+        return mapper
+
+    cls = ProfileReaderMapper if isinstance(mapper, BinaryReaderMapper) else ProfileMapper
+    return cls(profile, profile.node(tuple(path), name, fac), {'child': mapper})
@@ -0,0 +1,131 @@
+import re
+from typing import Iterable, Optional, Dict, Any, Set
+
+from vow.marsh.base import Mapper
+from vow.marsh.impl.any import AnyAnyFieldMapper, AnyAnyAttrMapper, AnyAnyItemMapper, AnyAnySelfMapper
+from vow.marsh.impl.any_from import AnyFromStructMapper, PartialFromStructMapper
+from vow.marsh.impl.any_into import AnyIntoStructMapper
+from vow.marsh.impl.json import JsonAnyListMapper, JsonAnyDictMapper, JsonAnyOptionalMapper
+from vow.marsh.impl.union import AnyIntoUnionMapper, AnyFromUnionMapper
+
+ALL = '*'
+
+SEGMENT = re.compile(r'\[\*\]|[^.\[\]]+')
+
+# field name -> selection of that field, `None` selects the whole subtree
+Selection = Optional[Dict[str, Any]]
+
+
+def parse_select(paths: Iterable[str]) -> Selection:
+    """
+    `body.method` selects a field of a field, `items[*].id` a field of every item of a list or a dict,
+    a path that selects a field wholly wins over the paths that select parts of it
+    """
+    r = {}
+
+    for path in paths:
+        segments = [ALL if x == '[*]' else x for x in SEGMENT.findall(path)]
+
+        if not segments:
+            raise ValueError(f'Empty selection path `{path}`')
+
+        node = r
+
+        for x in segments[:-1]:
+            child = node.setdefault(x, {})
+
+            if child is None:
+                break
+
+            node = child
+        else:
+            node[segments[-1]] = None
+
+    return r
+
+
+def project(mapper: Mapper, select: Selection, path: str = '') -> Mapper:
+    """a copy of the graph below `mapper` that only maps the selected fields, subtrees selected wholly are shared"""
+    if select is None:
+        return mapper
+
+    cls = mapper.__class__
+
+    if isinstance(mapper, AnyIntoStructMapper):
+        deps = {}
+        known = set()
+
+        for k, v in mapper.dependencies.items():
+            if v.__class__ is not AnyAnyFieldMapper:
+                raise ValueError(f'Can not select fields of `{path}`, it does not use `AnyAnyField`')
+
+            known.add(v.name)
+
+            if v.name in select:
+                deps[k] = AnyAnyFieldMapper(v.name, {'item': _project_item(v.dependencies['item'], select[v.name],
+                                                                            _join(path, v.name))})
+
+        unknown = set(select) - known
+
+        if unknown:
+            raise ValueError(f'Unknown fields {sorted(unknown)} selected in `{path}`')
+
+        if cls is AnyFromStructMapper and mapper.cls:
+            cls = PartialFromStructMapper
+
+        return cls(mapper.cls, deps)
+    elif isinstance(mapper, JsonAnyOptionalMapper):
+        return cls({'value': project(mapper.dependencies['value'], select, path)})
+    elif cls is AnyAnySelfMapper:
+        return cls({'self': project(mapper.dependencies['self'], select, path)})
+    elif cls is AnyIntoUnionMapper or cls is AnyFromUnionMapper:
+        # every member maps the selected fields it has
+        deps = {}
+        known = set()
+
+        for k, v in mapper.dependencies.items():
+            names = _names(v)
+            known |= set(select) if names is None else names
+            deps[k] = project(v, select if names is None else {x: y for x, y in select.items() if x in names}, path)
+
+        unknown = set(select) - known
+
+        if unknown:
+            raise ValueError(f'Unknown fields {sorted(unknown)} selected in `{path}`')
+
+        return cls(mapper.types, mapper.tags, mapper.tag, mapper.content, deps)
+    elif cls is JsonAnyListMapper or cls is JsonAnyDictMapper:
+        if set(select) != {ALL}:
+            raise ValueError(f'Items of `{path}` must be selected with `[*]`')
+
+        deps = dict(mapper.dependencies)
+        deps['value'] = project(deps['value'], select[ALL], f'{path}[*]')
+        return cls(deps)
+    else:
+        raise ValueError(f'Can not select {sorted(select)} in `{path}`, it is mapped by {mapper}')
+
+
+def _project_item(mapper: Mapper, select: Selection, path: str) -> Mapper:
+    if select is None:
+        return mapper
+    elif mapper.__class__ is AnyAnyAttrMapper and len(mapper.dependencies):
+        return AnyAnyAttrMapper(mapper.name, {'type': project(mapper.dependencies['type'], select, path)})
+    elif mapper.__class__ is AnyAnyItemMapper:
+        return AnyAnyItemMapper(mapper.name, {'type': project(mapper.dependencies['type'], select, path)})
+    elif mapper.__class__ is AnyFromUnionMapper:
+        # reads the items of the tag and of the content itself
+        return project(mapper, select, path)
+    else:
+        raise ValueError(f'Can not select fields of `{path}`, it is mapped by {mapper}')
+
+
+def _names(mapper: Mapper) -> Optional[Set[str]]:
+    """the fields of a struct mapper, `None` for anything else"""
+    if not isinstance(mapper, AnyIntoStructMapper):
+        return None
+
+    return {v.name for v in mapper.dependencies.values() if v.__class__ is AnyAnyFieldMapper}
+
+
+def _join(path: str, name: str) -> str:
+    return f'{path}.{name}' if path else name
@@ -1,24 +1,46 @@
 import inspect
+import logging
 import sys
 import typing
 from collections import deque, OrderedDict
 from datetime import datetime, timedelta
 from enum import Enum
 from itertools import count
-from typing import Type, Any, List, Dict, Tuple, Union, Deque
+from typing import Type, Any, List, Dict, Tuple, Union, Deque, Optional, Iterable
 
-from dataclasses import is_dataclass, dataclass, fields, Field, field, MISSING
-from typing_inspect import is_optional_type, get_args, get_last_args
+from dataclasses import is_dataclass, dataclass, fields, Field, field, MISSING, replace
+from typing_inspect import is_optional_type, is_union_type, get_args, get_last_args
 
 from vow.marsh.helper import is_serializable, DECL_ATTR, FIELD_FACTORY, FIELD_OVERRIDE, DECL_CALLABLE_ATTR
 
-from vow.marsh.impl.any import This, Ref, AnyAnyAttr, AnyAnyItem, AnyAnyField
+from vow.marsh.impl.any import This, Ref, AnyAnyAttr, AnyAnyItem, AnyAnyField, AnyAnyWith
 from vow.marsh.impl.json_from import JsonFromDateTime, JsonFromTimeDelta
-from vow.marsh.impl.any_from import AnyFromStruct, AnyFromEnum
+from vow.marsh.impl.any_from import AnyFromStruct, AnyFromEnum, AnyFromStructMapper, LazyFromStructMapper
 from vow.marsh.impl.json_into import JsonIntoDateTime, JsonIntoTimeDelta
 from vow.marsh.impl.any_into import AnyIntoStruct, AnyIntoEnum
 from vow.marsh.impl.json import JsonAnyList, JsonAnyDict, JsonAnyOptional, JSON_INTO, JSON_FROM
+from vow.marsh.impl.json_bytes import JSON_BYTES, JsonBytes
+from vow.marsh.impl.binary import BINARY_INTO, BINARY_FROM
+from vow.marsh.impl.binary_into import BinaryIntoStruct, BinaryIntoList, BinaryIntoDict, BinaryIntoOptional, \
+    BinaryIntoEnum, BinaryIntoDateTime, BinaryIntoTimeDelta, BinaryIntoBool, BinaryIntoFloat, BinaryIntoZigZag, \
+    BinaryIntoStr, BinaryIntoBlob
+from vow.marsh.impl.binary_from import BinaryFromStruct, BinaryFromList, BinaryFromDict, BinaryFromOptional, \
+    BinaryFromEnum, BinaryFromDateTime, BinaryFromTimeDelta, BinaryFromBool, BinaryFromFloat, BinaryFromZigZag, \
+    BinaryFromStr, BinaryFromBlob
+from vow.marsh.impl.binary_fixed import fixed_layout, BinaryIntoFixed, BinaryFromFixed, BinaryIntoFixedArray, \
+    BinaryFromFixedArray
+from vow.marsh.impl.json_validate import validator
+from vow.marsh.impl.union import Tagged, AnyIntoUnion, AnyFromUnion, BinaryIntoUnion, BinaryFromUnion
+from vow.marsh.impl.json_numpy import numpy, JsonAnyArray, JsonIntoNdArray, JsonFromNdArray, is_ndarray, \
+    ndarray_dtype
 from vow.marsh.base import Fac, Mapper
+from vow.marsh.cache import RESOLVE_CACHE, is_stable, ordered
+from vow.marsh.compiler import compile_mappers
+from vow.marsh.dedup import dedup as dedup_nodes
+from vow.marsh.memo import memoized, MemoMapper
+from vow.marsh.optimizer import optimize as optimize_nodes
+from vow.marsh.profile import Profile, profiled, describe
+from vow.marsh.projection import parse_select, project
 from xrpc.trace import trc
 
 if sys.version_info >= (3, 7):
@@ -26,6 +48,9 @@ if sys.version_info >= (3, 7):
 else:
     from typing import _ForwardRef as ForwardRef
 
+# `trc()` inspects the stack on every call, which is too slow for building mappers
+logger = logging.getLogger(__name__)
+
 
 class Kind(Enum):
     Iterator = 1
@@ -34,10 +59,44 @@ class Kind(Enum):
 
 @dataclass
 class CallableSerializers:
-    kind: Kind
+    fun: Any
+    is_method: bool = False
+    # walker name -> walker, turned into `parameters` and `return_` on the first lookup of either
+    deferred: Dict[str, 'Walker'] = field(default_factory=dict)
     parameters: Dict[str, Fac] = field(default_factory=dict)
     return_: Dict[str, Fac] = field(default_factory=dict)
 
+    @property
+    def kind(self) -> Kind:
+        return auto_callable_kind_reply(self.fun, is_method=self.is_method)[0]
+
+    def add(self, ctx: 'Walker'):
+        # the last decorator wins
+        self.parameters.pop(ctx.name, None)
+        self.return_.pop(ctx.name, None)
+        self.deferred[ctx.name] = ctx
+
+    def _execute(self, name: str):
+        ctx = self.deferred.pop(name, None)
+
+        if ctx is not None:
+            self.parameters[name], self.return_[name] = auto_callable_fac(ctx, ctx, self.fun, is_method=self.is_method)
+
+    def args(self, name: str) -> Fac:
+        self._execute(name)
+        return self.parameters[name]
+
+    def reply(self, name: str) -> Fac:
+        self._execute(name)
+        return self.return_[name]
+
+    @classmethod
+    def assign(cls, fun, is_method=False) -> 'CallableSerializers':
+        if not hasattr(fun, DECL_CALLABLE_ATTR):
+            setattr(fun, DECL_CALLABLE_ATTR, CallableSerializers(fun, is_method))
+
+        return getattr(fun, DECL_CALLABLE_ATTR)
+
 
 @dataclass
 class DeferredWrapper:
@@ -77,16 +136,25 @@ class Serializers:
         return getattr(obj, DECL_ATTR)
 
 
-@dataclass
+@dataclass(frozen=True)
 class Return:
     type: Type
 
 
-@dataclass
+@dataclass(frozen=True)
 class Args:
     type: Any
 
 
+# (into, from) factories of the scalars of the binary encoding, the first matching base class wins
+BINARY_SCALARS = {
+    bool: (BinaryIntoBool, BinaryFromBool),
+    float: (BinaryIntoFloat, BinaryFromFloat),
+    int: (BinaryIntoZigZag, BinaryFromZigZag),
+    str: (BinaryIntoStr, BinaryFromStr),
+    bytes: (BinaryIntoBlob, BinaryFromBlob),
+}
+
 VisitId = int
 NodeId = int
 DepId = str
@@ -117,6 +185,22 @@ class Walker:
     def resolve(self, cls: Type) -> Fac:
         """get a factory given an object cls"""
 
+        if isinstance(cls, Tagged) and not all(isinstance(x, type) for x in cls.types):
+            # forward references are evaluated in the frame of the walker before the union is cached
+            cls = replace(cls, types=tuple(self.evaluate(x) for x in cls.types))
+
+        if is_stable(cls) and not isinstance(cls, (DeferredWrapper, Args, Return)):
+            key = self.name, ordered(cls)
+        else:
+            key = None
+
+        return RESOLVE_CACHE.get(key, lambda: self._resolve(cls))
+
+    def _resolve(self, cls: Type) -> Fac:
+        if self.name == JSON_BYTES:
+            # the bytes writer walks the `json_into` graph of `cls`
+            return JsonBytes(Walker(JSON_INTO, self.frame).resolve(cls))
+
         # todo this needs to go, and we need to have proper instances of each separate `cls` mapper
         #
 
@@ -125,8 +209,16 @@ class Walker:
 
             value = self.resolve(vt)
 
-            if self.name.startswith('json'):
+            if self.is_fixed(vt):
+                return BinaryIntoFixedArray(vt) if self.name == BINARY_INTO else BinaryFromFixedArray(vt)
+            elif self.name.startswith('json') and numpy is not None and vt in (bool, int, float):
+                return JsonAnyArray(vt)
+            elif self.name.startswith('json'):
                 return JsonAnyList(value)
+            elif self.name == BINARY_INTO:
+                return BinaryIntoList(value)
+            elif self.name == BINARY_FROM:
+                return BinaryFromList(value)
             else:
                 raise NotImplementedError(f'{self.name}')
 
@@ -141,12 +233,78 @@ class Walker:
 
             if self.name.startswith('json'):
                 return JsonAnyDict(key, value)
+            elif self.name == BINARY_INTO:
+                return BinaryIntoDict(key, value)
+            elif self.name == BINARY_FROM:
+                return BinaryFromDict(key, value)
+            else:
+                raise NotImplementedError(f'{self.name}')
+
+        def resolve_enum(cls):
+            clss = set(item.value.__class__ for item in cls)
+
+            assert len(clss) == 1, clss
+
+            t = clss.pop()
+
+            fac = self.resolve(t)
+
+            if self.name == 'json_from':
+                return AnyFromEnum(cls, fac)
+            elif self.name == 'json_into':
+                # the `value` of `AnyIntoEnum` finds the member, `fac` maps the value of the member
+                return AnyAnyWith(AnyIntoEnum(cls, This()), fac)
+            elif self.name == BINARY_INTO:
+                return BinaryIntoEnum(cls, fac)
+            elif self.name == BINARY_FROM:
+                return BinaryFromEnum(cls, fac)
+            else:
+                raise NotImplementedError(('class4', cls))
+
+        def resolve_optional(value):
+            if self.name.startswith('json'):
+                return JsonAnyOptional(value)
+            elif self.name == BINARY_INTO:
+                return BinaryIntoOptional(value)
+            elif self.name == BINARY_FROM:
+                return BinaryFromOptional(value)
+            else:
+                raise NotImplementedError(f'{self.name}')
+
+        def resolve_tagged(cls: Tagged):
+            types = cls.types
+            tags = cls.tags if cls.tags is not None else tuple(x.__name__ for x in types)
+
+            if len(tags) != len(types) or len(set(tags)) != len(tags):
+                raise ValueError(f'tags of {types} are not unique: {tags}')
+
+            for x in types:
+                if not is_dataclass(x):
+                    raise NotImplementedError(('union', x))
+
+                if cls.content is None and any(y.name == cls.tag for y in fields(x)):
+                    raise ValueError(f'`{cls.tag}` of {x} is the tag of the union')
+
+            members = [self.resolve(x) for x in types]
+
+            if self.name == JSON_INTO:
+                return AnyIntoUnion(types, members, tags, cls.tag, cls.content)
+            elif self.name == JSON_FROM:
+                return AnyFromUnion(types, members, tags, cls.tag, cls.content)
+            elif self.name == BINARY_INTO:
+                return BinaryIntoUnion(types, members, tags, cls.tag, cls.content)
+            elif self.name == BINARY_FROM:
+                return BinaryFromUnion(types, members, tags, cls.tag, cls.content)
             else:
                 raise NotImplementedError(f'{self.name}')
 
         if isinstance(cls, DeferredWrapper):
             cls = cls.type
             assert is_dataclass(cls), cls
+
+            if self.name in (BINARY_INTO, BINARY_FROM) and fixed_layout(cls) is not None:
+                return BinaryIntoFixed(cls) if self.name == BINARY_INTO else BinaryFromFixed(cls)
+
             r: List[Fac] = []
 
             for item in fields(cls):
@@ -178,7 +336,7 @@ class Walker:
                             )
                         )
                     )
-                elif self.name == 'json_into':
+                elif self.name in ('json_into', BINARY_INTO):
                     r.append(
                         AnyAnyField(
                             item.name,
@@ -188,6 +346,14 @@ class Walker:
                             )
                         )
                     )
+                elif self.name == BINARY_FROM:
+                    # binary fields are positional, every field decodes from where the previous one stopped
+                    r.append(
+                        AnyAnyField(
+                            item.name,
+                            item_factory
+                        )
+                    )
                 else:
                     raise NotImplementedError((self.name, None))
 
@@ -201,18 +367,37 @@ class Walker:
                     r,
                     cls,
                 )
+            elif self.name == BINARY_INTO:
+                return BinaryIntoStruct(r, cls)
+            elif self.name == BINARY_FROM:
+                return BinaryFromStruct(r, cls)
             else:
                 raise NotImplementedError((self.name, None))
+        elif isinstance(cls, Tagged):
+            return resolve_tagged(cls)
         elif isinstance(cls, Args):
             dx: CallableSerializers = getattr(cls.type, DECL_CALLABLE_ATTR)
-            return dx.parameters[self.name]
+            return dx.args(self.name)
         elif isinstance(cls, Return):
             dx: CallableSerializers = getattr(cls.type, DECL_CALLABLE_ATTR)
-            return dx.return_[self.name]
+            return dx.reply(self.name)
         elif is_serializable(cls):
-            return Ref(self.name, cls.__module__ + '.' + cls.__name__)
+            return Ref(self.name, cls)
+        elif is_ndarray(cls):
+            if self.name == 'json_from':
+                return JsonFromNdArray(ndarray_dtype(cls))
+            elif self.name == 'json_into':
+                return JsonIntoNdArray(ndarray_dtype(cls))
+            else:
+                raise NotImplementedError(f'{self.name}')
         elif inspect.isclass(cls):
-            if issubclass(cls, bool):
+            if self.name in (BINARY_INTO, BINARY_FROM) and issubclass(cls, Enum):
+                # int enums are not mapped as plain ints, their members are restored from the value
+                return resolve_enum(cls)
+            elif self.name in (BINARY_INTO, BINARY_FROM) and issubclass(cls, tuple(BINARY_SCALARS)):
+                into, from_ = next(v for k, v in BINARY_SCALARS.items() if issubclass(cls, k))
+                return into() if self.name == BINARY_INTO else from_()
+            elif issubclass(cls, bool):
                 return This(bool)
             elif issubclass(cls, float):
                 return This(float)
@@ -225,6 +410,10 @@ class Walker:
                     return JsonFromDateTime()
                 elif self.name == 'json_into':
                     return JsonIntoDateTime()
+                elif self.name == BINARY_INTO:
+                    return BinaryIntoDateTime()
+                elif self.name == BINARY_FROM:
+                    return BinaryFromDateTime()
                 else:
                     raise NotImplementedError(f'{self.name}')
             elif issubclass(cls, timedelta):
@@ -232,6 +421,10 @@ class Walker:
                     return JsonFromTimeDelta()
                 elif self.name == 'json_into':
                     return JsonIntoTimeDelta()
+                elif self.name == BINARY_INTO:
+                    return BinaryIntoTimeDelta()
+                elif self.name == BINARY_FROM:
+                    return BinaryFromTimeDelta()
                 else:
                     raise NotImplementedError(f'{self.name}')
             elif issubclass(cls, List):
@@ -239,22 +432,9 @@ class Walker:
             elif issubclass(cls, Dict):
                 return resolve_dict(cls)
             elif issubclass(cls, Enum):
-                clss = set(item.value.__class__ for item in cls)
-
-                assert len(clss) == 1, clss
-
-                t = clss.pop()
-
-                fac = self.resolve(t)
-
-                if self.name == 'json_from':
-                    return AnyFromEnum(cls, fac)
-                elif self.name == 'json_into':
-                    return AnyIntoEnum(cls, fac)
-                else:
-                    raise NotImplementedError(('class4', cls))
+                return resolve_enum(cls)
             elif is_dataclass(cls):
-                return Ref(self.name, cls.__module__ + '.' + cls.__name__)
+                return Ref(self.name, cls)
             else:
                 raise NotImplementedError(('class2', cls))
         elif isinstance(cls, ForwardRef):
@@ -268,18 +448,18 @@ class Walker:
             t = eval(code, self.globals, self.locals)
             return self.resolve(t)
         else:
-            if is_optional_type(cls):
+            members = [x for x in get_args(cls) if x is not type(None)] if is_union_type(cls) else []
+
+            if len(members) > 1:
+                value = self.resolve(Tagged(tuple(members)))
+                return resolve_optional(value) if is_optional_type(cls) else value
+            elif is_optional_type(cls):
                 if sys.version_info >= (3, 7):
                     item, _ = get_args(cls)
                 else:
                     item, _ = get_last_args(cls)
 
-                value = self.resolve(item)
-
-                if self.name.startswith('json'):
-                    return JsonAnyOptional(value)
-                else:
-                    raise NotImplementedError(f'{self.name}')
+                return resolve_optional(self.resolve(item))
             elif sys.version_info >= (3, 7) and hasattr(cls, '__origin__'):
                 if cls.__origin__ is list:
                     return resolve_list(cls)
@@ -288,9 +468,33 @@ class Walker:
             else:
                 raise NotImplementedError(('class', cls, cls.__class__))
 
+    def evaluate(self, cls: Any) -> Any:
+        """the class a forward reference refers to"""
+        if isinstance(cls, ForwardRef):
+            cls = cls.__forward_arg__
+
+        if isinstance(cls, str):
+            return eval(compile(cls, '<string>', 'eval'), self.globals, self.locals)
+
+        return cls
+
+    def is_fixed(self, cls: Any) -> bool:
+        """`cls` is an inferred dataclass marked `fixed`, which the binary walkers pack with a single `struct.Struct`"""
+        if self.name not in (BINARY_INTO, BINARY_FROM) or not is_dataclass(cls):
+            return False
+
+        serde = getattr(cls, DECL_ATTR, None)
+
+        if not isinstance(serde, Serializers):
+            return False
+
+        x = serde.items.get(self.name)
+
+        return isinstance(x, (Deferred, BinaryIntoFixed, BinaryFromFixed)) and fixed_layout(cls) is not None
+
     def _visit_objs(self, *roots: Fac) -> Tuple[NodeObjsDict, VisitNodeDict, List[NodeId]]:
         visit_node: VisitNodeDict = {}
-        name_node: Dict[str, NodeId] = {}
+        name_node: Dict[Tuple[str, Type], NodeId] = {}
 
         node_objs: NodeObjsDict = {}
         to_visit: Deque[Tuple[VisitId, List[DepId], Fac]] = deque()
@@ -303,13 +507,16 @@ class Walker:
             should_early = False
 
             if isinstance(obj, Ref):
-                if obj.full_name not in name_node:
+                # by the class itself, classes of the same name may be defined in functions
+                key = obj.name, obj.target()
+
+                if key not in name_node:
                     node_id = next(node_ctr)
-                    name_node[obj.full_name] = node_id
+                    name_node[key] = node_id
 
                     obj = obj.resolve()
                 else:
-                    node_id = name_node[obj.full_name]
+                    node_id = name_node[key]
                     should_early = True
             else:
                 node_id = next(node_ctr)
@@ -346,12 +553,62 @@ class Walker:
 
         return node_objs, visit_node, root_nodes
 
-    def mappers(self, *roots: Fac) -> List[Mapper]:
+    def mappers(self, *roots: Fac, lazy: bool = False, validate: bool = False,
+                select: Optional[Iterable[str]] = None, optimize: bool = False, dedup: bool = False,
+                memo: bool = False, profile: Optional[Profile] = None) -> List[Mapper]:
+        """
+        :param lazy: decoded dataclasses only decode their fields on first access, see `LazyFromStructMapper`
+        :param validate: `json_from` mappers only check their input and return it unchanged, see `json_validate`
+        :param select: only map these field paths of every root, e.g. `body.method` or `items[*].id`,
+            see `vow.marsh.projection`
+        :param optimize: remove the redundant nodes of the graph, see `vow.marsh.optimizer`
+        :param dedup: share a single mapper between interchangeable nodes, see `vow.marsh.dedup`; fewer mappers are
+            built, but a shared one is no longer inlined by the compiler at every use
+        :param memo: dataclass instances seen twice are written once and referred to afterwards, which also maps
+            cycles, see `vow.marsh.memo`
+        :param profile: every node counts its calls, errors and time into it, see `vow.marsh.profile`; `dedup` is
+            ignored, so that every path of the graph is reported on its own
+        """
+        if memo and (lazy or validate or select is not None):
+            raise ValueError('`memo` can not be combined with `lazy`, `validate` or `select`')
+
+        if profile is not None and select is not None:
+            raise ValueError('`profile` can not be combined with `select`')
+
         node_objs, visit_node, root_nodes = self._visit_objs(*roots)
 
+        if optimize:
+            node_objs, root_nodes = optimize_nodes(node_objs, root_nodes)
+
+        if dedup and profile is None:
+            size = len(node_objs)
+            # a shared node could only be reported under one of its paths
+            node_objs, root_nodes = dedup_nodes(node_objs, root_nodes)
+
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug('%d nodes, %d after dedup', size, len(node_objs))
+
         node_deps_empty = {k: {} for k in node_objs.keys()}
         node_mapper = {k: fac.create(node_deps_empty[k]) for k, (_, fac, _) in node_objs.items()}
 
+        if validate:
+            node_mapper = {k: validator(v) for k, v in node_mapper.items()}
+        elif lazy:
+            node_mapper = {
+                k: LazyFromStructMapper(v.cls, v.dependencies) if type(v) is AnyFromStructMapper else v
+                for k, v in node_mapper.items()
+            }
+        elif memo:
+            node_mapper = {k: memoized(v) for k, v in node_mapper.items()}
+
+        if profile is not None:
+            facs = {tuple(path): fac for path, fac, _ in node_objs.values()}
+
+            node_mapper = {
+                k: profiled(profile, node_mapper[k], path, describe(tuple(path), facs), fac)
+                for k, (path, fac, _) in node_objs.items()
+            }
+
         for k, deps in node_deps_empty.items():
             _, _, deps_map = node_objs[k]
 
@@ -360,8 +617,18 @@ class Walker:
 
         root_mappers = [node_mapper[node_id] for node_id in root_nodes]
 
+        if select is not None:
+            selection = parse_select(select)
+            root_mappers = [project(x, selection) for x in root_mappers]
+        elif memo:
+            root_mappers = [MemoMapper({'child': x}) for x in root_mappers]
+
         return root_mappers
 
+    def compiled(self, *roots: Fac, **kwargs) -> List[Mapper]:
+        """same as `mappers`, but every root is turned into generated python code"""
+        return compile_mappers(*self.mappers(*roots, **kwargs))
+
 
 def _load_fun_parameters(fun, is_method=False):
     signature = inspect.signature(fun)
@@ -7,7 +7,7 @@ from xrpc.trace import trc
 from vow.oas.data import JsonAny
 from vow.oas.envelope import RequestEnvelope
 from vow.marsh.base import Mapper
-from vow.marsh.walker import Walker
+from vow.marsh.decl import get_serializers
 
 
 @dataclass
@@ -62,18 +62,16 @@ class Endpoints:
         return [x for x in self.items if x.operation_id == item][0]
 
     def mappify(self, name_req: str, name_rep: str) -> 'Endpoints':
-        walker_req = Walker(name_req)
-
-        factories_req = []
+        types_req = []
 
         for endpoint in self.items:
             for arg in endpoint.arguments:
-                factories_req.append(walker_req.resolve(arg.type))
+                types_req.append(arg.type)
 
             if endpoint.body:
-                factories_req.append(walker_req.resolve(endpoint.body))
+                types_req.append(endpoint.body)
 
-        mappers_req = iter(walker_req.mappers(*factories_req))
+        mappers_req = iter(get_serializers(name_req, *types_req))
 
         for endpoint in self.items:
             for arg in endpoint.arguments:
@@ -82,15 +80,13 @@ class Endpoints:
             if endpoint.body:
                 endpoint.body_mapper = next(mappers_req)
 
-        walker_rep = Walker(name_rep)
-
-        factories_rep = []
+        types_rep = []
 
         for endpoint in self.items:
             if endpoint.response:
-                factories_rep.append(walker_rep.resolve(endpoint.response))
+                types_rep.append(endpoint.response)
 
-        mappers_rep = iter(walker_rep.mappers(*factories_rep))
+        mappers_rep = iter(get_serializers(name_rep, *types_rep))
 
         for endpoint in self.items:
             if endpoint.response:
@@ -15,7 +15,7 @@ from vow.oas.obj.op import Path, Operation, Parameter, OperationRequestBody, \
     SchemaMedia, ResponseCode, Response, split_path_parameters, Placement
 from vow.oas.obj.schema import ObjectSchema, Defaulted
 from vow.marsh.impl.json import JSON_INTO
-from vow.marsh.walker import Walker
+from vow.marsh.decl import get_serializers
 from xrpc.trace import trc
 
 
@@ -105,9 +105,7 @@ def auto_dataclass(cls):
                     else:
                         raise NotImplementedError(f'{field.name} {item} [1]')
                 else:
-                    ctx = Walker(JSON_INTO)
-                    fac = ctx.resolve(field.type)
-                    mapper, = ctx.mappers(fac)
+                    mapper, = get_serializers(JSON_INTO, field.type)
 
                     default_set = mapper.serialize(default)
 
@@ -131,9 +129,7 @@ def auto_callable_param_schema(params, par: T) -> T:
         schema = auto_any(annot)
 
         if default != EMPTY:
-            ctx = Walker(JSON_INTO)
-            fac = ctx.resolve(par)
-            mapper, = ctx.mappers(fac)
+            mapper, = get_serializers(JSON_INTO, annot)
 
             schema.default = mapper.serialize(default)
     return replace(par, schema=schema)
@@ -4,7 +4,7 @@ from dataclasses import dataclass, replace, field
 from typing import Optional, List, Tuple, Any
 
 from vow.marsh.base import Mapper
-from vow.marsh.decl import get_mappers, get_factories_il, infer
+from vow.marsh.decl import get_serializers, infer
 from vow.marsh.impl.json import JSON_INTO, JSON_FROM
 from vow.marsh.walker import Kind, auto_callable_kind_reply, Return, Args
 
@@ -51,14 +51,11 @@ class rpc:
     serializers: List[str] = field(default_factory=lambda: [JSON_FROM, JSON_INTO])
 
     def to_method(self, fun, ser_name: str, des_name: str) -> 'Method':
-        # needs the callable itself to extract the serializers
+        # needs the callable itself to extract the serializers, shared by all the instances of a class
+        fun = getattr(fun, '__func__', fun)
 
-        input_into, output_into, input_from, output_from = get_mappers(
-            get_factories_il(ser_name, Args(fun)),
-            get_factories_il(ser_name, Return(fun)),
-            get_factories_il(des_name, Args(fun)),
-            get_factories_il(des_name, Return(fun)),
-        )
+        input_into, output_into = get_serializers(ser_name, Args(fun), Return(fun))
+        input_from, output_from = get_serializers(des_name, Args(fun), Return(fun))
 
         return Method(
             name=self.name,
@@ -87,7 +84,7 @@ class rpc:
         if item.signature is None:
             signature = inspect.signature(fun)
 
-            if self.is_method:
+            if item.is_method:
                 parms = list(signature.parameters.items())[1:]
                 signature = signature.replace(parameters=[x for _, x in parms])
 
@@ -95,6 +92,7 @@ class rpc:
 
         setattr(fun, '__rpc__', item)
 
+        # the serializers of the arguments and the reply are only inferred once `to_method` looks them up
         fun = infer(*self.serializers, is_method=self.is_method)(fun)
 
         return fun
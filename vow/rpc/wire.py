@@ -1,4 +1,5 @@
 import json
+from collections import OrderedDict
 from enum import Enum
 from typing import Optional, Any, Tuple, Union
 
@@ -8,14 +9,14 @@ from vow.marsh.base import FieldsFac, Mapper, Fac
 from vow.marsh.decl import infer
 from vow.marsh.error import SerializationError
 from vow.marsh.helper import FIELD_FACTORY
-from vow.marsh.impl.any import This, AnyAnyDiscriminant, Ref, AnyAnyItem, AnyAnySelfMapper, AnyAnyField, \
-    AnyAnyAttr, AnyAnyLookupMapper, AnyAnyWith, AnyAnyLookup, AnyAnyLen, AnyAnyTrace
+from vow.marsh.impl.any import This, Ref, AnyAnyItem, AnyAnySelfMapper, AnyAnyField, AnyAnyAttr, AnyAnyWith, \
+    AnyAnyLen, AnyAnyTrace
 from vow.marsh.impl.binary import BinaryNext, BINARY_FROM, BINARY_INTO
 from vow.marsh.impl.binary_from import BinaryFromVarInt, BinaryFromBytes, BinaryFromJson
 from vow.marsh.impl.binary_into import BinaryIntoVarInt, BinaryIntoJson, BinaryIntoConcat
 from vow.marsh.impl.json import JSON_FROM, JSON_INTO, JsonAnyAny, JsonAnyOptional
-from vow.marsh.impl.any_from import AnyFromStruct, AnyFromEnum
-from vow.marsh.impl.any_into import AnyIntoStruct, AnyIntoEnum
+from vow.marsh.impl.any_from import AnyFromStruct
+from vow.marsh.impl.union import AnyIntoUnion, AnyFromUnion
 from vow.marsh.walker import Walker
 from vow.oas.data import JsonAny
 
@@ -48,6 +49,7 @@ class Type(Enum):
 # is an envelope.
 
 class BinaryFromFrameMapper(Mapper):
+    __slots__ = ()
 
     def serialize(self, obj: bytes) -> Tuple['Frame', bytes]:
         size, obj = self.dependencies['varint'].serialize(obj)
@@ -69,6 +71,7 @@ class BinaryFromFrame(Fac):
 
 
 class BinaryIntoFrameMapper(Mapper):
+    __slots__ = ()
 
     def serialize(self, obj: 'Frame') -> bytes:
         try:
@@ -93,47 +96,45 @@ class Frame:
     body: JsonAny = field(default=None)
 
 
-class JsonIntoPacket(Fac):
-    __mapper_cls__ = AnyAnySelfMapper
+class JsonIntoPacketMapper(Mapper):
+    """the `type` of the packet and its `body` are both written by the union of the body"""
+    __slots__ = ()
 
-    def dependencies(self) -> FieldsFac:
-        r = dict()
+    def serialize(self, obj: 'Packet') -> Any:
+        try:
+            stream = self.dependencies['stream'].serialize(obj)
+        except SerializationError as e:
+            e.prepend_path('stream')
+            raise
 
-        r['self'] = AnyIntoStruct(
-            [
-                AnyAnyField(
-                    'type',
-                    AnyIntoEnum(
-                        Type,
-                        AnyAnyLookup(
-                            AnyAnyWith(
-                                AnyAnyAttr('body', This()),
-                                AnyAnyAttr('__class__', This()),
-                            ),
-                            {v: k for k, v in PACKET_TYPE_MAP}
-                        )
-                    ),
-                ),
-                AnyAnyField(
-                    'stream',
-                    AnyAnyAttr('stream', JsonAnyOptional(This(str)))
-                ),
-                AnyAnyField(
-                    'body',
-                    AnyAnyDiscriminant(
-                        AnyAnyWith(
-                            AnyAnyAttr('body', This()),
-                            AnyAnyAttr('__class__', This()),
-                        ),
-                        AnyAnyAttr('body', This()),
-                        [(v, Ref(JSON_INTO, v)) for _, v in PACKET_TYPE_MAP]
-                    )
-                ),
-            ],
-            Packet
-        )
+        try:
+            body = self.dependencies['body'].serialize(obj)
+        except SerializationError as e:
+            e.prepend_path('body')
+            raise
 
-        return r
+        return OrderedDict([('type', body['type']), ('stream', stream), ('body', body['body'])])
+
+
+def packet_union(fac, name: str) -> Fac:
+    """the body of a packet, written under `body` next to its `type`"""
+    return fac(
+        tuple(v for _, v in PACKET_TYPE_MAP),
+        [Ref(name, v) for _, v in PACKET_TYPE_MAP],
+        tuple(k.value for k, _ in PACKET_TYPE_MAP),
+        tag='type',
+        content='body',
+    )
+
+
+class JsonIntoPacket(Fac):
+    __mapper_cls__ = JsonIntoPacketMapper
+
+    def dependencies(self) -> FieldsFac:
+        return {
+            'stream': AnyAnyAttr('stream', JsonAnyOptional(This(str))),
+            'body': AnyAnyAttr('body', packet_union(AnyIntoUnion, JSON_INTO)),
+        }
 
 
 class JsonFromPacket(Fac):
@@ -144,21 +145,14 @@ class JsonFromPacket(Fac):
 
         r['self'] = AnyFromStruct(
             [
-                # ('type', False, AnyAnyField(
-                #     'type',
-                #     AnyAnyItem('type', JsonFromEnum(Type, Passthrough(str)))
-                # )),
                 AnyAnyField(
                     'stream',
                     AnyAnyItem('stream', JsonAnyOptional(This(str)))
                 ),
                 AnyAnyField(
                     'body',
-                    AnyAnyDiscriminant(
-                        AnyAnyItem('type', AnyFromEnum(Type, This(str))),
-                        AnyAnyItem('body', JsonAnyAny()),
-                        [(k, Ref(JSON_FROM, v)) for k, v in PACKET_TYPE_MAP]
-                    )
+                    # the union reads the `type` and the `body` items of the packet
+                    packet_union(AnyFromUnion, JSON_FROM)
                 ),
             ],
             Packet
@@ -0,0 +1,49 @@
+"""
+throughput of `Mapper.serialize_many` against serializing a 100k element list one item at a time:
+
+    python -m vow_bench.batch [--size 100000]
+"""
+import gc
+import sys
+from argparse import ArgumentParser
+
+from vow.marsh.base import Mapper
+from vow.marsh.decl import get_serializers
+from vow.marsh.impl.json import JSON_INTO, JSON_FROM
+from vow_bench.slots import Shape, Point, measure
+
+
+def main(size: int, repeat: int, no_gc: bool):
+    objs = [
+        Shape(f'shape{i}', [Point(i, j, f'p{j}') for j in range(3)], Point(0, 0, 'o') if i % 2 else None)
+        for i in range(size)
+    ]
+
+    into, = get_serializers(JSON_INTO, Shape)
+    from_, = get_serializers(JSON_FROM, Shape)
+
+    raw = into.serialize_many(objs)
+
+    if no_gc:
+        gc.disable()
+
+    print(f'python {sys.version.split()[0]}, {size} shapes, gc {"off" if no_gc else "on"}')
+    print(f'{"mode":<24}{"shapes/s":>12}')
+
+    for name, mapper, obj in ((JSON_INTO, into, objs), (JSON_FROM, from_, raw)):
+        for mode, fn in (('serialize', lambda x: Mapper.serialize_many(mapper, x)), ('serialize_many', mapper.serialize_many)):
+            took = measure(fn, obj, repeat)
+
+            print(f'{name + " " + mode:<24}{size / took:>12.0f}')
+
+
+def parser():
+    parser = ArgumentParser()
+    parser.add_argument('--size', type=int, default=100000)
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--no-gc', action='store_true', help='disable the cyclic garbage collector while measuring')
+    return parser
+
+
+if __name__ == '__main__':
+    main(**vars(parser().parse_args()))
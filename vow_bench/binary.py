@@ -0,0 +1,56 @@
+"""
+message size and encode/decode throughput of a 100k element list of nested dataclasses, as JSON against the
+`bin_into`/`bin_from` encoding:
+
+    python -m vow_bench.binary [--size 100000]
+"""
+import json
+import sys
+from argparse import ArgumentParser
+from typing import List
+
+from vow.marsh.decl import get_serializers
+from vow.marsh.impl.binary import BINARY_INTO, BINARY_FROM
+from vow.marsh.impl.json import JSON_INTO, JSON_FROM
+from vow_bench.slots import Shape, Point, measure
+
+
+def main(size: int, repeat: int):
+    objs = [
+        Shape(f'shape{i}', [Point(i, -j, f'p{j}') for j in range(3)], Point(0, 0, 'o') if i % 2 else None)
+        for i in range(size)
+    ]
+
+    json_into, = get_serializers(JSON_INTO, List[Shape])
+    json_from, = get_serializers(JSON_FROM, List[Shape])
+    bin_into, = get_serializers(BINARY_INTO, List[Shape])
+    bin_from, = get_serializers(BINARY_FROM, List[Shape])
+
+    modes = [
+        ('json', lambda x: json.dumps(json_into(x)).encode(), lambda x: json_from(json.loads(x))),
+        ('binary', bin_into, lambda x: bin_from(x).val),
+    ]
+
+    print(f'python {sys.version.split()[0]}, {size} shapes')
+    print(f'{"mode":<12}{"B/shape":>12}{"encode/s":>12}{"decode/s":>12}')
+
+    for name, into, from_ in modes:
+        raw = into(objs)
+
+        assert from_(raw) == objs, name
+
+        took_into = measure(into, objs, repeat)
+        took_from = measure(from_, raw, repeat)
+
+        print(f'{name:<12}{len(raw) / size:>12.1f}{size / took_into:>12.0f}{size / took_from:>12.0f}')
+
+
+def parser():
+    parser = ArgumentParser()
+    parser.add_argument('--size', type=int, default=100000)
+    parser.add_argument('--repeat', type=int, default=3)
+    return parser
+
+
+if __name__ == '__main__':
+    main(**vars(parser().parse_args()))
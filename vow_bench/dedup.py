@@ -0,0 +1,107 @@
+"""
+mappers of a synthetic schema of many dataclasses with repeated field types, with and without `vow.marsh.dedup`:
+
+    python -m vow_bench.dedup [--size 2000] [--classes 50]
+"""
+import sys
+import time
+from argparse import ArgumentParser
+from datetime import datetime
+from typing import List, Optional, Dict, Type
+
+import pytz
+from dataclasses import make_dataclass
+
+from vow.marsh.base import walk
+from vow.marsh.decl import infer, get_serializers
+from vow.marsh.impl.binary import BINARY_INTO, BINARY_FROM
+from vow.marsh.impl.json import JSON_INTO, JSON_FROM
+from vow.marsh.walker import Walker
+from vow_bench.slots import measure, sizeof
+
+NAMES = JSON_INTO, JSON_FROM, BINARY_INTO, BINARY_FROM
+
+
+def schema(classes: int) -> List[Type]:
+    """every class has the same field types, and refers to the one before it"""
+    r = []
+
+    for i in range(classes):
+        fields = [
+            ('id', int),
+            ('name', str),
+            ('at', datetime),
+            ('score', Optional[int]),
+            ('tags', List[str]),
+            ('counts', Dict[str, int]),
+        ]
+
+        if r:
+            fields.append(('prev', Optional[r[-1]]))
+
+        r.append(infer(*NAMES)(make_dataclass(f'Item{i}', fields)))
+
+    return r
+
+
+def instance(clss: List[Type], i: int):
+    r = None
+
+    for cls in clss:
+        at = datetime(2019, 1, 2, 3, 4, 5, i, tzinfo=pytz.utc)
+        args = [i, f'item{i}', at, i if i % 2 else None, ['a', 'b'], {'a': i}]
+
+        if cls is not clss[0]:
+            args.append(r)
+
+        r = cls(*args)
+
+    return r
+
+
+def main(size: int, repeat: int, classes: int):
+    clss = schema(classes)
+    root = clss[-1]
+
+    objs = [instance(clss, i) for i in range(size)]
+
+    print(f'python {sys.version.split()[0]}, {classes} classes, {size} objects')
+    print(f'{"mode":<12}{"dedup":>6}{"mappers":>10}{"bytes":>10}{"build ms":>10}{"objs/s":>10}{"compiled":>10}')
+
+    for name, source in ((JSON_INTO, None), (JSON_FROM, JSON_INTO), (BINARY_INTO, None), (BINARY_FROM, BINARY_INTO)):
+        if source is None:
+            items = objs
+        else:
+            into, = get_serializers(source, root)
+            items = [into(x) for x in objs]
+
+        fac = Walker(name).resolve(root)
+
+        for dedup in (False, True):
+            t = time.perf_counter()
+            mapper, = Walker(None).mappers(fac, dedup=dedup)
+            took_build = time.perf_counter() - t
+
+            mappers = walk(mapper)
+            slotted, _ = sizeof(mappers)
+
+            row = f'{name:<12}{str(dedup):>6}{len(mappers):>10}{slotted:>10}{took_build * 1000:>10.1f}'
+
+            for compiled in (False, True):
+                mapper, = get_serializers(name, root, compiled=compiled, dedup=dedup)
+                took = measure(lambda xs: [mapper(x) for x in xs], items, repeat)
+                row += f'{size / took:>10.0f}'
+
+            print(row)
+
+
+def parser():
+    parser = ArgumentParser()
+    parser.add_argument('--size', type=int, default=2000)
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--classes', type=int, default=50)
+    return parser
+
+
+if __name__ == '__main__':
+    main(**vars(parser().parse_args()))
@@ -0,0 +1,107 @@
+"""
+startup of a fresh process that builds the mappers of a generated schema, without a disk cache, populating one, and
+loading from it, see `vow.marsh.disk`:
+
+    python -m vow_bench.disk [--classes 50] [--repeat 3] [--compiled]
+"""
+import os
+import subprocess
+import sys
+import tempfile
+from argparse import ArgumentParser
+
+from vow.marsh import disk
+
+HEADER = '''from datetime import datetime
+from typing import List, Optional, Dict
+
+from dataclasses import dataclass
+
+from vow.marsh.decl import infer
+from vow.marsh.impl.binary import BINARY_INTO, BINARY_FROM
+from vow.marsh.impl.json import JSON_INTO, JSON_FROM
+
+NAMES = JSON_INTO, JSON_FROM, BINARY_INTO, BINARY_FROM
+'''
+
+CLASS = '''
+
+@infer(*NAMES)
+@dataclass
+class Item{i}:
+    id: int
+    name: str
+    at: datetime
+    score: Optional[int]
+    tags: List[str]
+    counts: Dict[str, int]
+'''
+
+# prints the time it took to build the mappers of the last class of the schema
+CHILD = '''import sys, time
+from vow.marsh.decl import get_serializers
+import {module} as schema
+t = time.perf_counter()
+for name in schema.NAMES:
+    get_serializers(name, schema.Item{last}, compiled={compiled})
+print(time.perf_counter() - t)
+'''
+
+
+def source(classes: int) -> str:
+    """the same as the schema of `vow_bench.dedup`, every class refers to the one before it"""
+    r = HEADER
+
+    for i in range(classes):
+        r += CLASS.format(i=i)
+
+        if i:
+            r += f'    prev: Optional[Item{i - 1}]\n'
+
+    return r
+
+
+def child(path: str, module: str, last: int, compiled: bool, cache: str = None) -> float:
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join([path] + sys.path))
+    env.pop(disk.ENV, None)
+
+    if cache:
+        env[disk.ENV] = cache
+
+    code = CHILD.format(module=module, last=last, compiled=compiled)
+
+    return float(subprocess.check_output([sys.executable, '-c', code], env=env))
+
+
+def main(classes: int, repeat: int, compiled: bool):
+    with tempfile.TemporaryDirectory() as path:
+        module = 'vow_bench_disk_schema'
+
+        with open(os.path.join(path, f'{module}.py'), 'w') as f:
+            f.write(source(classes))
+
+        cache = os.path.join(path, 'cache')
+
+        print(f'python {sys.version.split()[0]}, {classes} classes{", compiled" if compiled else ""}')
+        print(f'{"mode":<10}{"build ms":>10}')
+
+        cold = min(child(path, module, classes - 1, compiled) for _ in range(repeat))
+        print(f'{"none":<10}{cold * 1000:>10.1f}')
+
+        populate = child(path, module, classes - 1, compiled, cache)
+        print(f'{"populate":<10}{populate * 1000:>10.1f}')
+
+        warm = min(child(path, module, classes - 1, compiled, cache) for _ in range(repeat))
+        print(f'{"load":<10}{warm * 1000:>10.1f}')
+
+
+def parser():
+    parser = ArgumentParser()
+    parser.add_argument('--classes', type=int, default=50)
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--compiled', action='store_true')
+    return parser
+
+
+if __name__ == '__main__':
+    main(**vars(parser().parse_args()))
@@ -0,0 +1,63 @@
+"""
+mappers of enums with str and int values, one value at a time, through `serialize_many`, and compiled:
+
+    python -m vow_bench.enum [--size 100000]
+"""
+import sys
+from argparse import ArgumentParser
+from enum import Enum
+
+from vow.marsh.decl import get_serializers
+from vow.marsh.impl.binary import BINARY_INTO, BINARY_FROM
+from vow.marsh.impl.json import JSON_INTO, JSON_FROM
+from vow_bench.slots import measure
+
+
+class Status(Enum):
+    Pending = 'pending'
+    Active = 'active'
+    Suspended = 'suspended'
+    Closed = 'closed'
+
+
+class Kind(Enum):
+    A = 1
+    B = 2
+    C = 3
+    D = 300
+
+
+def main(size: int, repeat: int):
+    print(f'python {sys.version.split()[0]}, {size} values')
+    print(f'{"enum":<8}{"mode":<10}{"one ns":>10}{"many ns":>10}{"compiled":>10}')
+
+    for enum in (Status, Kind):
+        members = list(enum)
+        objs = [members[i % len(members)] for i in range(size)]
+        encoded = {}
+
+        for name, source in ((JSON_INTO, None), (JSON_FROM, JSON_INTO), (BINARY_INTO, None), (BINARY_FROM, BINARY_INTO)):
+            mapper, = get_serializers(name, enum)
+            compiled, = get_serializers(name, enum, compiled=True)
+            items = objs if source is None else encoded[source]
+
+            one = measure(lambda xs: [mapper(x) for x in xs], items, repeat)
+            many = measure(mapper.serialize_many, items, repeat)
+            fast = measure(lambda xs: [compiled(x) for x in xs], items, repeat)
+
+            print(f'{enum.__name__:<8}{name:<10}{one / size * 1e9:>10.1f}{many / size * 1e9:>10.1f}'
+                  f'{fast / size * 1e9:>10.1f}')
+
+            if source is None:
+                encoded[name] = mapper.serialize_many(objs)
+
+
+def parser():
+    parser = ArgumentParser()
+    parser.add_argument('--size', type=int, default=100000)
+    parser.add_argument('--repeat', type=int, default=3)
+    return parser
+
+
+if __name__ == '__main__':
+    main(**vars(parser().parse_args()))
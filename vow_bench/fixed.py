@@ -0,0 +1,100 @@
+"""
+encode/decode throughput of a 100k element list of fixed-width records, as JSON, as the positional binary encoding
+(plain `int` fields) and as a fixed layout (bounded int fields):
+
+    python -m vow_bench.fixed [--size 100000]
+"""
+import json
+import sys
+from argparse import ArgumentParser
+from enum import IntEnum
+from typing import List
+
+from dataclasses import dataclass
+
+from vow.marsh.decl import infer, get_serializers
+from vow.marsh.impl.binary import BINARY_INTO, BINARY_FROM
+from vow.marsh.impl.binary_fixed import Int8, Int64, UInt64, Float32, fixed, fixed_layout
+from vow.marsh.impl.json import JSON_INTO, JSON_FROM
+from vow_bench.slots import measure
+
+
+class Side(IntEnum):
+    Buy = 1
+    Sell = -1
+
+
+@infer(JSON_INTO, JSON_FROM, BINARY_INTO, BINARY_FROM)
+@dataclass
+class Price:
+    mantissa: int
+    exponent: int
+
+
+@infer(JSON_INTO, JSON_FROM, BINARY_INTO, BINARY_FROM)
+@dataclass
+class Tick:
+    ts: int
+    price: Price
+    size: float
+    side: Side
+
+
+@infer(JSON_INTO, JSON_FROM, BINARY_INTO, BINARY_FROM)
+@fixed
+@dataclass
+class FixedPrice:
+    mantissa: Int64
+    exponent: Int8
+
+
+@infer(JSON_INTO, JSON_FROM, BINARY_INTO, BINARY_FROM)
+@fixed
+@dataclass
+class FixedTick:
+    ts: UInt64
+    price: FixedPrice
+    size: Float32
+    side: Side
+
+
+def main(size: int, repeat: int):
+    ticks = [Tick(1500000000000 + i, Price(12345 + i, -2), i / 4, Side.Buy if i % 2 else Side.Sell) for i in range(size)]
+    fixed = [FixedTick(x.ts, FixedPrice(x.price.mantissa, x.price.exponent), x.size, x.side) for x in ticks]
+
+    modes = []
+
+    for name, cls, objs in (('json', Tick, ticks), ('binary', Tick, ticks), ('fixed', FixedTick, fixed)):
+        if name == 'json':
+            into, = get_serializers(JSON_INTO, List[cls])
+            from_, = get_serializers(JSON_FROM, List[cls])
+            modes.append((name, objs, lambda x, into=into: json.dumps(into(x)).encode(),
+                          lambda x, from_=from_: from_(json.loads(x))))
+        else:
+            into, = get_serializers(BINARY_INTO, List[cls])
+            from_, = get_serializers(BINARY_FROM, List[cls])
+            modes.append((name, objs, into, lambda x, from_=from_: from_(x).val))
+
+    print(f'python {sys.version.split()[0]}, {size} ticks, {fixed_layout(FixedTick)}')
+    print(f'{"mode":<12}{"B/tick":>12}{"encode/s":>12}{"decode/s":>12}')
+
+    for name, objs, into, from_ in modes:
+        raw = into(objs)
+
+        assert from_(raw) == objs, name
+
+        took_into = measure(into, objs, repeat)
+        took_from = measure(from_, raw, repeat)
+
+        print(f'{name:<12}{len(raw) / size:>12.1f}{size / took_into:>12.0f}{size / took_from:>12.0f}')
+
+
+def parser():
+    parser = ArgumentParser()
+    parser.add_argument('--size', type=int, default=100000)
+    parser.add_argument('--repeat', type=int, default=3)
+    return parser
+
+
+if __name__ == '__main__':
+    main(**vars(parser().parse_args()))
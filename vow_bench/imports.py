@@ -0,0 +1,104 @@
+"""
+import time of a generated module of `@rpc` methods, whose serializers are only inferred on the first lookup, against
+looking all of them up right after the import, which is what decorating used to do:
+
+    python -m vow_bench.imports [--methods 500] [--repeat 5]
+"""
+import os
+import subprocess
+import sys
+import tempfile
+from argparse import ArgumentParser
+
+HEADER = '''from typing import List, Optional, Iterable
+
+from dataclasses import dataclass
+
+from vow.marsh.decl import infer
+from vow.marsh.impl.json import JSON_INTO, JSON_FROM
+from vow.rpc.decl import rpc
+
+
+@infer(JSON_INTO, JSON_FROM)
+@dataclass
+class Item:
+    id: int
+    name: str
+    tags: List[str]
+'''
+
+SERVICE = '''
+
+class Service{i}:
+'''
+
+METHOD = '''    @rpc()
+    def method{j}(self, a: int, b: Optional[str], item: Item) -> {reply}:
+        pass
+
+'''
+
+# prints the time it took to import the module, and to look all of the serializers up afterwards
+CHILD = '''import time
+import vow.rpc.decl
+t = time.perf_counter()
+import {module} as methods
+took = time.perf_counter() - t
+rpcs = [vow.rpc.decl.collect(getattr(methods, x)) for x in dir(methods) if x.startswith('Service')]
+t = time.perf_counter()
+{resolve}
+print(took, time.perf_counter() - t)
+'''
+
+RESOLVE = '''for x in rpcs:
+    x.to_methods('json_into', 'json_from')'''
+
+
+def source(methods: int, per_service: int = 10) -> str:
+    r = HEADER
+
+    for j in range(methods):
+        if j % per_service == 0:
+            r += SERVICE.format(i=j // per_service)
+
+        r += METHOD.format(j=j, reply='Iterable[Item]' if j % 2 else 'Item')
+
+    return r
+
+
+def child(path: str, module: str, resolve: bool):
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join([path] + sys.path))
+    code = CHILD.format(module=module, resolve=RESOLVE if resolve else 'pass')
+
+    took, resolved = subprocess.check_output([sys.executable, '-c', code], env=env).split()
+
+    return float(took), float(resolved)
+
+
+def main(methods: int, repeat: int):
+    with tempfile.TemporaryDirectory() as path:
+        module = 'vow_bench_imports_methods'
+
+        with open(os.path.join(path, f'{module}.py'), 'w') as f:
+            f.write(source(methods))
+
+        # the first run writes the bytecode of the module
+        child(path, module, False)
+
+        print(f'python {sys.version.split()[0]}, {methods} methods')
+        print(f'{"mode":<12}{"import ms":>10}{"lookup ms":>10}')
+
+        for resolve in (False, True):
+            took, resolved = min(child(path, module, resolve) for _ in range(repeat))
+            print(f'{"all" if resolve else "import":<12}{took * 1000:>10.1f}{resolved * 1000:>10.1f}')
+
+
+def parser():
+    parser = ArgumentParser()
+    parser.add_argument('--methods', type=int, default=500)
+    parser.add_argument('--repeat', type=int, default=5)
+    return parser
+
+
+if __name__ == '__main__':
+    main(**vars(parser().parse_args()))
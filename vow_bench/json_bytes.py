@@ -0,0 +1,64 @@
+"""
+peak memory and throughput of writing a 100k element list of nested dataclasses as JSON, via `json.dumps` over the
+`json_into` tree against the `json_bytes` writer:
+
+    python -m vow_bench.json_bytes [--size 100000]
+"""
+import json
+import sys
+import tracemalloc
+from argparse import ArgumentParser
+from typing import List, Callable, Any, Tuple
+
+from vow.marsh.decl import get_serializers
+from vow.marsh.impl.json import JSON_INTO
+from vow.marsh.impl.json_bytes import JSON_BYTES
+from vow_bench.slots import Shape, Point, measure
+
+
+def peak(fn: Callable[[Any], Any], obj: Any) -> Tuple[int, int]:
+    """peak traced memory while running `fn`, and the size of what it returned"""
+    tracemalloc.start()
+    try:
+        r = fn(obj)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return peak, len(r) if r is not None else 0
+
+
+def main(size: int, repeat: int):
+    objs = [
+        Shape(f'shape{i}', [Point(i, j, f'p{j}') for j in range(3)], Point(0, 0, 'o') if i % 2 else None)
+        for i in range(size)
+    ]
+
+    into, = get_serializers(JSON_INTO, List[Shape])
+    writer, = get_serializers(JSON_BYTES, List[Shape])
+
+    modes = [
+        ('json.dumps(json_into)', lambda x: json.dumps(into(x)).encode()),
+        ('json_bytes', writer),
+        ('json_bytes.dump', lambda x: writer.dump(x, lambda _: None)),
+    ]
+
+    print(f'python {sys.version.split()[0]}, {size} shapes')
+    print(f'{"mode":<24}{"shapes/s":>12}{"peak, MiB":>12}{"output, MiB":>14}')
+
+    for name, fn in modes:
+        took = measure(fn, objs, repeat)
+        used, written = peak(fn, objs)
+
+        print(f'{name:<24}{size / took:>12.0f}{used / 2 ** 20:>12.1f}{written / 2 ** 20:>14.1f}')
+
+
+def parser():
+    parser = ArgumentParser()
+    parser.add_argument('--size', type=int, default=100000)
+    parser.add_argument('--repeat', type=int, default=3)
+    return parser
+
+
+if __name__ == '__main__':
+    main(**vars(parser().parse_args()))
@@ -0,0 +1,93 @@
+"""
+bytes and objects/s of orders that share a few customers, with and without back-references, see `vow.marsh.memo`:
+
+    python -m vow_bench.memo [--size 20000] [--customers 100]
+"""
+import json
+import sys
+from argparse import ArgumentParser
+from typing import List
+
+from dataclasses import dataclass
+
+from vow.marsh.decl import infer, get_serializers
+from vow.marsh.impl.binary import BINARY_INTO, BINARY_FROM
+from vow.marsh.impl.json import JSON_INTO, JSON_FROM
+from vow_bench.slots import measure
+
+NAMES = JSON_INTO, JSON_FROM, BINARY_INTO, BINARY_FROM
+
+
+@infer(*NAMES)
+@dataclass
+class Address:
+    street: str
+    city: str
+    country: str
+
+
+@infer(*NAMES)
+@dataclass
+class Customer:
+    id: int
+    name: str
+    email: str
+    billing: Address
+    shipping: Address
+
+
+@infer(*NAMES)
+@dataclass
+class Order:
+    id: int
+    customer: Customer
+    items: List[str]
+    total: float
+
+
+@infer(*NAMES)
+@dataclass
+class Book:
+    orders: List[Order]
+
+
+def book(size: int, customers: int) -> Book:
+    xs = []
+
+    for i in range(customers):
+        address = Address(f'{i} Long Street Name', 'Some City', 'Some Country')
+        xs.append(Customer(i, f'customer {i}', f'customer{i}@example.com', address, address))
+
+    return Book([Order(i, xs[i % customers], ['a', 'b'], i / 4) for i in range(size)])
+
+
+def main(size: int, repeat: int, customers: int):
+    obj = book(size, customers)
+
+    print(f'python {sys.version.split()[0]}, {size} orders, {customers} customers')
+    print(f'{"mode":<12}{"memo":>6}{"bytes":>12}{"into/s":>10}{"from/s":>10}')
+
+    for into_name, from_name in ((JSON_INTO, JSON_FROM), (BINARY_INTO, BINARY_FROM)):
+        for memo in (False, True):
+            into, = get_serializers(into_name, Book, memo=memo)
+            from_, = get_serializers(from_name, Book, memo=memo)
+
+            raw = into(obj)
+            size_raw = len(raw) if isinstance(raw, bytes) else len(json.dumps(raw))
+
+            took_into = measure(lambda x: into(x), obj, repeat)
+            took_from = measure(lambda x: from_(x), raw, repeat)
+
+            print(f'{into_name:<12}{str(memo):>6}{size_raw:>12}{size / took_into:>10.0f}{size / took_from:>10.0f}')
+
+
+def parser():
+    parser = ArgumentParser()
+    parser.add_argument('--size', type=int, default=20000)
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--customers', type=int, default=100)
+    return parser
+
+
+if __name__ == '__main__':
+    main(**vars(parser().parse_args()))
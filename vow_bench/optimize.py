@@ -0,0 +1,50 @@
+"""
+packets/s through the hand-built `Packet` graphs of `vow.rpc.wire`, as walked and after `vow.marsh.optimizer`:
+
+    python -m vow_bench.optimize [--size 100000]
+"""
+import sys
+from argparse import ArgumentParser
+
+from vow.marsh.base import walk
+from vow.marsh.decl import get_serializers
+from vow.marsh.impl.binary import BINARY_INTO, BINARY_FROM
+from vow.marsh.impl.json import JSON_INTO, JSON_FROM
+from vow.rpc.wire import Packet, Request
+from vow_bench.slots import measure
+
+
+def main(size: int, repeat: int):
+    pkts = [Packet(str(i), Request('method', {'i': i})) for i in range(size)]
+
+    print(f'python {sys.version.split()[0]}, {size} packets')
+    print(f'{"mode":<24}{"mappers":>10}{"packets/s":>12}{"optimized":>10}{"packets/s":>12}')
+
+    for compiled in (False, True):
+        for name, source in ((JSON_INTO, None), (JSON_FROM, JSON_INTO), (BINARY_INTO, None), (BINARY_FROM, BINARY_INTO)):
+            if source is None:
+                objs = pkts
+            else:
+                into, = get_serializers(source, Packet)
+                objs = [into(x) for x in pkts]
+
+            row = f'{name}{" compiled" if compiled else "":<15}'
+
+            for optimize in (False, True):
+                mapper, = get_serializers(name, Packet, compiled=compiled, optimize=optimize)
+                took = measure(lambda xs: [mapper(x) for x in xs], objs, repeat)
+                mappers = len(walk(get_serializers(name, Packet, optimize=optimize)[0]))
+                row += f'{mappers:>10}{size / took:>12.0f}'
+
+            print(row)
+
+
+def parser():
+    parser = ArgumentParser()
+    parser.add_argument('--size', type=int, default=100000)
+    parser.add_argument('--repeat', type=int, default=3)
+    return parser
+
+
+if __name__ == '__main__':
+    main(**vars(parser().parse_args()))
@@ -0,0 +1,69 @@
+"""
+objects/s of mapping a large list of nested dataclasses with `serialize_many` in this process, against a
+`ParallelMapper` of an increasing number of processes:
+
+    python -m vow_bench.pool [--size 200000] [--processes 4]
+"""
+import os
+import sys
+import time
+from argparse import ArgumentParser
+from typing import Optional
+
+from vow.marsh.decl import get_serializers
+from vow.marsh.impl.binary import BINARY_INTO, BINARY_FROM
+from vow.marsh.impl.json import JSON_INTO, JSON_FROM
+from vow.marsh.pool import ParallelMapper
+from vow_bench.slots import Shape, Point, measure
+
+
+def main(size: int, repeat: int, processes: Optional[int], chunksize: int):
+    processes = processes or os.cpu_count() or 1
+
+    objs = [
+        Shape(f'shape{i}', [Point(i, j, f'p{j}') for j in range(3)], Point(0, 0, 'o') if i % 2 else None)
+        for i in range(size)
+    ]
+
+    print(f'python {sys.version.split()[0]}, {size} shapes, {os.cpu_count()} cpus, chunks of {chunksize}')
+    print(f'{"mode":<12}{"processes":>10}{"shapes/s":>12}{"startup ms":>12}')
+
+    for name, source in ((JSON_INTO, None), (JSON_FROM, JSON_INTO), (BINARY_INTO, None), (BINARY_FROM, BINARY_INTO)):
+        if source is None:
+            items = objs
+        else:
+            into, = get_serializers(source, Shape)
+            items = into.serialize_many(objs)
+
+        mapper, = get_serializers(name, Shape)
+        took = measure(mapper.serialize_many, items, repeat)
+        print(f'{name:<12}{"-":>10}{size / took:>12.0f}{"-":>12}')
+
+        n = 1
+
+        while n <= processes:
+            started = time.perf_counter()
+
+            with ParallelMapper(name, Shape, processes=n, chunksize=chunksize) as pool:
+                # the workers are started, and build their mappers, on the first chunk
+                pool.serialize_many(items[:n])
+                startup = time.perf_counter() - started
+
+                took = measure(pool.serialize_many, items, repeat)
+
+            print(f'{name:<12}{n:>10}{size / took:>12.0f}{startup * 1000:>12.0f}')
+
+            n *= 2
+
+
+def parser():
+    parser = ArgumentParser()
+    parser.add_argument('--size', type=int, default=200000)
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--processes', type=int, default=None)
+    parser.add_argument('--chunksize', type=int, default=1024)
+    return parser
+
+
+if __name__ == '__main__':
+    main(**vars(parser().parse_args()))
@@ -0,0 +1,161 @@
+"""
+memory and throughput of the mapper runtime over a 100k element list of nested dataclasses
+
+compares the field protocol (struct mappers calling the field item mappers directly) against the
+`FieldValue` protocol every struct mapper used before:
+
+    python -m vow_bench.slots [--size 100000]
+"""
+import gc
+import sys
+import time
+import tracemalloc
+from argparse import ArgumentParser
+from typing import List, Optional, Callable, Any, Tuple
+
+from dataclasses import dataclass
+
+from vow.marsh.base import Mapper, walk
+from vow.marsh.decl import infer
+from vow.marsh.impl.any import AnyAnyFieldMapper
+from vow.marsh.impl.any_into import AnyIntoStructMapper
+from vow.marsh.impl.binary import BINARY_INTO, BINARY_FROM
+from vow.marsh.impl.json import JSON_INTO, JSON_FROM
+from vow.marsh.walker import Walker
+
+
+@infer(JSON_INTO, JSON_FROM, BINARY_INTO, BINARY_FROM)
+@dataclass
+class Point:
+    x: int
+    y: int
+    label: str
+
+
+@infer(JSON_INTO, JSON_FROM, BINARY_INTO, BINARY_FROM)
+@dataclass
+class Shape:
+    name: str
+    points: List[Point]
+    origin: Optional[Point] = None
+
+
+class FieldValueMapper(AnyAnyFieldMapper):
+    """a field mapper the struct mappers do not recognise, so they fall back to `FieldValue`"""
+    __slots__ = ()
+
+
+def sizeof(mappers: List[Mapper]) -> Tuple[int, int]:
+    """bytes taken by the mapper instances themselves, and by the same instances backed by a `__dict__`"""
+    slotted = 0
+    plain = 0
+
+    for x in mappers:
+        attrs = {k: getattr(x, k) for cls in type(x).__mro__ for k in getattr(cls, '__slots__', ())}
+
+        y = Plain()
+        y.__dict__.update(attrs)
+
+        slotted += sys.getsizeof(x)
+        plain += sys.getsizeof(y) + sys.getsizeof(y.__dict__)
+
+    return slotted, plain
+
+
+class Plain:
+    pass
+
+
+def build(name: str, legacy: bool = False) -> Tuple[Mapper, List[Mapper]]:
+    walker = Walker(name)
+    mapper, = walker.mappers(walker.resolve(List[Shape]))
+
+    mappers = walk(mapper)
+
+    if legacy:
+        for x in mappers:
+            if type(x) is AnyAnyFieldMapper:
+                x.__class__ = FieldValueMapper
+            elif isinstance(x, AnyIntoStructMapper):
+                x._fields = None
+
+    return mapper, mappers
+
+
+def measure(fn: Callable[[Any], Any], obj: Any, repeat: int) -> float:
+    best = None
+
+    for _ in range(repeat):
+        gc.collect()
+        started = time.perf_counter()
+        fn(obj)
+        took = time.perf_counter() - started
+        best = took if best is None else min(best, took)
+
+    return best
+
+
+def allocations(fn: Callable[[Any], Any], objs: List[Any]) -> Tuple[float, float]:
+    """
+    blocks and bytes allocated per call of `fn` over all of `objs`, of those still in use once it returns, e.g. by its
+    result; the results are kept until every call returned
+    """
+    results = [None] * len(objs)
+
+    gc.collect()
+    gc.disable()
+    tracemalloc.start()
+    try:
+        blocks = len(tracemalloc.take_snapshot().traces)
+        size, _ = tracemalloc.get_traced_memory()
+
+        for i, x in enumerate(objs):
+            results[i] = fn(x)
+
+        current, _ = tracemalloc.get_traced_memory()
+        blocks = len(tracemalloc.take_snapshot().traces) - blocks
+    finally:
+        tracemalloc.stop()
+        gc.enable()
+
+    return blocks / len(objs), (current - size) / len(objs)
+
+
+def main(size: int, repeat: int):
+    objs = [
+        Shape(f'shape{i}', [Point(i, j, f'p{j}') for j in range(3)], Point(0, 0, 'o') if i % 2 else None)
+        for i in range(size)
+    ]
+
+    into, _ = build(JSON_INTO)
+    raw = into(objs)
+
+    print(f'python {sys.version.split()[0]}, {size} shapes')
+
+    for name in (JSON_INTO, JSON_FROM):
+        _, mappers = build(name)
+        slotted, plain = sizeof(mappers)
+        print(f'{name}: {len(mappers)} mappers, {slotted} B slotted, {plain} B if backed by a __dict__')
+
+    print(f'{"mode":<24}{"shapes/s":>12}{"B/shape":>12}{"blocks/shape":>14}')
+
+    for name, obj in ((JSON_INTO, objs), (JSON_FROM, raw)):
+        for legacy in (True, False):
+            mapper, _ = build(name, legacy)
+            took = measure(mapper, obj, repeat)
+            blocks, alloc = allocations(mapper, [obj[i:i + 1] for i in range(min(size, 1000))])
+
+            mode = f'{name} {"FieldValue" if legacy else "fields"}'
+
+            print(f'{mode:<24}{size / took:>12.0f}{alloc:>12.0f}{blocks:>14.1f}')
+
+
+def parser():
+    parser = ArgumentParser()
+    parser.add_argument('--size', type=int, default=100000)
+    parser.add_argument('--repeat', type=int, default=3)
+    return parser
+
+
+if __name__ == '__main__':
+    main(**vars(parser().parse_args()))
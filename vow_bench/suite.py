@@ -0,0 +1,245 @@
+"""
+every codec of `vow.marsh` over a fixed set of cases, reporting ops/s, ns per field, and the bytes and blocks each op
+leaves allocated, see `vow_bench.slots.allocations`;
+results are saved as JSON, and compared against a saved run to find regressions:
+
+    python -m vow_bench.suite [--size 10000] [--case nested] [--compiled] [--save new.json] [--compare old.json]
+
+the exit code is 1 if any case got slower than `--threshold` of the compared run
+"""
+import json
+import platform
+import sys
+import time
+from argparse import ArgumentParser
+from datetime import datetime, timedelta
+from enum import Enum
+from typing import List, Optional, Dict, Any, Callable, Tuple
+
+import pytz
+from dataclasses import dataclass, fields, is_dataclass
+
+from vow.marsh.base import Mapper
+from vow.marsh.decl import infer, get_serializers
+from vow.marsh.impl.binary import BINARY_INTO, BINARY_FROM
+from vow.marsh.impl.binary_from import BinaryFromVarInt, BinaryFromBlob
+from vow.marsh.impl.binary_into import BinaryIntoVarInt, BinaryIntoBlob
+from vow.marsh.impl.json import JSON_INTO, JSON_FROM
+from vow.rpc.wire import Packet, Request
+from vow_bench.slots import Shape, Point, measure, allocations
+
+NAMES = JSON_INTO, JSON_FROM, BINARY_INTO, BINARY_FROM
+
+
+@infer(*NAMES)
+@dataclass
+class Flat:
+    id: int
+    name: str
+    score: float
+    ok: bool
+
+
+@infer(*NAMES)
+@dataclass
+class Sparse:
+    a: Optional[int]
+    b: Optional[str]
+    c: Optional[Point] = None
+
+
+class Kind(Enum):
+    Small = 'small'
+    Large = 'large'
+
+
+@infer(*NAMES)
+@dataclass
+class Stamp:
+    kind: Kind
+    at: datetime
+    took: timedelta
+
+
+@infer(*NAMES)
+@dataclass
+class Node:
+    value: int
+    child: 'Branch'
+
+
+@infer(*NAMES)
+@dataclass
+class Branch:
+    node: Optional[Node] = None
+
+
+def chain(i: int, depth: int) -> Node:
+    r = Node(i, Branch())
+
+    for j in range(depth - 1):
+        r = Node(j, Branch(r))
+
+    return r
+
+
+@dataclass
+class Case:
+    """`objs` builds the inputs of the `into` mappers, the `from` mappers are given what the `into` mappers returned"""
+    name: str
+    type: Any
+    objs: Callable[[int], List[Any]]
+    names: Tuple[str, ...] = NAMES
+    # name -> mapper, for the cases that are not built by `get_serializers`
+    mappers: Optional[Callable[[], Dict[str, Mapper]]] = None
+
+
+def packet_mappers() -> Dict[str, Mapper]:
+    from vow.impl.proxy import PACKET_MAPPER_INTO, PACKET_MAPPER_FROM
+
+    return {BINARY_INTO: PACKET_MAPPER_INTO, BINARY_FROM: PACKET_MAPPER_FROM}
+
+
+CASES = [
+    Case('flat', Flat, lambda n: [Flat(i, f'name{i}', i / 3, bool(i % 2)) for i in range(n)]),
+    Case('nested', Shape, lambda n: [
+        Shape(f'shape{i}', [Point(i, j, f'p{j}') for j in range(3)], Point(0, 0, 'o') if i % 2 else None)
+        for i in range(n)
+    ]),
+    Case('list', List[Point], lambda n: [[Point(i, j, f'p{j}') for j in range(10)] for i in range(n)]),
+    Case('dict', Dict[str, Point], lambda n: [{f'k{j}': Point(i, j, f'p{j}') for j in range(10)} for i in range(n)]),
+    Case('optional', Sparse, lambda n: [
+        Sparse(i, None, Point(i, i, 'c')) if i % 2 else Sparse(None, f's{i}') for i in range(n)
+    ]),
+    Case('enum_datetime', Stamp, lambda n: [
+        Stamp(Kind.Large if i % 2 else Kind.Small, datetime(2019, 1, 2, 3, 4, 5, i, tzinfo=pytz.utc),
+              timedelta(seconds=i))
+        for i in range(n)
+    ]),
+    Case('recursive', Node, lambda n: [chain(i, 5) for i in range(n)]),
+    Case('packet', Packet, lambda n: [Packet(str(i), Request('method', {'i': i})) for i in range(n)],
+         (BINARY_INTO, BINARY_FROM), packet_mappers),
+    Case('varint', int, lambda n: [i * 1031 for i in range(n)], (BINARY_INTO, BINARY_FROM), lambda: {
+        BINARY_INTO: BinaryIntoVarInt().create({}),
+        BINARY_FROM: BinaryFromVarInt().create({}),
+    }),
+    Case('blob', bytes, lambda n: [bytes(range(i % 64)) * 4 for i in range(n)], (BINARY_INTO, BINARY_FROM), lambda: {
+        BINARY_INTO: BinaryIntoBlob().create({'size': BinaryIntoVarInt().create({})}),
+        BINARY_FROM: BinaryFromBlob().create({'size': BinaryFromVarInt().create({})}),
+    }),
+]
+
+
+def count_fields(obj: Any) -> int:
+    """scalar values reached from `obj`"""
+    if is_dataclass(obj):
+        return sum(count_fields(getattr(obj, x.name)) for x in fields(obj))
+    elif isinstance(obj, (list, tuple)):
+        return sum(count_fields(x) for x in obj)
+    elif isinstance(obj, dict):
+        return sum(1 + count_fields(x) for x in obj.values())
+    else:
+        return 1
+
+
+def run(case: Case, size: int, repeat: int, compiled: bool) -> Dict[str, Dict[str, float]]:
+    objs = case.objs(size)
+    per_op = sum(count_fields(x) for x in objs) / size
+
+    if case.mappers:
+        mappers = case.mappers()
+    else:
+        mappers = {x: get_serializers(x, case.type, compiled=compiled)[0] for x in case.names}
+
+    r = {}
+    encoded = None
+
+    for name in case.names:
+        mapper = mappers[name]
+        inputs = objs if name in (JSON_INTO, BINARY_INTO) else encoded
+
+        took = measure(lambda xs: [mapper(x) for x in xs], inputs, repeat)
+        blocks, alloc = allocations(mapper, inputs[:1000])
+
+        r[f'{case.name}.{name}'] = {
+            'ops': size / took,
+            'ns_field': took / size / per_op * 1e9,
+            'alloc': alloc,
+            'blocks': blocks,
+        }
+
+        if name in (JSON_INTO, BINARY_INTO):
+            encoded = [mapper(x) for x in objs]
+
+    return r
+
+
+def compare(results: Dict[str, Dict[str, float]], baseline: Dict[str, Dict[str, float]], threshold: float) -> int:
+    """prints the ops/s of `results` relative to `baseline`, returns the number of regressions"""
+    r = 0
+
+    print(f'{"case":<28}{"ops/s":>12}{"baseline":>12}{"ratio":>8}')
+
+    for k, v in results.items():
+        if k not in baseline:
+            continue
+
+        ratio = v['ops'] / baseline[k]['ops']
+        regressed = ratio < 1 - threshold
+        r += regressed
+
+        print(f'{k:<28}{v["ops"]:>12.0f}{baseline[k]["ops"]:>12.0f}{ratio:>8.2f}{"  REGRESSION" if regressed else ""}')
+
+    return r
+
+
+def main(size: int, repeat: int, case: List[str], compiled: bool, save: Optional[str], compare_to: Optional[str],
+         threshold: float) -> int:
+    print(f'python {sys.version.split()[0]}, {size} ops per case{", compiled" if compiled else ""}')
+    print(f'{"case":<28}{"ops/s":>12}{"ns/field":>10}{"B/op":>10}{"blocks/op":>11}')
+
+    results = {}
+
+    for x in CASES:
+        if case and x.name not in case:
+            continue
+
+        for k, v in run(x, size, repeat, compiled).items():
+            print(f'{k:<28}{v["ops"]:>12.0f}{v["ns_field"]:>10.1f}{v["alloc"]:>10.0f}{v["blocks"]:>11.1f}')
+            results[k] = v
+
+    if save:
+        with open(save, 'w') as f:
+            json.dump({
+                'python': sys.version.split()[0],
+                'platform': platform.platform(),
+                'at': time.time(),
+                'size': size,
+                'compiled': compiled,
+                'results': results,
+            }, f, indent=2, sort_keys=True)
+
+    if compare_to:
+        with open(compare_to) as f:
+            baseline = json.load(f)['results']
+
+        print()
+        return int(compare(results, baseline, threshold) > 0)
+
+    return 0
+
+
+def parser():
+    parser = ArgumentParser()
+    parser.add_argument('--size', type=int, default=10000)
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--case', action='append', default=[], choices=[x.name for x in CASES])
+    parser.add_argument('--compiled', action='store_true')
+    parser.add_argument('--save', default=None)
+    parser.add_argument('--compare', dest='compare_to', default=None)
+    parser.add_argument('--threshold', type=float, default=0.1)
+    return parser
+
+
+if __name__ == '__main__':
+    sys.exit(main(**vars(parser().parse_args())))
@@ -0,0 +1,78 @@
+"""
+a union of many dataclasses, written with the tag next to the member, through `vow.marsh.impl.union` and through the
+`AnyAnyLookup` and `AnyAnyDiscriminant` graph `vow.rpc.wire` used to build by hand:
+
+    python -m vow_bench.union [--size 20000] [--types 80]
+"""
+import sys
+from argparse import ArgumentParser
+from typing import List, Type
+
+from dataclasses import make_dataclass
+
+from vow.marsh.decl import infer
+from vow.marsh.impl.any import AnyAnyField, AnyAnyLookup, AnyAnyAttr, This, AnyAnyDiscriminant, Ref, AnyAnyItem
+from vow.marsh.impl.any_into import AnyIntoStruct
+from vow.marsh.impl.json import JSON_INTO, JSON_FROM
+from vow.marsh.impl.union import Tagged
+from vow.marsh.walker import Walker
+from vow_bench.slots import measure
+
+
+def schema(types: int) -> List[Type]:
+    return [
+        infer(JSON_INTO, JSON_FROM)(make_dataclass(f'Message{i}', [('id', int), ('name', str)]))
+        for i in range(types)
+    ]
+
+
+def main(size: int, repeat: int, types: int):
+    clss = schema(types)
+    tags = tuple(f'message{i}' for i in range(types))
+
+    objs = [clss[i % types](i, f'name{i}') for i in range(size)]
+
+    union = Tagged(tuple(clss), tags=tags, content='body')
+
+    into_union, = Walker(None).mappers(Walker(JSON_INTO).resolve(union))
+    from_union, = Walker(None).mappers(Walker(JSON_FROM).resolve(union))
+
+    into_graph, = Walker(None).mappers(AnyIntoStruct([
+        AnyAnyField('type', AnyAnyLookup(AnyAnyAttr('__class__', This()), dict(zip(clss, tags)))),
+        AnyAnyField('body', AnyAnyDiscriminant(
+            AnyAnyAttr('__class__', This()),
+            This(),
+            [(x, Ref(JSON_INTO, x)) for x in clss],
+        )),
+    ]))
+    from_graph, = Walker(None).mappers(AnyAnyDiscriminant(
+        AnyAnyItem('type', This()),
+        AnyAnyItem('body', This()),
+        [(y, Ref(JSON_FROM, x)) for x, y in zip(clss, tags)],
+    ))
+
+    encoded = [into_union(x) for x in objs]
+
+    assert encoded == [into_graph(x) for x in objs]
+    assert [from_union(x) for x in encoded] == [from_graph(x) for x in encoded] == objs
+
+    print(f'python {sys.version.split()[0]}, {types} types, {size} objects')
+    print(f'{"mode":<12}{"union":>12}{"graph":>12}')
+
+    for name, a, b, items in ((JSON_INTO, into_union, into_graph, objs), (JSON_FROM, from_union, from_graph, encoded)):
+        took_a = measure(lambda xs: [a(x) for x in xs], items, repeat)
+        took_b = measure(lambda xs: [b(x) for x in xs], items, repeat)
+
+        print(f'{name:<12}{size / took_a:>12.0f}{size / took_b:>12.0f}')
+
+
+def parser():
+    parser = ArgumentParser()
+    parser.add_argument('--size', type=int, default=20000)
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--types', type=int, default=80)
+    return parser
+
+
+if __name__ == '__main__':
+    main(**vars(parser().parse_args()))
@@ -1,11 +1,13 @@
 import unittest
 
 from datetime import timedelta
+from enum import Enum
 from typing import Optional
 
 from dataclasses import dataclass
 
 from vow.marsh.error import SerializationError
+from vow.marsh.helper import lookup
 from xrpc.trace import trc
 
 from vow.marsh.walker import Walker
@@ -16,6 +18,11 @@ from vow.marsh.impl.json_from import JsonFromTimeDelta
 from vow.marsh.impl.any_into import AnyIntoStruct
 
 
+class Level(Enum):
+    Low = 1
+    High = 2
+
+
 @infer(JSON_INTO, JSON_FROM)
 @dataclass
 class Amber:
@@ -53,12 +60,12 @@ class TestApi(unittest.TestCase):
             b: A
 
         self.assertEqual(
-            Ref(JSON_INTO, __name__ + '.A'),
+            Ref(JSON_INTO, f'{__name__}.{A.__qualname__}'),
             Walker(JSON_INTO).resolve(A)
         )
 
         self.assertEqual(
-            Ref(JSON_INTO, __name__ + '.B'),
+            Ref(JSON_INTO, f'{__name__}.{B.__qualname__}'),
             Walker(JSON_INTO).resolve(B),
         )
 
@@ -72,7 +79,7 @@ class TestApi(unittest.TestCase):
         self.assertEqual(
             AnyIntoStruct([
                 AnyAnyField('a', AnyAnyAttr('a', This(int))),
-                AnyAnyField('b', AnyAnyAttr('b', Ref(JSON_INTO, __name__ + '.A'))),
+                AnyAnyField('b', AnyAnyAttr('b', Ref(JSON_INTO, f'{__name__}.{A.__qualname__}'))),
             ], B),
             B.__serde__[JSON_INTO],
         )
@@ -92,7 +99,7 @@ class TestApi(unittest.TestCase):
         self.assertEqual(
             AnyIntoStruct([
                 AnyAnyField('a', AnyAnyAttr('a', This(int))),
-                AnyAnyField('b', AnyAnyAttr('b', Ref(JSON_INTO, __name__ + '.B'))),
+                AnyAnyField('b', AnyAnyAttr('b', Ref(JSON_INTO, f'{__name__}.{B.__qualname__}'))),
             ], A),
             A.__serde__[JSON_INTO],
         )
@@ -152,3 +159,101 @@ class TestApi(unittest.TestCase):
             )
         except SerializationError as e:
             self.assertEqual(['0', 'a', '$item'], e.path)
+
+    def test_mapper_path_nested(self):
+        ctx = Walker(JSON_FROM)
+        fac = ctx.resolve(Amber)
+        mapper, = ctx.mappers(fac)
+
+        with self.assertRaises(SerializationError) as e:
+            mapper.serialize({'a': 1, 'b': {'b': {'a': 2, 'b': {'b': {'a': 'x'}}}}})
+
+        self.assertEqual(
+            ['1', 'b', '$item', '0', 'b', '$item', '1', 'b', '$item', '0', 'b', '$item', '0', 'a', '$item'],
+            e.exception.path
+        )
+
+    def test_mapper_enum(self):
+        @infer(JSON_INTO, JSON_FROM)
+        @dataclass
+        class A:
+            a: Level
+
+        into, = Walker(JSON_INTO).mappers(Walker(JSON_INTO).resolve(A))
+        from_, = Walker(JSON_FROM).mappers(Walker(JSON_FROM).resolve(A))
+
+        self.assertEqual({'a': 2}, into.serialize(A(Level.High)))
+        self.assertEqual(A(Level.High), from_.serialize({'a': 2}))
+
+        with self.assertRaises(SerializationError) as e:
+            into.serialize(A(2))
+
+        self.assertEqual('enum_not_enum', e.exception.reason)
+
+    def test_resolve_local(self):
+        @infer(JSON_INTO)
+        @dataclass
+        class A:
+            a: int
+
+        @infer(JSON_INTO)
+        @dataclass
+        class B:
+            a: int
+            b: A
+
+        mapper, = Walker(JSON_INTO).mappers(Walker(JSON_INTO).resolve(B))
+
+        self.assertEqual({'a': 1, 'b': {'a': 2}}, mapper.serialize(B(1, A(2))))
+
+    def test_resolve_local_same_name(self):
+        def first():
+            @infer(JSON_INTO)
+            @dataclass
+            class A:
+                x: int
+
+            return A
+
+        def second():
+            @infer(JSON_INTO)
+            @dataclass
+            class A:
+                y: str
+
+            return A
+
+        A1, A2 = first(), second()
+
+        @infer(JSON_INTO)
+        @dataclass
+        class B:
+            a1: A1
+            a2: A2
+
+        def third():
+            @infer(JSON_INTO)
+            @dataclass
+            class A:
+                z: bool
+
+            return A
+
+        # the same `__qualname__` in different calls of a function
+        A3, A4 = third(), third()
+
+        @infer(JSON_INTO)
+        @dataclass
+        class C:
+            a3: A3
+            a4: A4
+
+        mapper, = Walker(JSON_INTO).mappers(Walker(JSON_INTO).resolve(B))
+
+        self.assertEqual({'a1': {'x': 1}, 'a2': {'y': 'b'}}, mapper.serialize(B(A1(1), A2('b'))))
+
+        mapper, = Walker(JSON_INTO).mappers(Walker(JSON_INTO).resolve(C))
+
+        self.assertEqual({'a3': {'z': True}, 'a4': {'z': False}}, mapper.serialize(C(A3(True), A4(False))))
+
+        self.assertIs(B, lookup(Ref(JSON_INTO, B).full_name))
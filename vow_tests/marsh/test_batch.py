@@ -0,0 +1,150 @@
+import unittest
+from datetime import datetime, timedelta
+from typing import List, Optional
+
+import pytz
+from dataclasses import dataclass
+
+from vow.marsh.base import Mapper, batch
+from vow.marsh.decl import infer, get_serializers
+from vow.marsh.impl.any import This
+from vow.marsh.impl.json import JSON_FROM, JSON_INTO
+from vow_tests.marsh.test_api import Amber, Bulky
+from vow.marsh.memo import MemoMapper
+from vow.marsh.walker import Walker
+from vow_tests.marsh.test_compile import Crate, catch
+
+
+@infer(JSON_INTO, JSON_FROM)
+@dataclass
+class Batch:
+    crates: List[Crate]
+    ambers: Optional[List[Optional[Amber]]] = None
+
+
+@infer(JSON_INTO)
+@dataclass
+class Probe:
+    a: int
+
+
+class Broken(Probe):
+    reads = 0
+
+    @property
+    def a(self):
+        Broken.reads += 1
+        raise RuntimeError('broken')
+
+
+class Counted(Mapper):
+    """counts the batches"""
+
+    def __init__(self):
+        self.batches = 0
+        super().__init__({})
+
+    def serialize(self, obj):
+        return obj
+
+    @batch
+    def serialize_many(self, objs):
+        self.batches += 1
+        return list(objs)
+
+
+class Items(Mapper):
+    def serialize(self, obj):
+        return self.dependencies['value'].serialize_many(obj)
+
+
+class Seconds:
+    def __init__(self, seconds):
+        self.seconds = seconds
+
+    def total_seconds(self):
+        return self.seconds
+
+
+def crate(i: int) -> Crate:
+    return Crate(
+        f'c{i}',
+        datetime(2019, 1, 2, 3, 4, 5, i, tzinfo=pytz.utc),
+        timedelta(seconds=i),
+        list(range(i)),
+        {'a': i / 2},
+        Amber(i, Bulky()) if i % 2 else None,
+    )
+
+
+class TestBatch(unittest.TestCase):
+    def assertSame(self, name, cls, objs):
+        mapper, = get_serializers(name, cls)
+
+        def one_by_one(objs):
+            r = []
+            for i, x in enumerate(objs):
+                try:
+                    r.append(mapper.serialize(x))
+                except Exception as e:
+                    if hasattr(e, 'prepend_path'):
+                        e.prepend_path(i)
+                    raise
+            return r
+
+        self.assertEqual(catch(one_by_one, objs), catch(mapper.serialize_many, objs))
+
+    def test_roundtrip(self):
+        objs = [Batch([crate(i) for i in range(j)], [Amber(j, Bulky()), None]) for j in range(4)]
+
+        into, = get_serializers(JSON_INTO, Batch)
+        from_, = get_serializers(JSON_FROM, Batch)
+
+        raw = into.serialize_many(objs)
+
+        self.assertEqual([into(x) for x in objs], raw)
+        self.assertEqual(objs, from_.serialize_many(raw))
+        self.assertEqual(objs, from_.serialize_many(iter(raw)))
+
+        self.assertSame(JSON_INTO, Batch, objs)
+        self.assertSame(JSON_FROM, Batch, raw)
+
+    def test_errors(self):
+        objs = [crate(i) for i in range(3)]
+
+        into, = get_serializers(JSON_INTO, Crate)
+        raw = into.serialize_many(objs)
+
+        self.assertSame(JSON_INTO, Crate, objs + [Amber(1, Bulky())])
+        self.assertSame(JSON_INTO, Crate, objs[:1] + [Crate('x', None, timedelta(), [], {})])
+        self.assertSame(JSON_FROM, Crate, raw + [dict(raw[0], items=[1, 'b'])])
+        self.assertSame(JSON_FROM, Crate, raw + [dict(raw[1], at='yesterday')])
+        self.assertSame(JSON_FROM, Crate, [raw[0], {}])
+        self.assertSame(JSON_FROM, List[Crate], [raw, [raw[0], None]])
+        # anything with `total_seconds` is not a timedelta
+        self.assertSame(JSON_INTO, timedelta, [timedelta(1), Seconds(2)])
+
+    def test_unexpected(self):
+        mapper, = get_serializers(JSON_INTO, Probe)
+
+        # only input errors are serialized again
+        with self.assertRaises(RuntimeError):
+            mapper.serialize_many([Probe(1), Broken.__new__(Broken)])
+
+        self.assertEqual(1, Broken.reads)
+
+        def strict(x):
+            if x < 0:
+                raise RuntimeError('negative')
+            return x
+
+        mapper, = Walker(None).mappers(This(strict))
+
+        self.assertEqual(([1], 'unmappable'), catch(mapper.serialize_many, [1, -1]))
+
+    def test_one_by_one(self):
+        counted = Counted()
+
+        self.assertEqual([1, 2], counted.serialize_many([1, 2]))
+        self.assertEqual([1, 2], MemoMapper({'child': Items({'value': counted})}).serialize([1, 2]))
+        self.assertEqual(1, counted.batches)
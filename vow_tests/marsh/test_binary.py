@@ -0,0 +1,126 @@
+import unittest
+from datetime import datetime, timedelta
+from enum import Enum
+from typing import List, Optional, Dict
+
+import pytz
+from dataclasses import dataclass
+
+from vow.marsh.decl import infer, get_serializers
+from vow.marsh.error import SerializationError, BUFFER_NEEDED
+from vow.marsh.impl.binary import BINARY_INTO, BINARY_FROM, BinaryNext
+from vow.marsh.impl.binary_from import BinaryFromZigZag, BinaryFromVarInt
+from vow.marsh.impl.binary_into import BinaryIntoZigZag, BinaryIntoVarInt
+from vow.marsh.impl.json import JSON_INTO, JSON_FROM
+from vow.marsh.walker import Walker
+
+
+class Kind(Enum):
+    Small = 'small'
+    Large = 'large'
+
+
+@infer(JSON_INTO, JSON_FROM, BINARY_INTO, BINARY_FROM)
+@dataclass
+class Leaf:
+    id: int
+    name: str
+
+
+@infer(JSON_INTO, JSON_FROM, BINARY_INTO, BINARY_FROM)
+@dataclass
+class Tree:
+    id: int
+    weight: float
+    flag: bool
+    raw: bytes
+    kind: Kind
+    at: datetime
+    took: timedelta
+    leaves: List[Leaf]
+    tags: Dict[str, int]
+    parent: Optional[Leaf] = None
+
+
+def tree(i: int) -> Tree:
+    return Tree(
+        -i, i / 3, bool(i % 2), bytes(range(i % 7)), Kind.Large if i % 3 else Kind.Small,
+        datetime(2019, 1, 2, 3, 4, 5, i, tzinfo=pytz.utc), timedelta(seconds=-i),
+        [Leaf(j, f'ł{j}') for j in range(i % 4)], {'a': i, 'b': -i},
+        Leaf(i, 'p') if i % 2 else None,
+    )
+
+
+class TestBinary(unittest.TestCase):
+    def test_zigzag(self):
+        into = BinaryIntoZigZag().create({'value': BinaryIntoVarInt().create({})})
+        from_ = BinaryFromZigZag().create({'value': BinaryFromVarInt().create({})})
+
+        for x, y in [(0, b'\x00'), (-1, b'\x01'), (1, b'\x02'), (-64, b'\x7f'), (64, b'\x80\x01')]:
+            self.assertEqual(y, into.serialize(x))
+            self.assertEqual(BinaryNext(x, b''), from_.serialize(y))
+
+        for x in [2 ** 70, -2 ** 70, 2 ** 31 - 1, -2 ** 31]:
+            self.assertEqual(BinaryNext(x, b''), from_.serialize(into.serialize(x)))
+
+    def test_roundtrip(self):
+        into, = get_serializers(BINARY_INTO, List[Tree])
+        from_, = get_serializers(BINARY_FROM, List[Tree])
+
+        objs = [tree(i) for i in range(20)]
+
+        self.assertEqual(BinaryNext(objs, b'tail'), from_.serialize(into.serialize(objs) + b'tail'))
+
+    def test_layout(self):
+        into, = get_serializers(BINARY_INTO, Leaf)
+
+        self.assertEqual(b'\x03\x02ab', into.serialize(Leaf(-2, 'ab')))
+
+        into, = Walker(BINARY_INTO).mappers(Walker(BINARY_INTO).resolve(Optional[List[int]]))
+
+        self.assertEqual(b'\x00', into.serialize(None))
+        self.assertEqual(b'\x01\x02\x02\x01', into.serialize([1, -1]))
+
+    def test_smaller(self):
+        json_into, = get_serializers(JSON_INTO, List[Leaf])
+        into, = get_serializers(BINARY_INTO, List[Leaf])
+
+        objs = [Leaf(i, f'leaf{i}') for i in range(100)]
+
+        self.assertLess(len(into.serialize(objs)) * 3, len(str(json_into.serialize(objs))))
+
+    def test_errors(self):
+        into, = get_serializers(BINARY_INTO, Tree)
+        from_, = get_serializers(BINARY_FROM, Tree)
+
+        obj = tree(7)
+        obj.leaves[2].name = 5
+
+        with self.assertRaises(SerializationError) as e:
+            into.serialize(obj)
+
+        self.assertEqual(['7', 'leaves', '$attr', 2, '1', 'name', '$attr'], e.exception.path)
+        self.assertEqual('not_str', e.exception.reason)
+
+        raw = into.serialize(tree(7))
+
+        for i in range(len(raw)):
+            with self.assertRaises(SerializationError) as e:
+                from_.serialize(raw[:i])
+
+            self.assertEqual(BUFFER_NEEDED, e.exception.reason)
+
+        with self.assertRaises(SerializationError) as e:
+            from_.serialize(raw.replace(b'\x05large', b'\x05LARGE'))
+
+        self.assertEqual(['4', 'kind'], e.exception.path)
+        self.assertEqual('enum_value_invalid', e.exception.reason)
+
+    def test_compiled(self):
+        into, = get_serializers(BINARY_INTO, Tree, compiled=True)
+        from_, = get_serializers(BINARY_FROM, Tree, compiled=True)
+
+        obj = tree(7)
+
+        self.assertEqual(get_serializers(BINARY_INTO, Tree)[0].serialize(obj), into.serialize(obj))
+        self.assertEqual(obj, from_.serialize(into.serialize(obj)).val)
@@ -0,0 +1,103 @@
+import gc
+import unittest
+import weakref
+from typing import Optional, List
+
+from dataclasses import dataclass
+
+from vow.marsh.cache import Cache, RESOLVE_CACHE, MAPPER_CACHE, invalidate, is_stable
+from vow.marsh.decl import infer, get_serializers
+from vow.marsh.impl.json import JSON_FROM, JSON_INTO
+from vow.marsh.walker import Walker, Args, Return
+from vow_tests.marsh.test_api import Amber
+
+
+@infer(JSON_INTO, JSON_FROM)
+@dataclass
+class Cached:
+    a: int
+    b: Optional[List[Amber]] = None
+
+
+class TestCache(unittest.TestCase):
+    def test_lru(self):
+        cache = Cache(maxsize=2)
+
+        self.assertEqual(1, cache.get('a', lambda: 1))
+        self.assertEqual(2, cache.get('b', lambda: 2))
+        self.assertEqual(1, cache.get('a', lambda: 3))
+        self.assertEqual(4, cache.get('c', lambda: 4))
+
+        self.assertEqual(['a', 'c'], list(cache.items))
+        self.assertEqual((1, 3), (cache.hits, cache.misses))
+
+        self.assertEqual(5, cache.get(None, lambda: 5))
+        self.assertEqual(2, len(cache))
+
+        cache.resize(0)
+        self.assertEqual(0, len(cache))
+        self.assertEqual(6, cache.get('a', lambda: 6))
+        self.assertEqual(0, len(cache))
+
+    def test_stable(self):
+        self.assertTrue(is_stable(int))
+        self.assertTrue(is_stable(Optional[List[Amber]]))
+        self.assertTrue(is_stable(Args(print)))
+        self.assertFalse(is_stable('Amber'))
+        self.assertFalse(is_stable(List['Amber']))
+
+    def test_local(self):
+        @infer(JSON_INTO, JSON_FROM)
+        @dataclass
+        class Local:
+            a: int
+
+        def local(x: Local) -> Local:
+            pass
+
+        infer(JSON_INTO)(local)
+
+        self.assertFalse(is_stable(Local))
+        self.assertFalse(is_stable(local))
+        self.assertFalse(is_stable(self.test_local))
+
+        # generics such as `List[Local]` are left out, `typing` keeps them in its own cache
+        into, = get_serializers(JSON_INTO, Local)
+        reply, = get_serializers(JSON_INTO, Return(local))
+        Walker(JSON_FROM).resolve(Local)
+
+        self.assertEqual({'a': 1}, into(Local(1)))
+        self.assertEqual({'a': 2}, reply(Local(2)))
+
+        # the caches do not keep the class alive
+        refs = weakref.ref(Local), weakref.ref(local)
+        del Local, local, into, reply
+        gc.collect()
+
+        self.assertEqual((None, None), tuple(x() for x in refs))
+
+    def test_serializers(self):
+        a, = get_serializers(JSON_INTO, Cached)
+        b, = get_serializers(JSON_INTO, Cached)
+        c, = get_serializers(JSON_FROM, Cached)
+
+        self.assertIs(a, b)
+        self.assertIsNot(a, c)
+
+        self.assertIs(Walker(JSON_FROM).resolve(Optional[int]), Walker(JSON_FROM).resolve(Optional[int]))
+
+        self.assertEqual(2, MAPPER_CACHE.invalidate(Cached))
+
+        d, = get_serializers(JSON_INTO, Cached)
+
+        self.assertIsNot(a, d)
+        self.assertEqual({'a': 1, 'b': None}, d.serialize(Cached(1)))
+
+    def test_invalidate(self):
+        get_serializers(JSON_INTO, Cached)
+        Walker(JSON_INTO).resolve(List[Cached])
+
+        invalidate(Cached)
+
+        self.assertFalse(any(Cached in k[1] for k in MAPPER_CACHE.items))
+        self.assertNotIn((JSON_INTO, List[Cached]), RESOLVE_CACHE.items)
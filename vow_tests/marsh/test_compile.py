@@ -0,0 +1,117 @@
+import unittest
+from datetime import datetime, timedelta
+from typing import Optional, List, Dict
+
+import pytz
+from dataclasses import dataclass
+
+from vow.marsh.decl import infer, get_serializers
+from vow.marsh.error import SerializationError
+from vow.marsh.impl.binary import BINARY_INTO, BINARY_FROM
+from vow.marsh.impl.json import JSON_FROM, JSON_INTO
+from vow.rpc.wire import Packet, Service, Request, End
+from vow_tests.marsh.test_api import Amber, Bulky
+
+
+@infer(JSON_INTO, JSON_FROM)
+@dataclass
+class Crate:
+    name: str
+    at: datetime
+    took: timedelta
+    items: List[int]
+    tags: Dict[str, float]
+    amber: Optional[Amber] = None
+
+
+def catch(fn, *args):
+    try:
+        return fn(*args)
+    except SerializationError as e:
+        return e.path, e.reason
+    except Exception as e:
+        return e.__class__
+
+
+class TestCompile(unittest.TestCase):
+    def assertSame(self, name, cls, *objs):
+        interpreted, = get_serializers(name, cls)
+        compiled, = get_serializers(name, cls, compiled=True)
+
+        for obj in objs:
+            self.assertEqual(catch(interpreted, obj), catch(compiled, obj))
+
+    def test_recursive(self):
+        self.assertSame(
+            JSON_INTO,
+            Amber,
+            Amber(555, Bulky(Amber(5, Bulky()))),
+            Amber('asd', Bulky()),
+            Amber(5, Bulky(Amber(5, Bulky(Amber('x', Bulky()))))),
+            Bulky(),
+        )
+
+        self.assertSame(
+            JSON_FROM,
+            Amber,
+            {'a': 555, 'b': {'b': {'a': 6, 'b': {'b': None}}}},
+            {'a': 'asd', 'b': {'b': None}},
+            {'a': 5, 'b': {'b': {'a': 6, 'b': {}}}},
+            {'a': 5},
+            [],
+            None,
+        )
+
+    def test_struct(self):
+        crate = Crate(
+            'a',
+            datetime(2019, 1, 2, 3, 4, 5, 6, tzinfo=pytz.utc),
+            timedelta(seconds=5),
+            [1, 2, 3],
+            {'a': 0.5},
+            Amber(5, Bulky()),
+        )
+
+        into, = get_serializers(JSON_INTO, Crate, compiled=True)
+        from_, = get_serializers(JSON_FROM, Crate, compiled=True)
+
+        self.assertEqual(crate, from_(into(crate)))
+
+        self.assertSame(
+            JSON_FROM,
+            Crate,
+            into(crate),
+            dict(into(crate), items=[1, 'b']),
+            dict(into(crate), tags={'a': 'b'}),
+            dict(into(crate), at='yesterday'),
+        )
+
+    def test_packet(self):
+        pkts = [
+            Packet(None, Service('ratelimiter')),
+            Packet('1', Request('get', {'a': [1, 2]})),
+            Packet('2', End()),
+        ]
+
+        into_i, from_i = get_serializers(BINARY_INTO, Packet), get_serializers(BINARY_FROM, Packet)
+        into_c, from_c = get_serializers(BINARY_INTO, Packet, compiled=True), get_serializers(BINARY_FROM, Packet, compiled=True)
+
+        for pkt in pkts:
+            self.assertEqual(into_i[0](pkt), into_c[0](pkt))
+            self.assertEqual(pkt, from_i[0](into_i[0](pkt)).val)
+            self.assertEqual(pkt, from_c[0](into_c[0](pkt)).val)
+
+        self.assertSame(
+            JSON_FROM,
+            Packet,
+            {'type': 'service', 'stream': None, 'body': {'name': 'a'}},
+            {'type': 'unknown', 'stream': None, 'body': {'name': 'a'}},
+            {'type': 'request', 'stream': 5, 'body': {}},
+        )
+
+        self.assertSame(
+            JSON_INTO,
+            Packet,
+            *pkts,
+            Packet(None, 'abc'),
+        )
@@ -0,0 +1,66 @@
+import unittest
+from datetime import datetime, timedelta, timezone
+from typing import List
+
+import pytz
+
+from vow.marsh.base import Mapper
+from vow.marsh.decl import get_serializers
+from vow.marsh.impl.json import JSON_INTO, JSON_FROM
+from vow.marsh.impl.json_from import JsonFromDateTime, parse_iso8601
+from vow.marsh.impl.json_into import ISO8601, format_iso8601
+from vow.marsh.walker import Walker
+from vow_tests.marsh.test_compile import catch
+
+
+class TestDateTime(unittest.TestCase):
+    def test_format(self):
+        for x in [
+            datetime(2019, 1, 2, 3, 4, 5, 6),
+            datetime(2019, 1, 2, 3, 4, 5, tzinfo=pytz.utc),
+            datetime(2019, 1, 2, 3, 4, 5, 999999, tzinfo=timezone(timedelta(hours=5))),
+            datetime(999, 12, 31),
+            datetime(9999, 12, 31, 23, 59, 59, 999999),
+        ]:
+            self.assertEqual(format(x, ISO8601), format_iso8601(x))
+
+    def test_parse(self):
+        for x in [
+            '2019-01-02T03:04:05.000006Z',
+            '2019-01-02T03:04:05.6Z',
+            '2019-1-2T3:4:5.6Z',
+            '2019-01-02T03:04:05.00000xZ',
+            '2019-13-02T03:04:05.000006Z',
+            '2019-01-02 03:04:05.000006Z',
+            '2019-01-02T03:04:05.000006',
+            '2020-01-01T00:00:00.000-01Z',
+            '2020-01-01T00:00:00.00000ZZ',
+            '2020-01-01T00:00:00.00000\u0661Z',
+            '',
+            5,
+        ]:
+            self.assertEqual(
+                catch(lambda x: datetime.strptime(x, ISO8601).replace(tzinfo=pytz.utc), x),
+                catch(parse_iso8601, x),
+            )
+
+        self.assertIs(pytz.utc, parse_iso8601('2019-01-02T03:04:05.000006Z').tzinfo)
+
+    def test_mappers(self):
+        into, = get_serializers(JSON_INTO, List[datetime])
+        from_, = get_serializers(JSON_FROM, List[datetime])
+        cached, = Walker(None).mappers(JsonFromDateTime(cache=16))
+
+        xs = [datetime(2019, 1, 2, 3, 4, 5, i, tzinfo=pytz.utc) for i in range(10)]
+        raw = into(xs)
+
+        self.assertEqual([format(x, ISO8601) for x in xs], raw)
+        self.assertEqual(xs, from_(raw))
+        self.assertEqual(xs, Mapper.serialize_many(from_.dependencies['value'], raw))
+        self.assertEqual(xs * 2, cached.serialize_many(raw * 2))
+        self.assertEqual(([], "strptime() argument 1 must be str, not list"), catch(cached, []))
+        self.assertEqual(([1], "time data 'x' does not match format '%Y-%m-%dT%H:%M:%S.%fZ'"), catch(from_, [raw[0], 'x']))
+
+        custom, = Walker(None).mappers(JsonFromDateTime('%Y'))
+
+        self.assertEqual(datetime(2019, 1, 1, tzinfo=pytz.utc), custom('2019'))
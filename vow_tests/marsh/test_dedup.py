@@ -0,0 +1,123 @@
+import unittest
+from typing import List, Optional, Dict
+
+from dataclasses import dataclass
+
+from vow.marsh.base import walk
+from vow.marsh.decl import infer, get_serializers
+from vow.marsh.impl.any import This, AnyAnyAttr, AnyAnyField
+from vow.marsh.impl.any_into import AnyIntoStruct
+from vow.marsh.impl.binary import BINARY_INTO, BINARY_FROM, BinaryNext
+from vow.marsh.impl.json import JSON_INTO, JSON_FROM
+from vow.marsh.dedup import dedup, partition
+from vow.marsh.walker import Walker
+
+
+@infer(JSON_INTO, JSON_FROM, BINARY_INTO, BINARY_FROM)
+@dataclass
+class Pair:
+    a: Optional[int]
+    b: Optional[int]
+    c: List[str]
+    d: List[str]
+
+
+@infer(JSON_INTO, JSON_FROM, BINARY_INTO, BINARY_FROM)
+@dataclass
+class Twins:
+    left: Pair
+    right: Pair
+    tags: Dict[str, Pair]
+
+
+@dataclass
+class Node:
+    value: int
+    children: List['Node']
+
+
+class TestDedup(unittest.TestCase):
+    def test_shared(self):
+        for name in (JSON_INTO, JSON_FROM, BINARY_INTO, BINARY_FROM):
+            fac = Walker(name).resolve(Twins)
+
+            mapper, = Walker(None).mappers(fac, dedup=False)
+            mapper_dedup, = Walker(None).mappers(fac, dedup=True)
+
+            self.assertLess(len(walk(mapper_dedup)), len(walk(mapper)), name)
+
+            # nothing is left to merge after a single pass
+            nodes, _, roots = Walker(None)._visit_objs(fac)
+            nodes, roots = dedup(nodes, roots)
+
+            self.assertEqual(len(nodes), len(dedup(nodes, roots)[0]), name)
+            self.assertEqual(len(nodes), len(walk(mapper_dedup)), name)
+
+    def test_log(self):
+        fac = Walker(JSON_INTO).resolve(Twins)
+        nodes, _, _ = Walker(None)._visit_objs(fac)
+
+        with self.assertLogs('vow.marsh.walker', 'DEBUG') as logs:
+            mapper, = Walker(None).mappers(fac, dedup=True)
+
+        self.assertEqual(
+            [f'{len(nodes)} nodes, {len(walk(mapper))} after dedup'],
+            [x.getMessage() for x in logs.records],
+        )
+
+    def test_roundtrip(self):
+        obj = Twins(Pair(1, None, ['a'], []), Pair(None, 2, [], ['b']), {'x': Pair(3, 4, ['c'], ['d'])})
+
+        for compiled in (False, True):
+            into, = get_serializers(JSON_INTO, Twins, compiled=compiled, dedup=True)
+            from_, = get_serializers(JSON_FROM, Twins, compiled=compiled, dedup=True)
+
+            self.assertEqual(obj, from_(into(obj)))
+
+            into, = get_serializers(BINARY_INTO, Twins, compiled=compiled, dedup=True)
+            from_, = get_serializers(BINARY_FROM, Twins, compiled=compiled, dedup=True)
+
+            self.assertEqual(BinaryNext(obj, b''), from_(into(obj)))
+
+    def test_cycles(self):
+        # two structs describing the same recursive shape are merged, although neither is a subtree of the other
+        nodes = {
+            0: ([], AnyIntoStruct([], Node), {'0': 1, '1': 3}),
+            1: ([], AnyAnyField('value', This(int)), {'item': 2}),
+            2: ([], This(int), {}),
+            3: ([], AnyAnyField('children', This()), {'item': 4}),
+            4: ([], AnyIntoStruct([], Node), {'0': 5, '1': 7}),
+            5: ([], AnyAnyField('value', This(int)), {'item': 6}),
+            6: ([], This(int), {}),
+            7: ([], AnyAnyField('children', This()), {'item': 0}),
+        }
+
+        classes = partition(nodes)
+
+        self.assertEqual(classes[0], classes[4])
+        self.assertEqual(classes[2], classes[6])
+        self.assertNotEqual(classes[1], classes[3])
+
+        r, roots = dedup(nodes, [4])
+
+        self.assertEqual([0, 1, 2, 3], sorted(r))
+        self.assertEqual([0], roots)
+        self.assertEqual({'item': 0}, r[3][2])
+
+    def test_unique(self):
+        # factories without a signature are never merged
+        nodes = {
+            0: ([], AnyAnyAttr('x'), {}),
+            1: ([], AnyAnyAttr('x'), {}),
+            2: ([], AnyIntoStruct([], Node), {'0': 0, '1': 1}),
+        }
+
+        r, roots = dedup(nodes, [2])
+
+        self.assertEqual({'0': 0, '1': 0}, r[2][2])
+
+        nodes[1] = [], AnyAnyAttr({'x'}), {}
+
+        r, roots = dedup(nodes, [2])
+
+        self.assertEqual([0, 1, 2], sorted(r))
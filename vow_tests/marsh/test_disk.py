@@ -0,0 +1,215 @@
+import importlib
+import os
+import subprocess
+import sys
+import tempfile
+import unittest
+
+from dataclasses import dataclass
+
+from vow.marsh import disk
+from vow.marsh.cache import invalidate
+from vow.marsh.decl import infer, get_serializers
+from vow.marsh.impl.binary import BINARY_INTO, BINARY_FROM
+from vow.marsh.impl.json import JSON_INTO
+
+SOURCE = '''from typing import List, Optional
+
+from dataclasses import dataclass
+
+from vow.marsh.decl import infer
+from vow.marsh.impl.binary import BINARY_INTO, BINARY_FROM
+from vow.marsh.impl.binary_fixed import Int32
+from vow.marsh.impl.json import JSON_INTO, JSON_FROM
+
+NAMES = JSON_INTO, JSON_FROM, BINARY_INTO, BINARY_FROM
+
+
+@infer(*NAMES)
+@dataclass
+class Point:
+    x: Int32
+    y: Int32
+
+
+@infer(*NAMES)
+@dataclass
+class Path:
+    name: str
+    points: List[Point]
+    origin: Optional[Point] = None
+'''
+
+API = '''from vow.marsh.decl import infer
+from vow.marsh.impl.json import JSON_INTO, JSON_FROM
+
+from {module} import Path, Point
+
+
+@infer(JSON_INTO, JSON_FROM)
+def move(path: Path, by: Point) -> Path:
+    pass
+'''
+
+# mappers of the arguments and the reply of `move` in a new process, with the hits and misses of the disk cache
+SCRIPT = '''import sys
+
+from vow.marsh import disk
+from vow.marsh.decl import get_serializers
+from vow.marsh.walker import Args, Return
+
+from {module}_api import move
+
+cache = disk.enable(sys.argv[1])
+get_serializers('json_into', Args(move), Return(move))
+print(cache.hits, cache.misses)
+'''
+
+BASE = '''from dataclasses import dataclass
+
+
+@dataclass
+class Base:
+    a: {type}
+'''
+
+CHILD = '''from dataclasses import dataclass
+
+from vow.marsh.decl import infer
+from vow.marsh.impl.json import JSON_FROM
+
+from {module}_base import Base
+
+
+@infer(JSON_FROM)
+@dataclass
+class Child(Base):
+    b: int = 0
+'''
+
+# `Child` decoded in a new process, with the hits and misses of the disk cache
+CHILD_SCRIPT = '''import sys
+
+from vow.marsh import disk
+from vow.marsh.decl import get_serializers
+
+from {module}_child import Child
+
+cache = disk.enable(sys.argv[1])
+from_, = get_serializers('json_from', Child)
+print(cache.hits, cache.misses, repr(from_({{'a': '1', 'b': 2}}).a))
+'''
+
+
+class TestDisk(unittest.TestCase):
+    def setUp(self):
+        self.dir = tempfile.TemporaryDirectory()
+        self.module = 'vow_tests_disk_schema'
+
+        with open(os.path.join(self.dir.name, f'{self.module}.py'), 'w') as f:
+            f.write(SOURCE)
+
+        sys.path.insert(0, self.dir.name)
+        self.schema = importlib.import_module(self.module)
+        self.cache = disk.enable(os.path.join(self.dir.name, 'cache'))
+
+    def tearDown(self):
+        disk.enable(None)
+        invalidate(self.schema.Point, self.schema.Path)
+        sys.path.remove(self.dir.name)
+        del sys.modules[self.module]
+        self.dir.cleanup()
+
+    def obj(self):
+        Point, Path = self.schema.Point, self.schema.Path
+        return Path('a', [Point(1, 2), Point(3, 4)], Point(0, 0))
+
+    def roundtrip(self, compiled=False):
+        into, = get_serializers(BINARY_INTO, self.schema.Path, compiled=compiled)
+        from_, = get_serializers(BINARY_FROM, self.schema.Path, compiled=compiled)
+
+        return from_(into(self.obj())).val
+
+    def test_load(self):
+        self.assertEqual(self.obj(), self.roundtrip())
+        self.assertEqual((0, 2), (self.cache.hits, self.cache.misses))
+
+        # a new process would only have the disk cache
+        invalidate(self.schema.Path)
+
+        self.assertEqual(self.obj(), self.roundtrip())
+        self.assertEqual((2, 2), (self.cache.hits, self.cache.misses))
+
+    def test_compiled(self):
+        self.assertEqual(self.obj(), self.roundtrip(compiled=True))
+        invalidate(self.schema.Path)
+        hits = self.cache.hits
+
+        self.assertEqual(self.obj(), self.roundtrip(compiled=True))
+        # the graphs and the code objects of both mappers
+        self.assertEqual(hits + 4, self.cache.hits)
+
+    def test_stale(self):
+        self.roundtrip()
+        invalidate(self.schema.Path)
+
+        with open(os.path.join(self.dir.name, f'{self.module}.py'), 'a') as f:
+            f.write('\n# changed\n')
+
+        misses = self.cache.misses
+
+        self.assertEqual(self.obj(), self.roundtrip())
+        self.assertEqual(misses + 2, self.cache.misses)
+
+    def run_script(self, script: str = SCRIPT) -> str:
+        root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+        env = dict(os.environ, PYTHONPATH=os.pathsep.join([self.dir.name, root]))
+        env.pop(disk.ENV, None)
+
+        return subprocess.check_output(
+            [sys.executable, '-c', script.format(module=self.module), self.cache.path], env=env,
+        ).decode().strip()
+
+    def test_base_class(self):
+        def write(name, source, **kwargs):
+            with open(os.path.join(self.dir.name, f'{self.module}_{name}.py'), 'w') as f:
+                f.write(source.format(module=self.module, **kwargs))
+
+        write('base', BASE, type='int')
+        write('child', CHILD)
+
+        self.assertEqual("0 1 1", self.run_script(CHILD_SCRIPT))
+        self.assertEqual("1 0 1", self.run_script(CHILD_SCRIPT))
+
+        # only the module of the base class changes
+        write('base', BASE, type='str')
+
+        self.assertEqual("0 1 '1'", self.run_script(CHILD_SCRIPT))
+
+    def test_processes(self):
+        with open(os.path.join(self.dir.name, f'{self.module}_api.py'), 'w') as f:
+            f.write(API.format(module=self.module))
+
+        self.assertEqual('0 1', self.run_script())
+        self.assertEqual('1 0', self.run_script())
+        self.assertEqual(1, len([x for x in os.listdir(self.cache.path) if x.endswith('.pickle')]))
+
+        # the module of the callable is checked as well
+        with open(os.path.join(self.dir.name, f'{self.module}_api.py'), 'a') as f:
+            f.write('\n# changed\n')
+
+        self.assertEqual('0 1', self.run_script())
+        self.assertEqual('1 0', self.run_script())
+
+    def test_not_importable(self):
+        @infer(JSON_INTO)
+        @dataclass
+        class Local:
+            a: int
+
+        mapper, = get_serializers(JSON_INTO, Local)
+
+        self.assertEqual({'a': 1}, mapper(Local(1)))
+        # classes defined in functions are not cached at all
+        self.assertEqual((0, 0), (self.cache.hits, self.cache.misses))
+        self.assertFalse(os.path.exists(self.cache.path))
@@ -0,0 +1,127 @@
+import unittest
+from enum import Enum, IntEnum, Flag
+from typing import List
+
+from vow.marsh.decl import get_serializers
+from vow.marsh.error import SerializationError
+from vow.marsh.impl.any import This
+from vow.marsh.impl.any_into import AnyIntoEnum
+from vow.marsh.impl.binary import BINARY_INTO, BINARY_FROM
+from vow.marsh.impl.json import JSON_INTO, JSON_FROM
+from vow.marsh.walker import Walker
+
+
+class Kind(IntEnum):
+    A = 1
+    B = 2
+
+
+class Level(Enum):
+    Low = 1
+    High = 2
+
+
+class Access(Flag):
+    Read = 1
+    Write = 2
+
+
+class Status(Enum):
+    Active = 'active'
+    Closed = 'closed'
+
+    @classmethod
+    def _missing_(cls, value):
+        if isinstance(value, str) and value.lower() != value:
+            return cls(value.lower())
+
+        return None
+
+
+class TestEnum(unittest.TestCase):
+    def test_into(self):
+        for compiled in (False, True):
+            into, = get_serializers(JSON_INTO, List[Level], compiled=compiled)
+
+            self.assertEqual([1, 2], into([Level.Low, Level.High]))
+
+            with self.assertRaises(SerializationError) as e:
+                into([Level.Low, 1])
+
+            self.assertEqual('enum_not_enum', e.exception.reason)
+
+        # the walkers map an `IntEnum` as an `int`
+        into, = Walker(None).mappers(AnyIntoEnum(Kind, This()))
+
+        self.assertEqual(1, into(Kind.A))
+
+        # equal to a member, but not one
+        with self.assertRaises(SerializationError) as e:
+            into(1)
+
+        self.assertEqual('enum_not_enum', e.exception.reason)
+
+        with self.assertRaises(SerializationError) as e:
+            into.serialize_many([Kind.A, 1])
+
+        self.assertEqual([1], e.exception.path[:1])
+
+        into, = get_serializers(JSON_INTO, Status)
+
+        self.assertEqual(['active', 'closed'], into.serialize_many([Status.Active, Status.Closed]))
+
+    def test_flag(self):
+        for compiled in (False, True):
+            into, = get_serializers(JSON_INTO, List[Access], compiled=compiled)
+            from_, = get_serializers(JSON_FROM, List[Access], compiled=compiled)
+
+            # combinations of the members are not members themselves
+            self.assertEqual([1, 3], into([Access.Read, Access.Read | Access.Write]))
+            self.assertEqual([Access.Read, Access.Read | Access.Write], from_([1, 3]))
+
+        into, = get_serializers(JSON_INTO, Access)
+
+        self.assertEqual([3, 2], into.serialize_many([Access.Read | Access.Write, Access.Write]))
+
+        into, = get_serializers(BINARY_INTO, Access)
+        from_, = get_serializers(BINARY_FROM, Access)
+
+        self.assertEqual(Access.Read | Access.Write, from_(into(Access.Read | Access.Write)).val)
+
+    def test_from(self):
+        for compiled in (False, True):
+            from_, = get_serializers(JSON_FROM, List[Status], compiled=compiled)
+
+            self.assertEqual([Status.Active, Status.Closed], from_(['active', 'closed']))
+            # not a value of any member, left to `_missing_`
+            self.assertEqual([Status.Closed], from_(['CLOSED']))
+
+            with self.assertRaises(SerializationError) as e:
+                from_(['active', 'open'])
+
+            self.assertEqual('invalid_enum_key', e.exception.reason)
+
+        from_, = get_serializers(JSON_FROM, Status)
+
+        self.assertEqual([Status.Active, Status.Closed], from_.serialize_many(['active', 'CLOSED']))
+
+    def test_binary(self):
+        into, = get_serializers(BINARY_INTO, List[Level])
+        from_, = get_serializers(BINARY_FROM, List[Level])
+
+        self.assertEqual(b'\x03\x02\x04\x02', into([Level.Low, Level.High, Level.Low]))
+        self.assertEqual([Level.Low, Level.High, Level.Low], from_(b'\x03\x02\x04\x02').val)
+
+        with self.assertRaises(SerializationError) as e:
+            into([1])
+
+        self.assertEqual('enum_not_enum', e.exception.reason)
+
+        with self.assertRaises(SerializationError) as e:
+            from_(b'\x01\x06')
+
+        self.assertEqual('enum_value_invalid', e.exception.reason)
+
+        from_, = get_serializers(BINARY_FROM, Status)
+
+        self.assertEqual(Status.Closed, from_(b'\x06CLOSED').val)
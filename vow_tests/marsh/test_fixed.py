@@ -0,0 +1,167 @@
+import struct
+import unittest
+from enum import Enum
+from typing import List, Optional
+
+from dataclasses import dataclass, field
+
+from vow.marsh.decl import infer, get_serializers
+from vow.marsh.error import SerializationError, BUFFER_NEEDED
+from vow.marsh.helper import FIELD_FACTORY
+from vow.marsh.impl.any import This
+from vow.marsh.impl.binary import BINARY_INTO, BINARY_FROM, BinaryNext
+from vow.marsh.impl.binary_fixed import fixed, fixed_layout, Int8, Int32, UInt16, Float32, BinaryIntoFixedMapper, \
+    BinaryFromFixedArrayMapper
+from vow.marsh.impl.json import JSON_INTO, JSON_FROM
+
+
+class Level(Enum):
+    Low = 1
+    High = 300
+
+
+@infer(JSON_INTO, JSON_FROM, BINARY_INTO, BINARY_FROM)
+@fixed
+@dataclass
+class Point:
+    x: Int32
+    y: Int32
+
+
+@infer(JSON_INTO, JSON_FROM, BINARY_INTO, BINARY_FROM)
+@fixed
+@dataclass
+class Sample:
+    at: Point
+    level: Level
+    value: float
+    ratio: Float32
+    ok: bool
+    count: UInt16 = 0
+
+
+@infer(JSON_INTO, JSON_FROM, BINARY_INTO, BINARY_FROM)
+@dataclass
+class Loose:
+    x: int
+    y: Optional[Int8]
+
+
+@fixed
+@dataclass
+class Custom:
+    x: Int8 = field(metadata={FIELD_FACTORY: {BINARY_INTO: This()}})
+
+
+@infer(BINARY_INTO, BINARY_FROM)
+@dataclass
+class Plain:
+    x: Int32
+    level: Level
+
+
+class TestFixed(unittest.TestCase):
+    def test_layout(self):
+        self.assertEqual('<ii', fixed_layout(Point).struct.format)
+        self.assertEqual('<iihdfBH', fixed_layout(Sample).struct.format)
+        self.assertEqual(('at.x', 'at.y', 'level.value', 'value', 'ratio', 'ok', 'count'), fixed_layout(Sample).names)
+
+        # only the marked dataclasses
+        self.assertIsNone(fixed_layout(Loose))
+        self.assertIsNone(fixed_layout(Plain))
+        self.assertIsNone(fixed_layout(int))
+
+        with self.assertRaises(ValueError):
+            fixed_layout(Custom)
+
+    def test_pack(self):
+        obj = Sample(Point(-1, 2), Level.High, 0.1, 0.5, True, 7)
+        raw = struct.pack('<iihdfBH', -1, 2, 300, 0.1, 0.5, True, 7)
+
+        into, = get_serializers(BINARY_INTO, Sample)
+        from_, = get_serializers(BINARY_FROM, Sample)
+
+        self.assertIsInstance(into, BinaryIntoFixedMapper)
+        self.assertEqual(raw, into.serialize(obj))
+        self.assertEqual(BinaryNext(obj, b'!'), from_.serialize(raw + b'!'))
+
+        layout = fixed_layout(Sample)
+
+        self.assertEqual(obj, layout.unpack_from(memoryview(b'..' + raw), 2))
+
+        with self.assertRaises(SerializationError) as e:
+            from_.serialize(raw[:-1])
+
+        self.assertEqual(BUFFER_NEEDED, e.exception.reason)
+
+    def test_array(self):
+        objs = [Sample(Point(i, -i), Level.Low, i / 2, 0.25, bool(i % 2), i) for i in range(10)]
+
+        into, = get_serializers(BINARY_INTO, List[Sample])
+        from_, = get_serializers(BINARY_FROM, List[Sample])
+
+        self.assertIsInstance(from_, BinaryFromFixedArrayMapper)
+
+        raw = into.serialize(objs)
+
+        self.assertEqual(b'\x0a' + b''.join(fixed_layout(Sample).pack(x) for x in objs), raw)
+        self.assertEqual(BinaryNext(objs, b''), from_.serialize(raw))
+        self.assertEqual(BinaryNext([], b''), from_.serialize(into.serialize([])))
+
+        objs[3].count = -1
+
+        with self.assertRaises(SerializationError) as e:
+            into.serialize(objs)
+
+        self.assertEqual([3], e.exception.path)
+        self.assertEqual('not_fixed', e.exception.reason)
+
+    def test_json(self):
+        into, = get_serializers(JSON_INTO, Point)
+        from_, = get_serializers(JSON_FROM, Point)
+
+        self.assertEqual({'x': 1, 'y': 2}, into.serialize(Point(1, 2)))
+        self.assertEqual(Point(1, 2), from_.serialize({'x': 1, 'y': 2}))
+
+    def test_loose(self):
+        into, = get_serializers(BINARY_INTO, Loose)
+        from_, = get_serializers(BINARY_FROM, Loose)
+
+        self.assertEqual(b'\x03\x01\x04', into.serialize(Loose(-2, 2)))
+        self.assertEqual(BinaryNext(Loose(-2, 2), b''), from_.serialize(b'\x03\x01\x04'))
+
+    def test_plain(self):
+        into, = get_serializers(BINARY_INTO, Plain)
+
+        # zigzag varints, as the dataclass is not marked
+        self.assertEqual(b'\x03\x02', into.serialize(Plain(-2, Level.Low)))
+
+    def test_checks(self):
+        into, = get_serializers(BINARY_INTO, Sample)
+        from_, = get_serializers(BINARY_FROM, Sample)
+        array, = get_serializers(BINARY_INTO, List[Sample])
+
+        for obj, path, reason in [
+            (Sample(Point(1, 2), 300, 0.1, 0.5, True), ['level'], 'enum_not_enum'),
+            (Sample((1, 2), Level.Low, 0.1, 0.5, True), ['at'], 'not_instance'),
+            (Sample(Point(1, 2), Level.Low, 0.1, 0.5, 'yes'), ['ok'], 'not_bool'),
+            (Sample(Point(1, 2), Level.Low, 0.1, 0.5, 1), ['ok'], 'not_bool'),
+        ]:
+            with self.assertRaises(SerializationError) as e:
+                into.serialize(obj)
+
+            self.assertEqual((path, reason), (e.exception.path, e.exception.reason))
+
+            with self.assertRaises(SerializationError) as e:
+                array.serialize([obj])
+
+            self.assertEqual(([0] + path, reason), (e.exception.path, e.exception.reason))
+
+        raw = bytearray(into.serialize(Sample(Point(1, 2), Level.Low, 0.1, 0.5, True)))
+        raw[-3] = 2
+
+        for mapper, obj in [(from_, raw), (get_serializers(BINARY_FROM, List[Sample])[0], b'\x01' + raw)]:
+            with self.assertRaises(SerializationError) as e:
+                mapper.serialize(bytes(obj))
+
+            self.assertEqual('not_bool', e.exception.reason)
@@ -0,0 +1,61 @@
+import json
+import unittest
+from io import BytesIO
+from typing import List, Dict, Optional
+
+from dataclasses import dataclass
+
+from vow.marsh.decl import get_serializers, infer
+from vow.marsh.impl.json import JSON_INTO
+from vow.marsh.impl.json_bytes import JSON_BYTES, FLUSH_PARTS
+from vow_tests.marsh.test_api import Amber, Bulky
+from vow_tests.marsh.test_batch import crate
+from vow_tests.marsh.test_compile import Crate, catch
+
+
+@infer(JSON_INTO)
+@dataclass
+class Doc:
+    title: str
+    crates: List[Crate]
+    index: Dict[str, Optional[List[float]]]
+
+
+class TestJsonBytes(unittest.TestCase):
+    def assertSame(self, cls, *objs):
+        into, = get_serializers(JSON_INTO, cls)
+        writer, = get_serializers(JSON_BYTES, cls)
+
+        for obj in objs:
+            self.assertEqual(catch(lambda x: json.dumps(into(x)).encode(), obj), catch(writer, obj))
+
+    def test_same(self):
+        self.assertSame(
+            Doc,
+            Doc('ü "quoted"\n', [crate(i) for i in range(5)], {'a': [1.5, float('nan'), float('-inf')], 'b': None}),
+            Doc('', [], {}),
+            Doc('x', [crate(1), Amber(1, Bulky())], {}),
+            Doc('x', [], {'a': ['b']}),
+        )
+
+        self.assertSame(
+            Amber,
+            Amber(555, Bulky(Amber(5, Bulky()))),
+            Amber('asd', Bulky()),
+        )
+
+    def test_stream(self):
+        writer, = get_serializers(JSON_BYTES, List[Crate])
+
+        objs = [crate(i % 5) for i in range(FLUSH_PARTS)]
+        chunks = []
+
+        writer.dump(objs, chunks.append)
+
+        self.assertLess(1, len(chunks))
+        self.assertEqual(writer(objs), b''.join(chunks))
+
+        fp = BytesIO()
+        writer.dump_stream(objs, fp)
+
+        self.assertEqual(b''.join(chunks), fp.getvalue())
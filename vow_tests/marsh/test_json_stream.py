@@ -0,0 +1,89 @@
+import asyncio
+import json
+import unittest
+from io import BytesIO
+from typing import List
+
+from vow.marsh.decl import get_serializers
+from vow.marsh.error import SerializationError
+from vow.marsh.impl.json import JSON_INTO, JSON_FROM
+from vow.marsh.impl import json_stream
+from vow.marsh.impl.json_stream import decode_items, decode_items_async, JsonArrayParser
+from vow_tests.marsh.test_batch import crate
+from vow_tests.marsh.test_compile import Crate, catch
+
+
+class Reader:
+    def __init__(self, data: bytes):
+        self.fp = BytesIO(data)
+
+    async def read(self, n: int) -> bytes:
+        return self.fp.read(n)
+
+
+class TestJsonStream(unittest.TestCase):
+    def setUp(self):
+        into, = get_serializers(JSON_INTO, List[Crate])
+
+        self.crates = [crate(i) for i in range(20)]
+        self.raw = into(self.crates)
+        self.mapper, = get_serializers(JSON_FROM, List[Crate])
+
+    def test_chunks(self):
+        doc = json.dumps({'a': {'b': [1, ']'], 'c': 'd'}, 'crates': self.raw, 'z': 1}, indent=1).encode()
+
+        for chunk_size in (1, 7, 64, len(doc)):
+            self.assertEqual(self.crates, list(decode_items(self.mapper, BytesIO(doc), ['crates'], chunk_size)))
+
+        doc = json.dumps([1.5, -2e-10, 'ü', True, None, [], {}], ensure_ascii=False).encode()
+
+        parser = JsonArrayParser()
+        items = [x for i in range(len(doc)) for _, x in parser.feed(doc[i:i + 1])]
+
+        self.assertEqual(json.loads(doc), items + [x for _, x in parser.feed(b'', final=True)])
+
+    def test_large_item(self):
+        doc = json.dumps([list(range(2000)), {'a': 'x' * 10000}]).encode()
+        decode = json_stream.DECODER.raw_decode
+        calls = []
+
+        def counted(*args):
+            calls.append(args)
+            return decode(*args)
+
+        json_stream.DECODER.raw_decode = counted
+
+        try:
+            parser = JsonArrayParser()
+            items = [x for i in range(0, len(doc), 10) for _, x in parser.feed(doc[i:i + 10])]
+        finally:
+            del json_stream.DECODER.raw_decode
+
+        self.assertEqual(json.loads(doc), items + [x for _, x in parser.feed(b'', final=True)])
+        # each item is decoded again whenever the data held for it doubled, not once per chunk
+        self.assertLess(len(calls), 40)
+
+    def test_async(self):
+        doc = json.dumps(self.raw).encode()
+
+        async def collect():
+            return [x async for x in decode_items_async(self.mapper, Reader(doc), chunk_size=100)]
+
+        self.assertEqual(self.crates, asyncio.run(collect()))
+
+    def test_errors(self):
+        ints, = get_serializers(JSON_FROM, List[int])
+
+        def decode(doc, *path, mapper=self.mapper):
+            return list(decode_items(mapper, BytesIO(doc), path, chunk_size=3))
+
+        raw = json.dumps(self.raw[:2] + [dict(self.raw[2], items=['x'])]).encode()
+
+        self.assertEqual(catch(self.mapper, json.loads(raw)), catch(decode, raw))
+        self.assertEqual(([2, '3', 'items', '$item', 0], 'unmappable'), catch(decode, raw)[:2])
+
+        self.assertEqual((['a', 1], 'truncated'), catch(lambda x: decode(x, 'a', mapper=ints), b'{"a": [1, 2'))
+        self.assertEqual(([], 'not_list'), catch(decode, b'{"a": [1, 2]}'))
+        self.assertEqual((['a'], 'key_missing'), catch(decode, b'{"b": [1, 2]}', 'a', 'b'))
+        self.assertEqual(([0], 'json'), catch(decode, b'[1x, 2]'))
+        self.assertRaises(SerializationError, decode, b'[{"a": 1} {"b": 2}]')
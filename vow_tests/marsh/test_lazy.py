@@ -0,0 +1,54 @@
+import pickle
+import unittest
+from typing import List
+
+from vow.marsh.decl import get_serializers
+from vow.marsh.impl.any_from import RAW_ATTR
+from vow.marsh.impl.json import JSON_INTO, JSON_FROM
+from vow_tests.marsh.test_batch import Batch, crate
+from vow_tests.marsh.test_api import Amber, Bulky
+from vow_tests.marsh.test_compile import Crate, catch
+
+
+class TestLazy(unittest.TestCase):
+    def test_lazy(self):
+        into, = get_serializers(JSON_INTO, Batch)
+        eager, = get_serializers(JSON_FROM, Batch)
+        lazy, = get_serializers(JSON_FROM, Batch, lazy=True)
+
+        obj = Batch([crate(i) for i in range(3)], [Amber(1, Bulky()), None])
+        raw = into(obj)
+
+        r = lazy(raw)
+
+        self.assertIsInstance(r, Batch)
+        self.assertEqual({RAW_ATTR}, set(vars(r)))
+
+        self.assertEqual(obj.crates[1].at, r.crates[1].at)
+        self.assertEqual({RAW_ATTR, 'crates'}, set(vars(r)))
+        self.assertIs(r.crates, r.crates)
+        self.assertEqual({RAW_ATTR, 'at'}, set(vars(r.crates[1])))
+
+        self.assertEqual(obj, r)
+        self.assertEqual(eager(raw), r)
+        self.assertEqual(repr(obj), repr(r))
+
+        p = pickle.loads(pickle.dumps(r))
+
+        self.assertIs(Batch, type(p))
+        self.assertEqual(obj, p)
+
+    def test_errors(self):
+        into, = get_serializers(JSON_INTO, Crate)
+        eager, = get_serializers(JSON_FROM, List[Crate])
+        lazy, = get_serializers(JSON_FROM, List[Crate], lazy=True)
+
+        raw = [into(crate(1)), dict(into(crate(2)), at='yesterday')]
+
+        r = lazy(raw)
+
+        self.assertEqual('c2', r[1].name)
+        path, reason = catch(eager, raw)
+
+        self.assertEqual((path[1:], reason), catch(lambda x: x[1].at, r))
+        self.assertEqual(([1], 'invalid_obj'), catch(lazy, [raw[0], None]))
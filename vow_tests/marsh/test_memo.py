@@ -0,0 +1,113 @@
+import unittest
+from typing import List, Optional
+
+from dataclasses import dataclass
+
+from vow.marsh.decl import infer, get_serializers
+from vow.marsh.error import SerializationError
+from vow.marsh.impl.binary import BINARY_INTO, BINARY_FROM, BinaryNext
+from vow.marsh.impl.json import JSON_INTO, JSON_FROM
+from vow.marsh.walker import Walker
+
+NAMES = JSON_INTO, JSON_FROM, BINARY_INTO, BINARY_FROM
+
+
+@infer(*NAMES)
+@dataclass
+class Leaf:
+    name: str
+
+
+@infer(*NAMES)
+@dataclass
+class Graph:
+    leaves: List[Leaf]
+    main: Optional[Leaf] = None
+
+
+@infer(*NAMES)
+@dataclass(eq=False)
+class Person:
+    name: str
+    link: 'Link'
+
+
+@infer(*NAMES)
+@dataclass(eq=False)
+class Link:
+    person: Optional[Person] = None
+
+
+def roundtrip(obj, *names):
+    into, = get_serializers(names[0], type(obj), memo=True)
+    from_, = get_serializers(names[1], type(obj), memo=True)
+
+    r = from_(into(obj))
+
+    return r.val if isinstance(r, BinaryNext) else r
+
+
+class TestMemo(unittest.TestCase):
+    def test_json(self):
+        a = Leaf('a')
+
+        into, = get_serializers(JSON_INTO, Graph, memo=True)
+
+        self.assertEqual(
+            {'leaves': [{'name': 'a', '$id': 0}, {'name': 'b'}, {'$ref': 0}], 'main': {'$ref': 0}},
+            into(Graph([a, Leaf('b'), a], a)),
+        )
+
+        # every call starts with an empty table
+        self.assertEqual({'leaves': [{'name': 'a'}], 'main': None}, into(Graph([a])))
+
+    def test_binary(self):
+        a = Leaf('a')
+
+        into, = get_serializers(BINARY_INTO, Graph, memo=True)
+
+        # `Graph` is the struct 0, `a` is 1
+        self.assertEqual(b'\x00\x03\x00\x01a\x00\x01b\x02\x01\x02', into(Graph([a, Leaf('b'), a], a)))
+
+    def test_shared(self):
+        a = Leaf('a')
+
+        for names in ((JSON_INTO, JSON_FROM), (BINARY_INTO, BINARY_FROM)):
+            r = roundtrip(Graph([a, Leaf('b'), a, Leaf('a')], a), *names)
+
+            self.assertEqual(Graph([a, Leaf('b'), a, Leaf('a')], a), r)
+            self.assertIs(r.leaves[0], r.leaves[2])
+            self.assertIs(r.leaves[0], r.main)
+            self.assertIsNot(r.leaves[0], r.leaves[3])
+
+    def test_cycle(self):
+        obj = Person('a', Link())
+        obj.link.person = obj
+
+        for names in ((JSON_INTO, JSON_FROM), (BINARY_INTO, BINARY_FROM)):
+            with self.assertRaises(RecursionError):
+                get_serializers(names[0], Person)[0](obj)
+
+            r = roundtrip(obj, *names)
+
+            self.assertEqual('a', r.name)
+            self.assertIs(r, r.link.person)
+
+    def test_errors(self):
+        from_, = get_serializers(JSON_FROM, Graph, memo=True)
+
+        with self.assertRaises(SerializationError) as e:
+            from_({'leaves': [{'$ref': 0}]})
+
+        self.assertEqual(['0', 'leaves', '$item', 0, '$ref'], e.exception.path)
+        self.assertEqual('ref_invalid', e.exception.reason)
+
+        from_, = get_serializers(BINARY_FROM, Graph, memo=True)
+
+        with self.assertRaises(SerializationError) as e:
+            from_(b'\x00\x01\x05\x00')
+
+        self.assertEqual('ref_invalid', e.exception.reason)
+
+        with self.assertRaises(ValueError):
+            Walker(JSON_FROM).mappers(Walker(JSON_FROM).resolve(Graph), memo=True, lazy=True)
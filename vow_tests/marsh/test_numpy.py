@@ -0,0 +1,75 @@
+import unittest
+from typing import List
+
+from dataclasses import dataclass
+
+from vow.marsh.decl import infer, get_serializers
+from vow.marsh.impl.json import JSON_FROM, JSON_INTO
+from vow.marsh.impl.json_numpy import numpy, JsonAnyArrayMapper
+from vow_tests.marsh.test_compile import catch
+
+if numpy is not None:
+    @infer(JSON_INTO, JSON_FROM)
+    @dataclass
+    class Samples:
+        ints: List[int]
+        floats: List[float]
+        flags: List[bool]
+        raw: numpy.ndarray
+
+
+@unittest.skipIf(numpy is None, 'numpy is not installed')
+class TestNumpy(unittest.TestCase):
+    def test_list(self):
+        into, = get_serializers(JSON_INTO, List[int])
+
+        self.assertIsInstance(into, JsonAnyArrayMapper)
+
+        ints = list(range(64))
+
+        self.assertEqual(ints, into(ints))
+        self.assertEqual(ints, into(numpy.arange(64)))
+        self.assertEqual(ints, into(numpy.arange(64, dtype=numpy.uint8)))
+        self.assertEqual(ints, into(numpy.arange(64.)))
+        self.assertEqual({int}, {type(x) for x in into(numpy.arange(64.))})
+
+        # anything numpy can not convert exactly goes through `int` item by item
+        self.assertEqual([5] + ints, into(numpy.array(['5'] + ints)))
+        self.assertEqual(([64], 'unmappable'), catch(into, numpy.append(numpy.arange(64.), numpy.nan)))
+        self.assertEqual(([0], 'unmappable'), catch(into, numpy.arange(4).reshape(2, 2)))
+
+        flags, = get_serializers(JSON_INTO, List[bool])
+
+        self.assertEqual([False, True, True], flags(numpy.array([0, 1, 2])))
+
+    def test_struct(self):
+        into, = get_serializers(JSON_INTO, Samples)
+        from_, = get_serializers(JSON_FROM, Samples)
+
+        n = 128
+        obj = Samples(list(range(n)), [x / 2 for x in range(n)], [bool(x % 3) for x in range(n)],
+                      numpy.arange(6.).reshape(2, 3))
+
+        raw = into(obj)
+
+        self.assertEqual([[0., 1., 2.], [3., 4., 5.]], raw['raw'])
+        self.assertEqual(obj.flags, raw['flags'])
+
+        r = from_(raw)
+
+        self.assertEqual(obj.ints, r.ints)
+        self.assertEqual(obj.floats, r.floats)
+        self.assertTrue((obj.raw == r.raw).all())
+
+        self.assertEqual((['3', 'raw', '$item'], 'not_numeric'), catch(from_, dict(raw, raw=['a'])))
+        self.assertEqual((['3', 'raw', '$attr'], 'not_ndarray'), catch(into, Samples([], [], [], [1])))
+
+    def test_typed(self):
+        from numpy.typing import NDArray
+
+        into, = get_serializers(JSON_INTO, NDArray[numpy.float32])
+        from_, = get_serializers(JSON_FROM, NDArray[numpy.float32])
+
+        self.assertEqual(numpy.float32, from_([1, 2]).dtype)
+        self.assertEqual([1.0, 2.0], into(numpy.array([1, 2], dtype=numpy.int8)))
+        self.assertEqual(([], 'invalid_dtype'), catch(into, numpy.array([1j])))
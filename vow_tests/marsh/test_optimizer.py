@@ -0,0 +1,96 @@
+import unittest
+from fractions import Fraction
+
+from vow.marsh.decl import get_serializers
+from vow.marsh.error import SerializationError
+from vow.marsh.impl.any import This, AnyAnyWith, AnyAnyAttr, AnyAnyChainMapper, AnyAnyDiscriminant, \
+    AnyAnyDiscriminantMapper, AnyAnyAttrMapper, AnyAnyLen, AnyAnySelfMapper
+from vow.marsh.impl.binary import BINARY_INTO, BINARY_FROM
+from vow.marsh.impl.json import JSON_INTO, JSON_FROM
+from vow.marsh.base import Fac, FieldsFac, walk
+from vow.marsh.walker import Walker
+from vow.rpc.wire import Packet, Request, Service, Error
+
+
+class Self(Fac):
+    __mapper_cls__ = AnyAnySelfMapper
+
+    def dependencies(self) -> FieldsFac:
+        return {'self': AnyAnyWith(This(), AnyAnyLen(This()))}
+
+
+class TestOptimizer(unittest.TestCase):
+    def mappers(self, fac: Fac):
+        a, = Walker(JSON_INTO).mappers(fac)
+        b, = Walker(JSON_INTO).mappers(fac, optimize=True)
+        return a, b
+
+    def test_identity(self):
+        a, b = self.mappers(Self())
+
+        self.assertEqual(3, a.serialize('abc'))
+        self.assertEqual(3, b.serialize('abc'))
+        self.assertEqual(['AnyAnyLenMapper', 'ThisMapper'], [type(x).__name__ for x in walk(b)])
+
+        _, b = self.mappers(AnyAnyAttr('real', This()))
+
+        self.assertIsInstance(b, AnyAnyAttrMapper)
+        self.assertEqual({}, b.dependencies)
+
+    def test_chain(self):
+        fac = AnyAnyWith(
+            AnyAnyWith(AnyAnyAttr('real'), This(str)),
+            AnyAnyWith(AnyAnyLen(This()), AnyAnyWith(This(), This(float)))
+        )
+
+        a, b = self.mappers(fac)
+
+        self.assertIsInstance(b, AnyAnyChainMapper)
+        self.assertEqual(4, len(b.dependencies))
+        self.assertEqual(a.serialize(1.5), b.serialize(1.5))
+
+        with self.assertRaises(SerializationError) as e:
+            b.serialize(None)
+
+        self.assertEqual(['0'], e.exception.path)
+
+    def test_discriminant(self):
+        fac = AnyAnyDiscriminant(
+            AnyAnyWith(AnyAnyAttr('real', This()), AnyAnyAttr('__class__')),
+            AnyAnyAttr('real', This()),
+            [(int, This(str)), (float, AnyAnyLen(This(str)))],
+        )
+
+        a, b = self.mappers(fac)
+
+        self.assertIsInstance(b, AnyAnyDiscriminantMapper)
+        self.assertTrue(b.of_value)
+        self.assertIsInstance(b.dependencies['discriminant'], AnyAnyAttrMapper)
+
+        for x in [5, 1.5]:
+            self.assertEqual(a.serialize(x), b.serialize(x))
+
+        for m in [a, b]:
+            with self.assertRaises(SerializationError) as e:
+                m.serialize(Fraction(1, 2))
+
+            self.assertEqual(['$value'], e.exception.path)
+
+    def test_packet(self):
+        pkts = [Packet(None, Service('svc')), Packet('1', Request('method', {'a': [1]})), Packet('2', Error('x'))]
+
+        for compiled in (False, True):
+            for into, from_ in ((JSON_INTO, JSON_FROM), (BINARY_INTO, BINARY_FROM)):
+                a_into, = get_serializers(into, Packet, compiled=compiled)
+                b_into, = get_serializers(into, Packet, compiled=compiled, optimize=True)
+                b_from, = get_serializers(from_, Packet, compiled=compiled, optimize=True)
+
+                for pkt in pkts:
+                    raw = b_into.serialize(pkt)
+                    r = b_from.serialize(raw)
+
+                    self.assertEqual(a_into.serialize(pkt), raw)
+                    self.assertEqual(pkt, r.val if into == BINARY_INTO else r)
+
+        self.assertLess(len(walk(get_serializers(BINARY_FROM, Packet, optimize=True)[0])),
+                        len(walk(get_serializers(BINARY_FROM, Packet)[0])))
@@ -0,0 +1,54 @@
+import unittest
+from typing import List
+
+from dataclasses import dataclass
+
+from vow.marsh.decl import infer, get_serializers
+from vow.marsh.error import SerializationError
+from vow.marsh.impl.binary import BINARY_INTO, BINARY_FROM, BinaryNext
+from vow.marsh.impl.json import JSON_INTO, JSON_FROM
+from vow.marsh.pool import ParallelMapper, serialize_parallel
+
+
+@infer(JSON_INTO, JSON_FROM, BINARY_INTO, BINARY_FROM)
+@dataclass
+class Row:
+    id: int
+    tags: List[str]
+
+
+class TestPool(unittest.TestCase):
+    def test_order(self):
+        objs = [Row(i, [str(i)] * (i % 3)) for i in range(100)]
+
+        into, = get_serializers(JSON_INTO, Row)
+
+        with ParallelMapper(JSON_INTO, Row, processes=2, chunksize=7) as pool:
+            raw = pool.serialize_many(objs)
+
+            self.assertEqual([into(x) for x in objs], raw)
+            # the pool is reused, and takes any iterable
+            self.assertEqual(raw[:10], list(pool.map(iter(objs[:10]))))
+            self.assertEqual([], pool.serialize_many([]))
+
+        self.assertEqual(objs, serialize_parallel(JSON_FROM, Row, raw, processes=2, chunksize=7))
+
+    def test_binary(self):
+        objs = [Row(i, ['a']) for i in range(10)]
+
+        raw = serialize_parallel(BINARY_INTO, Row, objs, processes=2, chunksize=3)
+
+        self.assertEqual(
+            [BinaryNext(x, b'') for x in objs],
+            serialize_parallel(BINARY_FROM, Row, raw, processes=2, chunksize=3, compiled=True),
+        )
+
+    def test_errors(self):
+        objs = [Row(i, []) for i in range(20)]
+        objs[13].id = 'x'
+
+        with self.assertRaises(SerializationError) as e:
+            serialize_parallel(JSON_INTO, Row, objs, processes=2, chunksize=5)
+
+        self.assertEqual(13, e.exception.path[0])
+        self.assertIsNone(e.exception.origin)
@@ -0,0 +1,118 @@
+import unittest
+from typing import List, Optional
+
+from dataclasses import dataclass
+
+from vow.marsh.decl import infer, get_serializers
+from vow.marsh.error import SerializationError
+from vow.marsh.impl.binary import BINARY_INTO, BINARY_FROM, BinaryNext
+from vow.marsh.impl.json import JSON_INTO, JSON_FROM
+from vow.marsh.profile import Profile
+
+
+@infer(JSON_INTO, JSON_FROM, BINARY_INTO, BINARY_FROM)
+@dataclass
+class Item:
+    id: int
+    name: str
+
+
+@infer(JSON_INTO, JSON_FROM, BINARY_INTO, BINARY_FROM)
+@dataclass
+class Order:
+    items: List[Item]
+    note: Optional[str] = None
+
+
+@infer(JSON_INTO)
+@dataclass
+class User:
+    name: str
+
+
+@infer(JSON_INTO)
+@dataclass
+class Product:
+    name: str
+
+
+@infer(JSON_INTO)
+@dataclass
+class Purchase:
+    user: User
+    product: Product
+
+
+def stats(profile: Profile):
+    return {(x.name, x.fac.__class__.__name__): x for x in profile.nodes}
+
+
+class TestProfile(unittest.TestCase):
+    def test_counts(self):
+        profile = Profile()
+        into, = get_serializers(JSON_INTO, Order, profile=profile)
+
+        obj = Order([Item(1, 'a'), Item(2, 'b')])
+
+        self.assertEqual({'items': [{'id': 1, 'name': 'a'}, {'id': 2, 'name': 'b'}], 'note': None}, into(obj))
+
+        r = stats(profile)
+
+        self.assertEqual(1, r['Order', 'AnyIntoStruct'].calls)
+        self.assertEqual(2, r['Order.items', 'AnyIntoStruct'].calls)
+        self.assertEqual(2, r['Order.items.name', 'AnyAnyAttr'].calls)
+
+        top, = profile.report(1, 'total')
+
+        self.assertIs(r['Order', 'AnyIntoStruct'], top)
+        self.assertLessEqual(top.self, top.total)
+        self.assertAlmostEqual(top.total, sum(x.self for x in profile.nodes), delta=top.total * 0.01)
+
+        profile.reset()
+
+        self.assertEqual([], profile.report())
+
+    def test_paths(self):
+        profile = Profile()
+        into, = get_serializers(JSON_INTO, Purchase, profile=profile)
+
+        into(Purchase(User('a'), Product('b')))
+        into(Purchase(User('c'), Product('d')))
+
+        r = stats(profile)
+
+        # the fields are interchangeable, but are reported apart
+        self.assertEqual(2, r['Purchase.user.name', 'AnyAnyAttr'].calls)
+        self.assertEqual(2, r['Purchase.product.name', 'AnyAnyAttr'].calls)
+
+    def test_errors(self):
+        profile = Profile()
+        into, = get_serializers(JSON_INTO, Order, profile=profile)
+
+        with self.assertRaises(SerializationError) as e:
+            into(Order([Item(1, 'a'), Item('x', 'b')]))
+
+        self.assertEqual(['0', 'items', '$attr', 1, '0', 'id', '$attr'], e.exception.path)
+
+        r = stats(profile)
+
+        self.assertEqual(1, r['Order', 'AnyIntoStruct'].errors)
+        # the batch path of the list raises as well before the items are retried one at a time
+        self.assertGreater(r['Order.items.id', 'This'].errors, 0)
+        self.assertEqual(0, r['Order.items.name', 'AnyAnyAttr'].errors)
+
+    def test_binary(self):
+        profile = Profile()
+        into, = get_serializers(BINARY_INTO, Order, profile=profile)
+        from_, = get_serializers(BINARY_FROM, Order, profile=profile)
+
+        obj = Order([Item(1, 'a'), Item(2, 'b')], 'x')
+
+        self.assertEqual(BinaryNext(obj, b''), from_(into(obj)))
+
+        r = stats(profile)
+
+        self.assertEqual(2, r['Order.items', 'BinaryFromStruct'].calls)
+        self.assertEqual(2, r['Order.items.name', 'BinaryFromStr'].calls)
+        self.assertEqual(1, r['Order.note', 'BinaryFromStr'].calls)
+        self.assertIn('Order.items BinaryIntoStruct(Item)', profile.format())
@@ -0,0 +1,89 @@
+import unittest
+from typing import List
+
+from dataclasses import dataclass
+
+from vow.marsh.decl import get_serializers, infer
+from vow.marsh.impl.json import JSON_INTO, JSON_FROM
+from vow.marsh.projection import parse_select
+from vow.rpc.wire import Packet, Request, Error
+from vow_tests.marsh.test_api import Amber, Bulky
+from vow_tests.marsh.test_batch import Batch, crate
+from vow_tests.marsh.test_compile import Crate, catch
+
+
+@infer(JSON_INTO, JSON_FROM)
+@dataclass
+class Slim:
+    __slots__ = 'a', 'b'
+
+    a: int
+    b: str
+
+
+class TestProjection(unittest.TestCase):
+    def test_parse(self):
+        self.assertEqual({'a': {'b': None, 'c': None}}, parse_select(['a.b', 'a.c']))
+        self.assertEqual({'a': None}, parse_select(['a.b', 'a', 'a.c']))
+        self.assertEqual({'*': {'a': {'*': {'*': None}}}}, parse_select(['[*].a[*][*]']))
+
+    def test_into(self):
+        into, = get_serializers(JSON_INTO, Batch, select=['crates[*].name', 'ambers[*].b.b.a'])
+
+        obj = Batch([crate(1), crate(2)], [Amber(1, Bulky(Amber(2, Bulky()))), None, Amber(3, Bulky())])
+
+        self.assertEqual(
+            {'crates': [{'name': 'c1'}, {'name': 'c2'}], 'ambers': [{'b': {'b': {'a': 2}}}, None, {'b': {'b': None}}]},
+            into(obj),
+        )
+
+    def test_from(self):
+        into, = get_serializers(JSON_INTO, Crate)
+        from_, = get_serializers(JSON_FROM, List[Batch], select=['[*].crates[*].name', '[*].crates[*].items'])
+
+        raw = {'crates': [], 'ambers': None}
+
+        # `at` is broken, but not selected
+        r, = from_([dict(raw, crates=[into(crate(1)), dict(into(crate(2)), at='broken')])])
+
+        self.assertEqual(['c1', 'c2'], [x.name for x in r.crates])
+        self.assertIsInstance(r.crates[0], Crate)
+        self.assertFalse(hasattr(r.crates[0], 'at'))
+        self.assertEqual({'crates'}, set(vars(r)))
+        self.assertEqual({'name', 'items'}, set(vars(r.crates[0])))
+
+        self.assertEqual(([0, '0', 'crates', '$item', 1, '3', 'items', '$item', 0], 'unmappable'),
+                         catch(from_, [dict(raw, crates=[into(crate(1)), dict(into(crate(1)), items=['x'])])])[:2])
+
+    def test_slots(self):
+        from_, = get_serializers(JSON_FROM, Slim, select=['a'])
+
+        r = from_({'a': 1, 'b': 'x'})
+
+        self.assertIsInstance(r, Slim)
+        self.assertEqual(1, r.a)
+        self.assertFalse(hasattr(r, 'b'))
+
+    def test_union(self):
+        into, = get_serializers(JSON_INTO, Packet)
+        from_, = get_serializers(JSON_FROM, Packet, select=['body.method'])
+
+        r = from_(into(Packet('1', Request('sum', [1, 2]))))
+
+        self.assertEqual({'body'}, set(vars(r)))
+        self.assertIsInstance(r.body, Request)
+        self.assertEqual({'method': 'sum'}, vars(r.body))
+
+        # the other members of the union have no `method`, and map no fields
+        r = from_(into(Packet('1', Error('failed'))))
+
+        self.assertIsInstance(r.body, Error)
+        self.assertEqual({}, vars(r.body))
+
+    def test_errors(self):
+        self.assertRaises(ValueError, get_serializers, JSON_FROM, Crate, select=['nope'])
+        self.assertRaises(ValueError, get_serializers, JSON_FROM, Crate, select=['items.a'])
+        self.assertRaises(ValueError, get_serializers, JSON_FROM, Batch, select=['crates.name'])
+        self.assertRaises(ValueError, get_serializers, JSON_FROM, Packet, select=['body.nope'])
+        # the `type` of a packet is written by the union of its body, whose fields can not be selected
+        self.assertRaises(ValueError, get_serializers, JSON_INTO, Packet, select=['body.method'])
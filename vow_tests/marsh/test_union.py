@@ -0,0 +1,147 @@
+import unittest
+from typing import List, Optional, Union
+
+from dataclasses import dataclass, field
+
+from vow.marsh.decl import infer, get_serializers
+from vow.marsh.error import SerializationError
+from vow.marsh.helper import FIELD_OVERRIDE
+from vow.marsh.impl.binary import BINARY_INTO, BINARY_FROM, BinaryNext
+from vow.marsh.impl.json import JSON_INTO, JSON_FROM
+from vow.marsh.impl.union import Tagged
+from vow.marsh.walker import Walker
+
+NAMES = JSON_INTO, JSON_FROM, BINARY_INTO, BINARY_FROM
+
+
+@infer(*NAMES)
+@dataclass
+class Circle:
+    r: float
+
+
+@infer(*NAMES)
+@dataclass
+class Square:
+    side: int
+
+
+@infer(*NAMES)
+@dataclass
+class Drawing:
+    shapes: List[Union[Circle, 'Square']]
+    main: Optional[Union[Circle, Square]] = None
+    other: Union[Circle, Square] = field(
+        default=None,
+        metadata={FIELD_OVERRIDE: Optional[Tagged((Circle, Square), tag='kind', tags=('c', 's'), content='shape')]},
+    )
+
+
+class Disc(Circle):
+    pass
+
+
+@infer(BINARY_INTO)
+@dataclass
+class Forward:
+    shape: Union[Circle, Square]
+
+
+@infer(BINARY_INTO)
+@dataclass
+class Backward:
+    shape: Union[Square, Circle]
+
+
+def roundtrip(obj, into, from_, compiled=False):
+    into, = get_serializers(into, type(obj), compiled=compiled)
+    from_, = get_serializers(from_, type(obj), compiled=compiled)
+
+    r = from_(into(obj))
+    return r.val if isinstance(r, BinaryNext) else r
+
+
+class TestUnion(unittest.TestCase):
+    def test_json(self):
+        into, = get_serializers(JSON_INTO, Drawing)
+
+        self.assertEqual(
+            {
+                'shapes': [{'r': 1.5, 'type': 'Circle'}, {'side': 2, 'type': 'Square'}],
+                'main': None,
+                'other': {'kind': 's', 'shape': {'side': 3}},
+            },
+            into(Drawing([Circle(1.5), Square(2)], other=Square(3))),
+        )
+
+    def test_binary(self):
+        into, = get_serializers(BINARY_INTO, List[Union[Circle, Square]])
+
+        # the index of the member by its tag, then the member
+        self.assertEqual(b'\x01\x01\x04', into([Square(2)]))
+
+        # equal unions are built once by `typing`, whichever order of the members comes first
+        for types in ((Circle, Square), (Square, Circle)):
+            into, = Walker(None).mappers(Walker(BINARY_INTO).resolve(List[Tagged(types)]))
+            from_, = Walker(None).mappers(Walker(BINARY_FROM).resolve(List[Tagged(types)]))
+
+            self.assertEqual(b'\x02\x00\x00\x00\x00\x00\x00\x00\xf0?\x01\x04', into([Circle(1.), Square(2)]))
+            self.assertEqual([Circle(1.), Square(2)], from_(into([Circle(1.), Square(2)])).val)
+
+    def test_order(self):
+        # `Union[Square, Circle] == Union[Circle, Square]`, the two are still cached apart
+        forward, = get_serializers(BINARY_INTO, Forward)
+        backward, = get_serializers(BINARY_INTO, Backward)
+
+        self.assertEqual(b'\x00', forward(Forward(Circle(1.)))[:1])
+        self.assertEqual(b'\x00', backward(Backward(Circle(1.)))[:1])
+
+        self.assertEqual((Circle, Square), Walker(BINARY_INTO).resolve(Union[Circle, Square]).types)
+        self.assertEqual((Square, Circle), Walker(BINARY_INTO).resolve(Union[Square, Circle]).types)
+
+    def test_roundtrip(self):
+        obj = Drawing([Circle(1.5), Square(2)], Square(3), Circle(4.))
+
+        for compiled in (False, True):
+            for into, from_ in ((JSON_INTO, JSON_FROM), (BINARY_INTO, BINARY_FROM)):
+                self.assertEqual(obj, roundtrip(obj, into, from_, compiled))
+
+    def test_subclass(self):
+        into, = get_serializers(JSON_INTO, Drawing)
+
+        self.assertEqual([{'r': 1., 'type': 'Circle'}], into(Drawing([Disc(1.)]))['shapes'])
+
+    def test_errors(self):
+        into, = get_serializers(JSON_INTO, Drawing)
+
+        with self.assertRaises(SerializationError) as e:
+            into(Drawing([1]))
+
+        self.assertEqual('union_unknown', e.exception.reason)
+
+        from_, = get_serializers(JSON_FROM, Drawing)
+
+        with self.assertRaises(SerializationError) as e:
+            from_({'shapes': [{'type': 'Triangle'}]})
+
+        self.assertEqual('union_unknown', e.exception.reason)
+        self.assertEqual(['0', 'shapes', '$item', 0, 'type'], e.exception.path)
+
+        with self.assertRaises(SerializationError) as e:
+            from_({'shapes': [{'r': 1.}]})
+
+        self.assertEqual('union_no_tag', e.exception.reason)
+
+        from_, = get_serializers(BINARY_FROM, List[Union[Circle, Square]])
+
+        with self.assertRaises(SerializationError) as e:
+            from_(b'\x01\x05')
+
+        self.assertEqual('union_unknown', e.exception.reason)
+
+    def test_tag_conflict(self):
+        with self.assertRaises(ValueError):
+            Walker(JSON_INTO).resolve(Tagged((Circle, Square), tag='side'))
+
+        with self.assertRaises(ValueError):
+            Walker(JSON_INTO).resolve(Tagged((Circle, Square), tags=('x', 'x')))
@@ -0,0 +1,48 @@
+import unittest
+from typing import List
+
+from vow.marsh.decl import get_serializers
+from vow.marsh.impl.json import JSON_INTO, JSON_FROM
+from vow.rpc.wire import Packet
+from vow_tests.marsh.test_batch import Batch, crate
+from vow_tests.marsh.test_api import Amber, Bulky
+from vow_tests.marsh.test_compile import catch
+
+
+class TestValidate(unittest.TestCase):
+    def assertSame(self, cls, *objs):
+        from_, = get_serializers(JSON_FROM, cls)
+        validate, = get_serializers(JSON_FROM, cls, validate=True)
+
+        for obj in objs:
+            r = catch(from_, obj)
+
+            if isinstance(r, tuple):
+                self.assertEqual(r, catch(validate, obj))
+            else:
+                self.assertIs(obj, validate(obj))
+
+    def test_validate(self):
+        into, = get_serializers(JSON_INTO, Batch)
+
+        raw = into(Batch([crate(i) for i in range(3)], [Amber(1, Bulky()), None]))
+
+        self.assertSame(
+            Batch,
+            raw,
+            dict(raw, crates=raw['crates'] + [dict(raw['crates'][0], at='x')]),
+            dict(raw, crates=raw['crates'] + [dict(raw['crates'][0], tags={'a': 'b'})]),
+            dict(raw, ambers=[{'a': 1, 'b': {'b': {'a': 'x', 'b': {}}}}]),
+            dict(raw, ambers=None),
+            {'crates': []},
+            {},
+            None,
+        )
+
+        self.assertSame(List[int], [1, 2], [1, 'x'])
+
+        self.assertSame(
+            Packet,
+            {'type': 'request', 'stream': '1', 'body': {'method': 'get', 'body': None}},
+            {'type': 'unknown', 'stream': None, 'body': {'name': 'a'}},
+        )
@@ -1,4 +1,5 @@
 import unittest
+import weakref
 from inspect import signature
 
 from typing import AsyncIterable, Iterable
@@ -6,8 +7,9 @@ from typing import AsyncIterable, Iterable
 from dataclasses import dataclass, replace
 
 from vow.marsh.decl import infer, get_serializers
+from vow.marsh.helper import DECL_CALLABLE_ATTR
 from vow.marsh.impl.json import JSON_FROM, JSON_INTO
-from vow.marsh.walker import Args
+from vow.marsh.walker import Args, Return, Kind
 from vow.rpc.decl import rpc, collect
 from vow.rpc.wire import Header
 from xrpc.trace import trc
@@ -20,6 +22,17 @@ class Tumblr:
     c: int = 7
 
 
+@infer(JSON_INTO, JSON_FROM)
+def later(a: int, b: 'Later') -> 'Later':
+    pass
+
+
+@infer(JSON_INTO, JSON_FROM)
+@dataclass
+class Later:
+    x: int
+
+
 class Methodist:
     @rpc()
     def meth1(self, a: int, b: str) -> Header:
@@ -86,3 +99,48 @@ class TestDecl(unittest.TestCase):
         trc().debug('%s', rr2)
 
         assert False
+
+    def test_deferred(self):
+        dx = getattr(later, DECL_CALLABLE_ATTR)
+
+        # `Later` did not exist yet when `later` was decorated
+        self.assertEqual({JSON_INTO, JSON_FROM}, set(dx.deferred))
+
+        args, = get_serializers(JSON_FROM, Args(later))
+        reply, = get_serializers(JSON_INTO, Return(later))
+
+        self.assertEqual({'a': 1, 'b': Later(2)}, args.serialize({'a': 1, 'b': {'x': 2}}))
+        self.assertEqual({'x': 3}, reply.serialize(Later(3)))
+        self.assertEqual(set(), set(dx.deferred))
+
+    def test_deferred_errors(self):
+        @infer(JSON_INTO)
+        def untyped(a: int, b):
+            pass
+
+        with self.assertRaises(ValueError):
+            get_serializers(JSON_INTO, Args(untyped))
+
+    def test_method(self):
+        method = Methodist.meth2.__rpc__.to_method(Methodist().meth2, JSON_INTO, JSON_FROM)
+
+        self.assertEqual(['a', 'b'], list(method.signature.parameters))
+        self.assertEqual(Tumblr(1, 3), method.output_from.serialize(method.output_into.serialize(Tumblr(1, 3))))
+
+    def test_rpc(self):
+        # known right after decorating
+        self.assertEqual(Kind.Call, Methodist.meth1.__rpc__.kind)
+        self.assertEqual(['a', 'b'], list(Methodist.meth1.__rpc__.signature.parameters))
+
+        a, b = Methodist(), Methodist()
+
+        method_a = a.meth2.__rpc__.to_method(a.meth2, JSON_INTO, JSON_FROM)
+        method_b = b.meth2.__rpc__.to_method(b.meth2, JSON_INTO, JSON_FROM)
+
+        # the mappers are shared by the instances, which are not kept by the caches
+        self.assertIs(method_a.input_from, method_b.input_from)
+
+        ref = weakref.ref(a)
+        del a, method_a
+
+        self.assertIsNone(ref())